@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Data-driven build of every synthesized audio file, all task types in one run.
+
+Item definitions live in data/*.json and voice assignments in
+inworld_voices.py. Each task type turns its data file into AudioJobs (one
+per output MP3):
+
+  task             data file                                 output
+  choose-response  data/choose-response-dialogues.json       audio/listening/LCR-<id>.mp3
+  announcement     data/announcement-scripts.json            audio/listening/LA-<id>.mp3
+  academic-talk    data/academic-talk-scripts.json           audio/listening/LT-<id>.mp3
+  conversation     data/conversation-scripts.json            audio/listening/LC-<id>.mp3
+  interview        data/interview-question-sets.json         audio/interview/TI-<set>-Q<n>.mp3
+  listen-repeat    data/lr-sentence-sets.json ("synthesized" sets only)   the set's "audio" path
+
+A job is its utterances plus a layout: leading silence, then each utterance
+with a fixed pause between them, written with audio_timing.Timeline (so
+every MP3 gets its .srt/.json timing sidecars). Each utterance is first
+trimmed of the silence the API put around it and normalized to a common
+loudness (speech_postprocess.py), so the layout's pauses are the real gaps
+and every voice plays at the same level. build() runs the job graph:
+
+  synthesis  every utterance of every stale job, across all task types, goes
+             into one SynthesisEngine batch: deduplicated (synthesis_plan.py),
+             cached (tts_cache.py), paced by the engine's token bucket
+  encoding   a job is ready the moment its last utterance arrives
+             (map_groups(ordered=False)) and is assembled and encoded in
+             an encode_pool.EncodePool (one process per core) while
+             synthesis continues; assembly
+             streams into the encoder (Timeline sink -> MP3Stream), pauses
+             are views of one shared silence buffer, and each utterance is
+             released as soon as it is encoded
+
+so a full rebuild takes as long as the API needs for the unique characters,
+plus the last job's encode. Build hashes use the same inputs per task as the
+old per-task generators plus the post-processing settings, so turning
+post-processing on makes every output stale once (with AUDIO_POSTPROCESS=0
+the hashes are unchanged). An MP3 written with new bytes loses its
+variants.json entry (audio_variants.drop_stale_variants) and its clip in the
+Choose-a-Response sprites (audio_sprites.drop_stale_clips), so the pages
+play the new MP3 until build-audio-variants.py / build-audio-sprites.py run.
+The generate-*-audio.py scripts are thin wrappers over this module.
+
+Usage:
+  python3 scripts/build-audio.py                      # everything that is stale
+  python3 scripts/build-audio.py --tasks interview --only "TI-ZJ1-*"
+  python3 scripts/build-audio.py --list
+
+Environment:
+  INWORLD_API_KEY   required unless everything is up to date (or --dry-run)
+  ENCODE_WORKERS    encoder processes (default: CPU count)
+  AUDIO_TARGET_LUFS / AUDIO_POSTPROCESS   loudness target / 0 to skip trim + normalization
+"""
+
+import fnmatch
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from audio_encoder import MP3Encoder
+from audio_manifest import BuildManifest, input_hash, plan_outputs
+from audio_sprites import drop_stale_clips
+from audio_timing import SIDECAR_VERSION, Timeline
+from audio_variants import drop_stale_variants
+from encode_pool import EncodePool
+from inworld_client import InworldClient, load_api_key
+from inworld_voices import (ANNOUNCEMENT_VOICES, CHOOSE_RESPONSE_VOICES, CONVERSATION_VOICES,
+                            get_voice_id_for_academic_talk, get_voice_id_for_interview_set,
+                            get_voice_id_for_lr_set, get_voice_id_for_role)
+from speech_postprocess import SpeechPostProcessor
+from tts_cache import TTSCache
+from tts_engine import SynthesisEngine
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+LISTENING_DIR = PROJECT_ROOT / "audio" / "listening"
+INTERVIEW_DIR = PROJECT_ROOT / "audio" / "interview"
+MODEL_ID = "inworld-tts-1.5-mini"
+SAMPLE_RATE = 48000
+
+# Layout per task: (leading silence, pause between utterances), seconds
+CHOOSE_RESPONSE_LAYOUT = (0.5, 0.8)
+ANNOUNCEMENT_LAYOUT = (0.5, 0.0)
+ACADEMIC_TALK_LAYOUT = (0.5, 0.35)   # natural lecture pacing
+CONVERSATION_LAYOUT = (1.0, 0.8)
+INTERVIEW_LAYOUT = (0.0, 0.0)
+LISTEN_REPEAT_LAYOUT = (2.0, 1.5)    # time to repeat each sentence
+
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+ENCODER = MP3Encoder(SAMPLE_RATE)
+POSTPROCESS = SpeechPostProcessor(SAMPLE_RATE)
+
+
+class AudioJob:
+    """One output MP3: utterances to synthesize, how to lay them out, and its build hash."""
+
+    def __init__(self, task, job_id, output, speech, layout, digest):
+        self.task = task
+        self.id = job_id
+        self.output = Path(output)
+        self.speech = speech            # [(text, voice_id, sidecar metadata)] in order
+        self.leading_silence, self.pause = layout
+        self.digest = digest
+
+    def sentences(self):
+        return [(text, voice_id) for text, voice_id, _ in self.speech]
+
+    def assemble(self, pcm_chunks, sink=None, postprocess=POSTPROCESS):
+        """Timeline of the job from its synthesized utterances (in order), streamed to sink if given.
+
+        Each utterance goes through postprocess (trim + loudness) on its way in.
+        """
+        timeline = Timeline(SAMPLE_RATE, sink)
+        if self.leading_silence:
+            timeline.add_silence(self.leading_silence)
+        for i, ((text, _, meta), pcm) in enumerate(zip(self.speech, pcm_chunks)):
+            timeline.add_speech(postprocess.process(pcm), text, **meta)
+            if i < len(self.speech) - 1 and self.pause:
+                timeline.add_silence(self.pause)
+        return timeline
+
+
+def split_sentences(text):
+    """Split a talk into sentences on . ! ? followed by whitespace."""
+    return [p.strip() for p in SENTENCE_END_RE.split(text.strip()) if p.strip()]
+
+
+def common_hash(**inputs):
+    """input_hash() plus the settings every task's output depends on."""
+    if POSTPROCESS.signature() is not None:
+        inputs["postprocess"] = POSTPROCESS.signature()
+    return input_hash(model=MODEL_ID, sample_rate=SAMPLE_RATE, encoder=ENCODER.signature(),
+                      timing=SIDECAR_VERSION, **inputs)
+
+
+# ==================== TASK TYPES ====================
+# Each takes the parsed data file and returns [AudioJob]. The hash inputs are
+# the ones the per-task generators used (common_hash adds the shared settings).
+
+def choose_response_jobs(data):
+    jobs = []
+    leading, pause = CHOOSE_RESPONSE_LAYOUT
+    for item_id, item in data["items"].items():
+        speech = []
+        for turn in item["dialogue"]:
+            voice_id = get_voice_id_for_role(CHOOSE_RESPONSE_VOICES, turn["voice"])
+            speech.append((turn["text"], voice_id, {"speaker": turn["speaker"], "voice": voice_id}))
+        digest = common_hash(turns=[(text, voice_id) for text, voice_id, _ in speech],
+                             pause=pause, leading_silence=leading)
+        jobs.append(AudioJob("choose-response", f"LCR-{item_id}", LISTENING_DIR / f"LCR-{item_id}.mp3",
+                             speech, CHOOSE_RESPONSE_LAYOUT, digest))
+    return jobs
+
+
+def announcement_jobs(data):
+    jobs = []
+    leading, _ = ANNOUNCEMENT_LAYOUT
+    for item_id, item in data["items"].items():
+        voice_id = get_voice_id_for_role(ANNOUNCEMENT_VOICES, item["voice"])
+        digest = common_hash(text=item["text"], voice=voice_id, leading_silence=leading)
+        jobs.append(AudioJob("announcement", f"LA-{item_id}", LISTENING_DIR / f"LA-{item_id}.mp3",
+                             [(item["text"], voice_id, {"voice": voice_id})], ANNOUNCEMENT_LAYOUT, digest))
+    return jobs
+
+
+def academic_talk_jobs(data):
+    jobs = []
+    leading, pause = ACADEMIC_TALK_LAYOUT
+    for talk_id, talk in data["items"].items():
+        voice_id = get_voice_id_for_academic_talk(talk_id)
+        sentences = [(sentence, voice_id) for sentence in split_sentences(talk["text"])]
+        digest = common_hash(sentences=sentences, pause=pause, leading_silence=leading)
+        jobs.append(AudioJob("academic-talk", f"LT-{talk_id}", LISTENING_DIR / f"LT-{talk_id}.mp3",
+                             [(text, voice, {}) for text, voice in sentences], ACADEMIC_TALK_LAYOUT, digest))
+    return jobs
+
+
+def conversation_jobs(data):
+    jobs = []
+    leading, pause = CONVERSATION_LAYOUT
+    for item_id, item in data["items"].items():
+        speech = []
+        for turn in item["turns"]:
+            voice_id = get_voice_id_for_role(CONVERSATION_VOICES, turn["voice"])
+            speech.append((turn["text"], voice_id, {"speaker": turn["speaker"], "voice": voice_id}))
+        digest = common_hash(turns=[(text, voice_id) for text, voice_id, _ in speech],
+                             pause=pause, leading_silence=leading)
+        jobs.append(AudioJob("conversation", f"LC-{item_id}", LISTENING_DIR / f"LC-{item_id}.mp3",
+                             speech, CONVERSATION_LAYOUT, digest))
+    return jobs
+
+
+def interview_jobs(data):
+    jobs = []
+    for set_id, interview in data["sets"].items():
+        voice_id = get_voice_id_for_interview_set(set_id)
+        for n, text in enumerate(interview["questions"], 1):
+            job_id = f"TI-{set_id}-Q{n}"
+            jobs.append(AudioJob("interview", job_id, INTERVIEW_DIR / f"{job_id}.mp3",
+                                 [(text, voice_id, {"voice": voice_id})], INTERVIEW_LAYOUT,
+                                 common_hash(text=text, voice=voice_id)))
+    return jobs
+
+
+def listen_repeat_jobs(data):
+    jobs = []
+    leading, silence = LISTEN_REPEAT_LAYOUT
+    for set_id, lr_set in data["sets"].items():
+        if not lr_set.get("synthesized"):
+            continue   # a recording, not built from text
+        voice_id = get_voice_id_for_lr_set(set_id)
+        output = PROJECT_ROOT / lr_set["audio"]
+        digest = common_hash(sentences=lr_set["sentences"], voice=voice_id, silence=silence,
+                             leading_silence=leading)
+        jobs.append(AudioJob("listen-repeat", output.stem, output,
+                             [(text, voice_id, {}) for text in lr_set["sentences"]], LISTEN_REPEAT_LAYOUT, digest))
+    return jobs
+
+
+TASKS = {
+    "choose-response": ("choose-response-dialogues.json", choose_response_jobs),
+    "announcement": ("announcement-scripts.json", announcement_jobs),
+    "academic-talk": ("academic-talk-scripts.json", academic_talk_jobs),
+    "conversation": ("conversation-scripts.json", conversation_jobs),
+    "interview": ("interview-question-sets.json", interview_jobs),
+    "listen-repeat": ("lr-sentence-sets.json", listen_repeat_jobs),
+}
+
+
+def load_jobs(tasks=None, only=None):
+    """Jobs of the given task types (default: all), optionally filtered by job id globs (e.g. "LCR-R03-*")."""
+    jobs = []
+    for task in tasks or TASKS:
+        filename, make_jobs = TASKS[task]
+        with open(DATA_DIR / filename, encoding="utf-8") as f:
+            jobs.extend(make_jobs(json.load(f)))
+    if only:
+        jobs = [job for job in jobs if any(fnmatch.fnmatchcase(job.id, pattern) for pattern in only)]
+    return jobs
+
+
+# ==================== BUILD ====================
+
+def add_job_args(parser):
+    """--tasks / --only / --encode-workers for build-audio.py."""
+    parser.add_argument("--tasks", nargs="+", choices=list(TASKS), help="Only these task types (default: all)")
+    parser.add_argument("--only", nargs="+", metavar="GLOB", help='Only job ids matching these globs (e.g. "LCR-R03-*")')
+    parser.add_argument("--encode-workers", type=int,
+                        help="Encoder processes (default: ENCODE_WORKERS or CPU count)")
+    return parser
+
+
+def _consume(pcm_chunks):
+    """Yield the utterances in order, dropping each one from the list once it has been encoded."""
+    for i in range(len(pcm_chunks)):
+        pcm, pcm_chunks[i] = pcm_chunks[i], None
+        yield pcm
+
+
+def encode_job(job, pcm_chunks):
+    """EncodePool task: assemble and encode one job, write its sidecars.
+
+    Returns MP3Stream.stats() plus the job's post-processing stats under "postprocess".
+    """
+    postprocess = SpeechPostProcessor(SAMPLE_RATE, POSTPROCESS.target_lufs, POSTPROCESS.enabled)
+    with ENCODER.open(job.output) as stream:
+        timeline = job.assemble(_consume(pcm_chunks), stream.write, postprocess)
+    timeline.write_sidecars(job.output)
+    return {**stream.stats(), "postprocess": postprocess.stats()}
+
+
+def build(jobs, args, encode_workers=None, engine=None, manifest=None):
+    """Synthesize and encode every stale job. Returns the number of failed jobs.
+
+    engine / manifest default to the real API (with the TTS cache) and
+    audio/.manifest.json; benchmark-audio-pipeline.py passes its own.
+    """
+    by_id = {job.id: job for job in jobs}
+    manifest = manifest or BuildManifest()
+    stale = plan_outputs(manifest, {job.id: (job.output, job.digest) for job in jobs}, args)
+    if not stale:
+        return 0
+
+    if engine is None:
+        api_key = load_api_key()
+        if not api_key:
+            print("Error: Set INWORLD_API_KEY environment variable or add it to .env", file=sys.stderr)
+            sys.exit(1)
+        engine = SynthesisEngine(InworldClient(api_key, MODEL_ID, SAMPLE_RATE), cache=TTSCache())
+    tasks = sorted({by_id[job_id].task for job_id in stale})
+    print(f"Building {len(stale)} files ({', '.join(tasks)}) via {engine.client.api_url}")
+
+    started = time.monotonic()
+    failed = []
+    written = []
+    done = 0
+
+    def report(finished):
+        nonlocal done
+        for job_id, stats, error in finished:
+            if error is not None:
+                print(f"  ✗ {job_id}: encode failed: {error}", file=sys.stderr)
+                failed.append(job_id)
+                continue
+            manifest.record(by_id[job_id].output, by_id[job_id].digest)
+            written.append(by_id[job_id].output)
+            POSTPROCESS.record(stats["postprocess"])
+            done += 1
+            print(f"  ✓ [{done}/{len(stale)}] {manifest.key(by_id[job_id].output)} ({stats['size'] / 1024:.1f} KB)")
+
+    with EncodePool(ENCODER, encode_workers) as encoders:
+        groups = {job_id: by_id[job_id].sentences() for job_id in stale}
+        for job_id, pcm_chunks, error in engine.map_groups(groups, ordered=False):
+            if error is not None:
+                print(f"  ✗ {job_id}: synthesis failed: {error}", file=sys.stderr)
+                failed.append(job_id)
+                continue
+            encoders.submit(job_id, encode_job, by_id[job_id], pcm_chunks)
+            report(encoders.ready())
+        report(encoders.results())
+    dropped = drop_stale_variants(written)
+    unsprited = drop_stale_clips(written)
+
+    print(f"\n{'=' * 60}")
+    print(f"Complete: {done}/{len(stale)} files in {time.monotonic() - started:.1f}s")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    print(engine.summary())
+    print(POSTPROCESS.summary())
+    print(ENCODER.summary())
+    if dropped:
+        print(f"Opus/AAC variants of {len(dropped)} rebuilt files dropped; "
+              f"rebuild them with python3 scripts/build-audio-variants.py")
+    if unsprited:
+        print(f"{len(unsprited)} rebuilt questions dropped from their sprites; "
+              f"repack with python3 scripts/build-audio-sprites.py")
+    print("=" * 60)
+    return len(failed)
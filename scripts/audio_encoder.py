@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Streaming MP3 encoder shared by the generate-*-audio scripts.
+
+The generators used to write every clip to a temporary WAV, fork ffmpeg to
+convert it, then delete the WAV. MP3Encoder takes the assembled PCM chunks
+directly instead:
+  - lameenc backend (pip install lameenc): LAME runs in-process, so a batch
+    of clips costs no process spawns and no intermediate files at all;
+  - ffmpeg backend (fallback): raw PCM is piped into ffmpeg's stdin, so no
+    WAV ever touches the disk.
+The MP3 is written to a temporary name and renamed into place, so an
+interrupted run never leaves a truncated clip behind.
+
+Both backends start the file with a Xing/LAME info frame (ffmpeg writes its
+own; for lameenc we build it from the encoded frames). Browsers need it for
+VBR duration and seeking (#t=start,end), and it carries the encoder delay and
+padding so gapless-aware decoders (ffmpeg, Chrome, Firefox, Safari) drop the
+1105 priming samples: PCM sample n plays at exactly n / sample_rate seconds,
+which is what the timing sidecars (audio_timing.py) rely on.
+
+ENCODER.open() returns an MP3Stream for PCM that is produced piece by piece:
+each write() is encoded immediately and the frames go straight to disk, so
+nothing grows with the clip. encode() is a write() loop over a list.
+
+Usage (inside a generator):
+  ENCODER = MP3Encoder(SAMPLE_RATE)
+  ENCODER.encode([silence, pcm1, pause, pcm2], "audio/listening/LCR-R01-01.mp3")
+  with ENCODER.open("audio/listening/LT-A2-01.mp3") as stream:
+      for pcm in sentences:
+          stream.write(pcm)
+  print(ENCODER.summary())
+
+For many clips at once, encode_pool.EncodePool runs encodes in worker
+processes (one per core); reencode-audio.py re-encodes the existing MP3s.
+
+Environment:
+  AUDIO_ENCODER       lameenc | ffmpeg  (default: lameenc when installed, else ffmpeg)
+  AUDIO_MP3_QUALITY   LAME VBR quality 0 (best) .. 9 (smallest), default 2; part of
+                      signature(), so changing it makes every build output stale
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+from array import array
+from pathlib import Path
+
+try:
+    import lameenc
+    LAMEENC_AVAILABLE = True
+except ImportError:
+    LAMEENC_AVAILABLE = False
+
+# ==================== CONFIG ====================
+# ffmpeg: LAME VBR quality 2 (~190 kbps), what the generators have always used
+FFMPEG_MP3_ARGS = ["-codec:a", "libmp3lame", "-qscale:a", "2"]
+# lameenc: the same LAME settings in-process (VBR -V2)
+LAMEENC_VBR_MODE = 4          # vbr_default (vbr_mtrh), what libmp3lame uses for -qscale:a
+LAMEENC_VBR_QUALITY = 2       # default -V / -qscale:a (AUDIO_MP3_QUALITY overrides)
+LAMEENC_QUALITY = 2           # LAME algorithm quality (2 = high, 7 = fast)
+ENCODER_DELAY = 576           # priming samples LAME inserts before the first PCM sample
+DECODER_DELAY = 529           # extra samples of delay in a standard mpg123-style decoder
+
+# MPEG audio Layer III header tables, keyed by the 2-bit version field
+# (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+MPEG_BITRATES_KBPS = {
+    3: [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    0: [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+XING_TAG_BYTES = 120          # "Xing" + flags + frames + bytes + 100-byte TOC + quality
+LAME_TAG_BYTES = 36
+
+
+def parse_frame_header(header):
+    """Decode a 4-byte MPEG Layer III frame header.
+
+    Returns (version, sample_rate_index, channel_mode, frame_length) or None if
+    the bytes are not a valid Layer III header.
+    """
+    value = int.from_bytes(header, "big")
+    if value >> 21 != 0x7FF:
+        return None
+    version = (value >> 19) & 3
+    layer = (value >> 17) & 3
+    bitrate_index = (value >> 12) & 0xF
+    sample_rate_index = (value >> 10) & 3
+    padding = (value >> 9) & 1
+    channel_mode = (value >> 6) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrate = MPEG_BITRATES_KBPS[version][bitrate_index - 1] * 1000
+    sample_rate = MPEG_SAMPLE_RATES[version][sample_rate_index]
+    coefficient = 144 if version == 3 else 72
+    return version, sample_rate_index, channel_mode, coefficient * bitrate // sample_rate + padding
+
+
+def frame_offsets(mp3_bytes):
+    """Byte offsets of consecutive MPEG frames in a headerless MP3 stream."""
+    index = FrameIndex()
+    index.feed(mp3_bytes)
+    return list(index.offsets)
+
+
+class FrameIndex:
+    """frame_offsets() for a stream that arrives in pieces (frames may straddle them).
+
+    Keeps only the offsets (4 bytes per frame) and the first header, so the
+    info frame of an arbitrarily long encode can be built without the MP3 in memory.
+    """
+
+    def __init__(self):
+        self.offsets = array("I")
+        self.size = 0                 # bytes fed so far
+        self.first_header = None
+        self._next = 0                # absolute offset of the next frame header
+        self._carry = b""             # bytes of an incomplete header at _next
+        self._done = False            # hit a non-frame: stop indexing, like frame_offsets()
+
+    def feed(self, data):
+        start = self.size
+        self.size += len(data)
+        if self._done:
+            return
+        buf = self._carry + data
+        base = start - len(self._carry)
+        pos = self._next - base
+        while pos + 4 <= len(buf):
+            header = parse_frame_header(buf[pos:pos + 4])
+            if header is None:
+                self._done = True
+                break
+            if self.first_header is None:
+                self.first_header = bytes(buf[pos:pos + 4])
+            self.offsets.append(base + pos)
+            pos += header[3]
+        self._next = base + pos
+        self._carry = bytes(buf[pos:]) if pos < len(buf) and not self._done else b""
+
+
+def crc16(data, crc=0):
+    """CRC-16/ARC, the checksum used by the LAME info tag."""
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _info_header(first_header):
+    """(header, frame length, Xing offset) of the info frame for a stream starting with first_header."""
+    version, sample_rate_index, channel_mode, _ = parse_frame_header(first_header)
+    mono = channel_mode == 3
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+
+    # Smallest bitrate whose frame fits the tags
+    xing_offset = 4 + side_info
+    needed = xing_offset + XING_TAG_BYTES + LAME_TAG_BYTES
+    for bitrate_index in range(1, 15):
+        header = bytes([
+            0xFF,
+            0xE0 | (version << 3) | (1 << 1) | 1,        # Layer III, no CRC
+            (bitrate_index << 4) | (sample_rate_index << 2),
+            channel_mode << 6,
+        ])
+        frame_length = parse_frame_header(header)[3]
+        if frame_length >= needed:
+            break
+    return header, frame_length, xing_offset
+
+
+def info_frame(mp3_bytes, pcm_samples, vbr=True):
+    """Build a Xing/LAME info frame for a headerless Layer III stream.
+
+    Carries frame and byte counts, a 100-entry seek table and the encoder
+    delay/padding so decoders can trim the priming samples.
+    """
+    index = FrameIndex()
+    index.feed(mp3_bytes)
+    return indexed_info_frame(index, pcm_samples, vbr)
+
+
+def indexed_info_frame(index, pcm_samples, vbr=True, vbr_quality=LAMEENC_VBR_QUALITY):
+    """info_frame() from a FrameIndex of the stream instead of its bytes."""
+    offsets = index.offsets
+    if not offsets:
+        return b""
+    header, frame_length, xing_offset = _info_header(index.first_header)
+    samples_per_frame = 1152 if parse_frame_header(header)[0] == 3 else 576
+
+    total_bytes = frame_length + index.size
+    # Seek table: position of the frame at each 1% of the duration, relative to the audio frames
+    toc = bytes(min(255, offsets[i * len(offsets) // 100] * 256 // index.size) for i in range(100))
+    padding = max(0, len(offsets) * samples_per_frame - ENCODER_DELAY - pcm_samples)
+
+    frame = bytearray(frame_length)
+    frame[:4] = header
+    xing = b"".join([
+        b"Xing" if vbr else b"Info",
+        (0x0F).to_bytes(4, "big"),                        # frames, bytes, TOC, quality present
+        len(offsets).to_bytes(4, "big"),
+        total_bytes.to_bytes(4, "big"),
+        toc,
+        (100 - 10 * vbr_quality - LAMEENC_QUALITY).to_bytes(4, "big"),
+    ])
+    frame[xing_offset:xing_offset + len(xing)] = xing
+    lame = b"".join([
+        b"LAME3.100",
+        bytes([4 if vbr else 1]),                         # tag revision 0, VBR method
+        bytes(11),                                        # lowpass, replay gain, flags, bitrate
+        ((ENCODER_DELAY << 12) | min(padding, 0xFFF)).to_bytes(3, "big"),
+        bytes(4),                                         # misc, mp3 gain, preset/surround
+        total_bytes.to_bytes(4, "big"),
+        bytes(2),                                         # music CRC (not computed)
+    ])
+    lame_offset = xing_offset + len(xing)
+    frame[lame_offset:lame_offset + len(lame)] = lame
+    tag_crc_offset = lame_offset + len(lame)
+    frame[tag_crc_offset:tag_crc_offset + 2] = crc16(frame[:tag_crc_offset]).to_bytes(2, "big")
+    return bytes(frame)
+
+
+def mp3_format(mp3_path):
+    """(sample_rate, channels) of an MP3 file, from its first frame header (after any ID3v2 tag)."""
+    with open(mp3_path, "rb") as f:
+        head = f.read(10)
+        start = 0
+        if head[:3] == b"ID3":
+            start = 10 + int.from_bytes(bytes(b & 0x7F for b in head[6:10]), "big")   # syncsafe size
+        f.seek(start)
+        data = f.read(64 * 1024)
+    for pos in range(len(data) - 3):
+        if data[pos] == 0xFF:
+            header = parse_frame_header(data[pos:pos + 4])
+            if header is not None:
+                version, sample_rate_index, channel_mode, _ = header
+                return MPEG_SAMPLE_RATES[version][sample_rate_index], 1 if channel_mode == 3 else 2
+    raise ValueError(f"{mp3_path}: no MPEG Layer III frame found")
+
+
+def default_quality():
+    """VBR quality from AUDIO_MP3_QUALITY, else LAMEENC_VBR_QUALITY."""
+    quality = int(os.getenv("AUDIO_MP3_QUALITY", LAMEENC_VBR_QUALITY))
+    if not 0 <= quality <= 9:
+        raise ValueError(f"AUDIO_MP3_QUALITY must be 0-9, got {quality}")
+    return quality
+
+
+def default_backend():
+    """Backend chosen by AUDIO_ENCODER, else lameenc if importable, else ffmpeg."""
+    requested = os.getenv("AUDIO_ENCODER", "").strip().lower()
+    if requested:
+        return requested
+    return "lameenc" if LAMEENC_AVAILABLE else "ffmpeg"
+
+
+class MP3Encoder:
+    """Encode 16-bit mono PCM chunks to MP3 without temporary WAV files."""
+
+    def __init__(self, sample_rate, backend=None, channels=1, vbr_quality=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.backend = backend or default_backend()
+        self.vbr_quality = default_quality() if vbr_quality is None else vbr_quality
+        if self.backend not in ("lameenc", "ffmpeg"):
+            raise ValueError(f"Unknown encoder backend: {self.backend}")
+        if self.backend == "lameenc" and not LAMEENC_AVAILABLE:
+            raise RuntimeError("lameenc backend requested but not installed (pip install lameenc)")
+        self.files = 0
+        self.audio_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def signature(self):
+        """Encoder settings for build-manifest hashing (different backends = different bytes)."""
+        if self.backend == "lameenc":
+            return ["lameenc", LAMEENC_VBR_MODE, self.vbr_quality, LAMEENC_QUALITY]
+        return ["ffmpeg", *self.ffmpeg_args()]
+
+    def ffmpeg_args(self):
+        return [*FFMPEG_MP3_ARGS[:-1], str(self.vbr_quality)]
+
+    def encode(self, pcm_chunks, mp3_path):
+        """Encode PCM chunks (in order) to mp3_path. Returns the MP3 size in bytes."""
+        with self.open(mp3_path) as stream:
+            for chunk in pcm_chunks:
+                stream.write(chunk)
+        return stream.size
+
+    def open(self, mp3_path):
+        """MP3Stream writing to mp3_path: write() PCM as it is produced, nothing is buffered."""
+        return MP3Stream(self, mp3_path)
+
+    def record(self, audio_seconds, seconds, size):
+        """Count one finished encode (MP3Stream.close(), or EncodePool for a worker's)."""
+        with self._lock:
+            self.files += 1
+            self.audio_seconds += audio_seconds
+            self.encode_seconds += seconds
+            self.bytes_written += size
+
+    def summary(self):
+        """One-line throughput report for the end of a run."""
+        speed = self.audio_seconds / self.encode_seconds if self.encode_seconds else 0.0
+        rate = self.files / self.encode_seconds if self.encode_seconds else 0.0
+        return (f"Encoder: {self.backend} -V{self.vbr_quality}, {self.files} files ({self.bytes_written / 1024:.0f} KB), "
+                f"{self.audio_seconds:.1f}s audio in {self.encode_seconds:.1f}s "
+                f"({rate:.1f} files/s, {speed:.0f}x realtime)")
+
+
+class MP3Stream:
+    """One MP3 being encoded incrementally; use as a context manager.
+
+    write() hands each PCM chunk straight to LAME (or ffmpeg's stdin) and
+    appends the resulting frames to the temporary file, so memory stays
+    constant however long the clip is. For lameenc the info frame's slot is
+    left empty at the start of the file and filled in on close() from a
+    FrameIndex. The file is renamed into place only on a clean close(); an
+    exception inside the with block removes it.
+    """
+
+    def __init__(self, encoder, mp3_path):
+        self.encoder = encoder
+        self.path = Path(mp3_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self.pcm_bytes = 0
+        self.size = None
+        self._started = time.monotonic()
+        self.seconds = 0.0            # spent encoding (not waiting for the next chunk)
+        if encoder.backend == "lameenc":
+            self._lame = _new_lameenc(encoder.sample_rate, encoder.channels, encoder.vbr_quality)
+            self._file = open(self.tmp_path, "wb")
+            self._index = FrameIndex()
+            self._pending = b""           # frames held until the first header fixes the info frame size
+        else:
+            self._proc = _start_ffmpeg(encoder.sample_rate, encoder.channels, encoder.ffmpeg_args(), self.tmp_path)
+            self._broken = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, pcm):
+        """Encode one chunk of 16-bit PCM (bytes or memoryview)."""
+        started = time.monotonic()
+        self.pcm_bytes += len(pcm)
+        if self.encoder.backend == "lameenc":
+            # lameenc only takes bytes; views of a shared buffer are copied one (small) slice at a time
+            self._write_frames(self._lame.encode(pcm if type(pcm) is bytes else bytes(pcm)))
+        elif not self._broken:
+            try:
+                self._proc.stdin.write(pcm)
+            except BrokenPipeError:
+                self._broken = True   # ffmpeg exited early; its stderr explains why on close()
+        self.seconds += time.monotonic() - started
+
+    def _write_frames(self, mp3):
+        if self._pending is not None:
+            self._pending += mp3
+            self._index.feed(mp3)
+            if self._index.first_header is None:
+                return
+            self._file.seek(_info_header(self._index.first_header)[1])
+            self._file.write(self._pending)
+            self._pending = None
+            return
+        self._index.feed(mp3)
+        self._file.write(mp3)
+
+    def close(self):
+        """Finish the encode and move the MP3 into place. Returns its size in bytes."""
+        started = time.monotonic()
+        try:
+            if self.encoder.backend == "lameenc":
+                self._write_frames(self._lame.flush())
+                if self._pending is not None:
+                    self._file.write(self._pending)   # no frame header at all: written as is, like before
+                else:
+                    self._file.seek(0)
+                    self._file.write(indexed_info_frame(self._index, self.pcm_bytes // (2 * self.encoder.channels),
+                                                        vbr_quality=self.encoder.vbr_quality))
+                self._file.close()
+            else:
+                self._proc.stdin.close()
+                stderr = self._proc.stderr.read()
+                if self._proc.wait() != 0:
+                    raise RuntimeError(f"ffmpeg MP3 encode failed: {stderr.decode(errors='replace').strip()}")
+            os.replace(self.tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        self.size = self.path.stat().st_size
+        self.seconds += time.monotonic() - started
+        self.encoder.record(self.audio_seconds, self.seconds, self.size)
+        return self.size
+
+    @property
+    def audio_seconds(self):
+        return self.pcm_bytes / (2 * self.encoder.channels * self.encoder.sample_rate)
+
+    def stats(self):
+        """What EncodePool workers send back for MP3Encoder.record() in the parent."""
+        return {"size": self.size, "audio_seconds": self.audio_seconds, "seconds": self.seconds}
+
+    def abort(self):
+        """Discard the partial encode."""
+        if self.encoder.backend == "lameenc":
+            self._file.close()
+        elif self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+def _new_lameenc(sample_rate, channels, vbr_quality):
+    encoder = lameenc.Encoder()
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(channels)
+    encoder.set_quality(LAMEENC_QUALITY)
+    encoder.set_vbr(LAMEENC_VBR_MODE)
+    encoder.set_vbr_quality(vbr_quality)
+    return encoder
+
+
+def _start_ffmpeg(sample_rate, channels, mp3_args, tmp_path):
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found. Please install ffmpeg (or pip install lameenc).")
+    return subprocess.Popen(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels),
+            "-i", "pipe:0",
+            *mp3_args,
+            # A seekable output file, not stdout: ffmpeg goes back to fill in the info frame
+            "-f", "mp3", "-y", str(tmp_path),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
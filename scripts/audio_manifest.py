@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Incremental build manifest for generated audio.
+
+audio/.manifest.json records, for each generated file, a hash of everything
+that determines its bytes: dialogue text, voices, model, sample rate, pause and
+silence constants, and encoder settings. A generator computes the same hash
+before doing any work and skips outputs whose hash still matches (and whose
+file still exists), so editing one item only rebuilds that item.
+
+Every generator accepts:
+  --force         rebuild everything, ignoring the manifest
+  --dry-run       list stale outputs and exit without synthesizing or encoding
+  --mark-current  record current inputs as built without touching the audio
+                  (adopt existing MP3s after the manifest is first introduced)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_PATH = PROJECT_ROOT / "audio" / ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def input_hash(**inputs):
+    """Hex SHA-256 over the JSON-serialised build inputs of one output file."""
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """Map of output file -> input hash, persisted as JSON."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = Path(path)
+        self.outputs = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.outputs = data.get("outputs", {})
+
+    def key(self, output_path):
+        """Manifest key: output path relative to the project root (POSIX style)."""
+        path = Path(output_path).resolve()
+        try:
+            return path.relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def is_stale(self, output_path, digest):
+        """True if the output is missing or was built from different inputs."""
+        if not Path(output_path).exists():
+            return True
+        entry = self.outputs.get(self.key(output_path))
+        return entry is None or entry.get("hash") != digest
+
+    def record(self, output_path, digest):
+        """Mark output as built from digest and persist immediately."""
+        with self._lock:
+            self.outputs[self.key(output_path)] = {
+                "hash": digest,
+                "built": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save_locked()
+
+    def _save_locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "outputs": self.outputs}, f,
+                      indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def add_build_args(parser):
+    """Add --force / --dry-run / --mark-current to a generator's argparse parser."""
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every output even if its inputs are unchanged")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List stale outputs and exit without building")
+    parser.add_argument("--mark-current", action="store_true",
+                        help="Record current inputs as built without regenerating audio")
+    return parser
+
+
+def plan_outputs(manifest, targets, args):
+    """Filter build targets down to the ones that need work.
+
+    targets: dict of item_id -> (output_path, digest), in build order.
+    Returns the list of item_ids to build. Handles --dry-run and --mark-current
+    (both return an empty list after printing/recording).
+    """
+    stale = [item_id for item_id, (output_path, digest) in targets.items()
+             if args.force or manifest.is_stale(output_path, digest)]
+    skipped = len(targets) - len(stale)
+
+    if args.dry_run:
+        print(f"{len(stale)} stale / {len(targets)} outputs:")
+        for item_id in stale:
+            print(f"  {manifest.key(targets[item_id][0])}")
+        return []
+    if args.mark_current:
+        marked = 0
+        for item_id in stale:
+            output_path, digest = targets[item_id]
+            if Path(output_path).exists():
+                manifest.record(output_path, digest)
+                marked += 1
+        print(f"Marked {marked} existing outputs as current in {manifest.path}")
+        return []
+    if skipped:
+        print(f"Up to date: {skipped}/{len(targets)} outputs (use --force to rebuild)")
+    return stale
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Offset indexes of the Choose-a-Response sprites (build-audio-sprites.py).
+
+Each audio/listening/sprites/LCR-<set>.json maps a question id to its
+[start, end) in the set's sprite and to the MP3 it was cut from, with that
+MP3's sha256. The page plays a question from the sprite only while the
+index lists it, and from the question's own MP3 otherwise.
+
+A sprite is rebuilt only by build-audio-sprites.py. Stages that rewrite the
+per-question MP3s (build-audio.py, reencode-audio.py) call
+drop_stale_clips() on what they wrote, so a regenerated question plays its
+new MP3 rather than the old audio in the sprite until the sprite is packed
+again.
+
+Usage:
+  from audio_sprites import drop_stale_clips
+  drop_stale_clips(["audio/listening/LCR-R01-07.mp3"])
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SPRITES_DIR = PROJECT_ROOT / "audio" / "listening" / "sprites"
+SPRITE_VERSION = 2            # 2: clips carry their source MP3's sha256
+
+
+def relative(path):
+    return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_index(index_path):
+    """A sprite index, or None if it is missing or from another SPRITE_VERSION."""
+    if not Path(index_path).exists():
+        return None
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    return index if index.get("version") == SPRITE_VERSION else None
+
+
+def write_index(index_path, index):
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, index_path)
+
+
+def drop_stale_clips(mp3_paths):
+    """Remove the sprite clips cut from these MP3s whose sha256 no longer matches the file.
+
+    Returns the dropped question ids. The sprite MP3 is left as is; its
+    other clips keep playing from it. MP3s outside the project (scratch
+    builds) are ignored.
+    """
+    sources = set()
+    for path in mp3_paths:
+        try:
+            sources.add(relative(path))
+        except ValueError:
+            continue
+
+    dropped = []
+    if not sources:
+        return dropped
+    for index_path in sorted(SPRITES_DIR.glob("*.json")):
+        index = load_index(index_path)
+        if index is None:
+            continue
+        stale = [question_id for question_id, clip in index["clips"].items()
+                 if clip["source"] in sources and (not (PROJECT_ROOT / clip["source"]).exists()
+                                                   or clip.get("sha256") != file_digest(PROJECT_ROOT / clip["source"]))]
+        if stale:
+            for question_id in stale:
+                del index["clips"][question_id]
+            write_index(index_path, index)
+            dropped += stale
+    return dropped
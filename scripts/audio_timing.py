@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Sentence timing sidecars written straight from the synthesis pipeline.
+
+A generator assembles each clip from synthesized sentences and generated
+silences, so it knows exactly how many samples every piece contributes.
+Timeline records those counts while the PCM chunks are collected and writes,
+next to the MP3:
+  <name>.json  exact per-sentence speech start/end (seconds and samples)
+  <name>.srt   one cue per sentence, boundaries at the midpoint of the pause
+               on each side (the same convention generate-srt-silence.py uses,
+               so a cue played with #t=start,end keeps a little air around
+               the speech)
+That makes generate-srt-silence.py / generate-srt-from-audio.py unnecessary
+for audio we synthesize ourselves.
+
+Offsets assume the MP3 starts with a Xing/LAME info frame (audio_encoder.py
+always writes one), so gapless-aware players trim the encoder delay and PCM
+sample n plays at n / sample_rate. encoder_delay in the JSON records the
+priming samples for any consumer whose decoder does not trim them.
+
+Silence is never allocated per pause: silence() yields the shared
+SILENCE_BLOCK (and a memoryview slice of it for the remainder). With a sink,
+Timeline passes each chunk straight on (e.g. to an MP3Stream) instead of
+collecting them, so assembling a clip takes constant memory however long it is.
+
+Usage (inside a generator):
+  with ENCODER.open(mp3_path) as stream:
+      timeline = Timeline(SAMPLE_RATE, sink=stream.write)
+      timeline.add_silence(LEADING_SILENCE)
+      timeline.add_speech(pcm, "Welcome to the campus bookstore.")
+  timeline.write_sidecars(mp3_path)
+
+  (without a sink, timeline.chunks collects the PCM for ENCODER.encode())
+"""
+
+import json
+import os
+from pathlib import Path
+
+from audio_encoder import DECODER_DELAY, ENCODER_DELAY
+
+# ==================== CONFIG ====================
+SIDECAR_VERSION = 1
+BYTES_PER_SAMPLE = 2          # 16-bit mono LINEAR16
+SILENCE_BLOCK = bytes(9600)   # the one zero buffer every pause is cut from (100 ms at 48 kHz)
+
+
+def to_srt_time(seconds):
+    """Seconds -> SRT timestamp (HH:MM:SS,mmm), rounded to the nearest millisecond."""
+    total_ms = int(round(seconds * 1000))
+    h, rem = divmod(total_ms, 3600 * 1000)
+    m, rem = divmod(rem, 60 * 1000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def srt_text(cues):
+    """SRT file contents for (start seconds, end seconds, text) cues, numbered from 1."""
+    lines = []
+    for i, (start, end, text) in enumerate(cues, 1):
+        lines.append(f"{i}")
+        lines.append(f"{to_srt_time(start)} --> {to_srt_time(end)}")
+        lines.append(text)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def silence(num_samples):
+    """Yield num_samples of 16-bit silence as SILENCE_BLOCK (whole blocks) and one memoryview slice of it."""
+    remaining = num_samples * BYTES_PER_SAMPLE
+    while remaining >= len(SILENCE_BLOCK):
+        yield SILENCE_BLOCK
+        remaining -= len(SILENCE_BLOCK)
+    if remaining:
+        yield memoryview(SILENCE_BLOCK)[:remaining]
+
+
+class Timeline:
+    """PCM chunk sequence that remembers where each sentence starts and ends.
+
+    sink: callable taking each chunk as it is added (default: collect in .chunks).
+    """
+
+    def __init__(self, sample_rate, sink=None):
+        self.sample_rate = sample_rate
+        self.chunks = []
+        self.sink = sink if sink is not None else self.chunks.append
+        self.cues = []
+        self.samples = 0
+
+    def add_silence(self, duration_sec):
+        """Append duration_sec of silence (16-bit mono zeros)."""
+        num_samples = int(self.sample_rate * duration_sec)
+        for chunk in silence(num_samples):
+            self.sink(chunk)
+        self.samples += num_samples
+
+    def add_speech(self, pcm, text, **info):
+        """Append one synthesized sentence and record its sample range.
+
+        Extra keyword arguments (speaker, voice, ...) are copied into the JSON cue.
+        """
+        num_samples = len(pcm) // BYTES_PER_SAMPLE
+        self.sink(pcm)
+        self.cues.append({"text": text, "start_sample": self.samples,
+                          "end_sample": self.samples + num_samples, **info})
+        self.samples += num_samples
+
+    def seconds(self, sample):
+        return sample / self.sample_rate
+
+    def srt_bounds(self):
+        """(start, end) seconds per cue, split at the midpoint of each surrounding pause."""
+        bounds = []
+        for i, cue in enumerate(self.cues):
+            prev_end = self.cues[i - 1]["end_sample"] if i > 0 else 0
+            next_start = self.cues[i + 1]["start_sample"] if i + 1 < len(self.cues) else None
+            start = (prev_end + cue["start_sample"]) / 2
+            end = (cue["end_sample"] + next_start) / 2 if next_start is not None else self.samples
+            bounds.append((self.seconds(start), self.seconds(end)))
+        return bounds
+
+    def to_srt(self):
+        return srt_text((start, end, cue["text"]) for cue, (start, end) in zip(self.cues, self.srt_bounds()))
+
+    def to_dict(self, audio_name):
+        cues = []
+        for i, (cue, (srt_start, srt_end)) in enumerate(zip(self.cues, self.srt_bounds())):
+            cues.append({
+                "index": i + 1,
+                **cue,
+                "start": round(self.seconds(cue["start_sample"]), 6),
+                "end": round(self.seconds(cue["end_sample"]), 6),
+                "srt_start": round(srt_start, 3),
+                "srt_end": round(srt_end, 3),
+            })
+        return {
+            "version": SIDECAR_VERSION,
+            "audio": audio_name,
+            "sample_rate": self.sample_rate,
+            "samples": self.samples,
+            "duration": round(self.seconds(self.samples), 6),
+            "encoder_delay": ENCODER_DELAY + DECODER_DELAY,
+            "cues": cues,
+        }
+
+    def write_sidecars(self, mp3_path):
+        """Write <mp3>.srt and <mp3>.json next to the MP3. Returns both paths."""
+        mp3_path = Path(mp3_path)
+        srt_path = mp3_path.with_suffix(".srt")
+        json_path = mp3_path.with_suffix(".json")
+        _write_atomic(srt_path, self.to_srt())
+        _write_atomic(json_path, json.dumps(self.to_dict(mp3_path.name), indent=2, ensure_ascii=False) + "\n")
+        return srt_path, json_path
+
+
+def _write_atomic(path, text):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
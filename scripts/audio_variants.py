@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Speech-optimized variants of the MP3 catalog: Opus and AAC at low bitrates.
+
+The MP3s are encoded for quality (LAME -V2, ~190 kbps at 48 kHz), but they
+carry a single voice. Speech codecs at 24 kHz hold it at a fraction of the
+size, and every current browser decodes at least one of them:
+
+  opus   WebM/Opus, 24 kbps VBR, voip tuning     Chrome, Edge, Firefox, Safari 17+
+  aac    MP4/AAC-LC, 32 kbps                     everything, including older Safari/iOS
+  (mp3)  the original file, the fallback         everything
+
+encode_variants() decodes a source MP3 once to 24 kHz mono PCM and feeds that
+same PCM to one ffmpeg encoder per variant. It is a top-level function, so
+it runs in encode_pool.EncodePool workers. Decoding is gapless and both
+containers carry the priming delay (Opus pre-skip, MP4 edit list). Sample n
+of a variant therefore plays at n / sample_rate like the MP3, and the .srt/.json
+timing sidecars hold for every variant. AAC adds up to one frame of
+padding at the end, never at the start.
+
+Encodes are bit-exact (no timestamps or encoder strings in the containers),
+so rebuilding unchanged inputs reproduces the same bytes. Variant files sit
+next to their MP3 with the same stem: audio/lr/LR-S01-bookstore-tour.webm.
+
+Each variants.json entry records the sha256 of the MP3 it was built from.
+Stages that rewrite MP3s (build-audio.py, build-lr-clips.py,
+reencode-audio.py) call drop_stale_variants() on what they wrote, so the
+pages play the new MP3 rather than a variant of the old one until
+build-audio-variants.py runs again.
+
+Usage:
+  from audio_variants import VARIANTS, encode_variants, variant_path
+  stats = encode_variants("audio/interview/TI-PT1-Q1.mp3", ["opus", "aac"])
+  drop_stale_variants(["audio/interview/TI-PT1-Q1.mp3"])
+
+See build-audio-variants.py for the build stage and the variants manifest.
+
+Requires: ffmpeg with libopus and the native aac encoder
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VARIANTS_MANIFEST = "variants.json"
+VARIANTS_MANIFEST_VERSION = 2   # 2: entries carry the source MP3's sha256
+SAMPLE_RATE = 24000          # speech bandwidth; Opus and AAC both encode it natively
+FFMPEG_EXACT = ["-map_metadata", "-1", "-fflags", "+bitexact", "-flags:a", "+bitexact"]
+VARIANTS = {
+    "opus": {
+        "ext": ".webm",
+        "mime": 'audio/webm; codecs="opus"',
+        "bitrate": 24000,
+        "args": ["-c:a", "libopus", "-b:a", "24k", "-vbr", "on", "-application", "voip", "-f", "webm"],
+    },
+    "aac": {
+        "ext": ".m4a",
+        "mime": 'audio/mp4; codecs="mp4a.40.2"',
+        "bitrate": 32000,
+        "args": ["-c:a", "aac", "-b:a", "32k", "-movflags", "+faststart", "-f", "mp4"],
+    },
+}
+
+
+def variant_path(mp3_path, name):
+    """Where variant `name` of an MP3 lives: same directory and stem, the variant's extension."""
+    return Path(mp3_path).with_suffix(VARIANTS[name]["ext"])
+
+
+def signature(name):
+    """Settings that determine a variant's bytes, for build-manifest hashing."""
+    return [name, SAMPLE_RATE, *FFMPEG_EXACT, *VARIANTS[name]["args"]]
+
+
+def decode_pcm(path, sample_rate=SAMPLE_RATE):
+    """Decode any audio file to 16-bit mono PCM bytes at sample_rate (gapless)."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(path),
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode of {Path(path).name} failed: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def encode_pcm(pcm, name, output):
+    """Encode 16-bit mono PCM at SAMPLE_RATE to variant `name`; replaces `output` atomically."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+             "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:0",
+             *FFMPEG_EXACT, *VARIANTS[name]["args"], str(tmp_path)],
+            input=pcm, capture_output=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg {name} encode of {output.name} failed: "
+                               f"{result.stderr.decode(errors='replace').strip()}")
+        os.replace(tmp_path, output)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return output.stat().st_size
+
+
+def encode_variants(source, names):
+    """Worker task: decode `source` once and encode each named variant next to it.
+
+    Returns {"audio_seconds", "seconds", "size", "variants": {name: bytes}};
+    "size" is the total of the variants written.
+    """
+    started = time.perf_counter()
+    pcm = decode_pcm(source)
+    sizes = {name: encode_pcm(pcm, name, variant_path(source, name)) for name in names}
+    return {
+        "audio_seconds": len(pcm) / 2 / SAMPLE_RATE,
+        "seconds": time.perf_counter() - started,
+        "size": sum(sizes.values()),
+        "variants": sizes,
+    }
+
+
+# ==================== VARIANTS MANIFEST ====================
+
+def relative(path):
+    return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_index(directory):
+    """The directory's variants.json ("files" only), or an empty one."""
+    path = PROJECT_ROOT / directory / VARIANTS_MANIFEST
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == VARIANTS_MANIFEST_VERSION:
+            return data.get("files", {})
+    return {}
+
+
+def save_index(directory, files):
+    path = PROJECT_ROOT / directory / VARIANTS_MANIFEST
+    formats = {name: {key: spec[key] for key in ("ext", "mime", "bitrate")} for name, spec in VARIANTS.items()}
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": VARIANTS_MANIFEST_VERSION, "formats": formats,
+                   "files": dict(sorted(files.items()))}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def drop_stale_variants(mp3_paths):
+    """Remove the variants.json entries of these MP3s whose sha256 no longer matches the file.
+
+    Returns the dropped entries (project-relative MP3 paths). The variant
+    files stay on disk; the pages stop using them and build-audio-variants.py
+    re-encodes them. MP3s outside the project (scratch builds) are ignored.
+    """
+    by_directory = {}
+    for path in mp3_paths:
+        try:
+            source = relative(path)
+        except ValueError:
+            continue
+        by_directory.setdefault(Path(source).parent.as_posix(), []).append(source)
+
+    dropped = []
+    for directory, sources in by_directory.items():
+        if not (PROJECT_ROOT / directory / VARIANTS_MANIFEST).exists():
+            continue
+        files = load_index(directory)
+        stale = [s for s in sources if s in files and (not (PROJECT_ROOT / s).exists()
+                                                       or files[s].get("sha256") != file_digest(PROJECT_ROOT / s))]
+        if stale:
+            for source in stale:
+                del files[source]
+            save_index(directory, files)
+            dropped += stale
+    return dropped
@@ -12,7 +12,6 @@ Automatically:
 import sys
 import subprocess
 import json
-import re
 from pathlib import Path
 from datetime import datetime
 
@@ -75,70 +74,6 @@ def extract_text_vision(image_path):
     return None
 
 
-def parse_discussion_text(text):
-    """Parse text to extract Professor Question and Student Posts."""
-    if not text:
-        return None
-    
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    # Find Professor Question
-    question_start = None
-    for i, line in enumerate(lines):
-        if 'professor' in line.lower() or ('?' in line and len(line) > 20):
-            question_start = i
-            break
-    
-    if question_start is None:
-        question_start = 0
-    
-    # Extract question
-    question_lines = []
-    for i in range(question_start, len(lines)):
-        line = lines[i]
-        # Stop at student names
-        if re.match(r'^[A-Z][a-z]+:', line) or re.match(r'^[A-Z][a-z]+\s+[A-Z]', line):
-            break
-        question_lines.append(line)
-    
-    question = ' '.join(question_lines)
-    question = re.sub(r'^Professor\s*:?\s*', '', question, flags=re.IGNORECASE).strip()
-    
-    # Find student posts
-    posts = []
-    current_author = None
-    current_text = []
-    
-    # Common student names
-    name_pattern = re.compile(r'^([A-Z][a-z]+)\s*:?\s*(.*)$')
-    
-    for line in lines:
-        match = name_pattern.match(line)
-        if match:
-            # Save previous post
-            if current_author:
-                posts.append({
-                    'author': current_author,
-                    'text': ' '.join(current_text).strip()
-                })
-            current_author = match.group(1)
-            current_text = [match.group(2).strip()] if match.group(2) else []
-        elif current_author:
-            current_text.append(line)
-    
-    # Save last post
-    if current_author:
-        posts.append({
-            'author': current_author,
-            'text': ' '.join(current_text).strip()
-        })
-    
-    return {
-        'question': question,
-        'posts': posts[:2]  # Only first 2
-    }
-
-
 def categorize_question(title):
     """Categorize question based on title."""
     title_lower = title.lower()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark MP3 encoding: legacy temp-WAV + ffmpeg path vs. audio_encoder.MP3Encoder.
+
+Every existing clip (audio/listening, audio/interview, audio/lr) is decoded to
+PCM once up front (not timed), then re-encoded by each path into a scratch
+directory; the committed audio is never touched.
+
+  legacy        write .tmp.wav, run `ffmpeg -i wav ... mp3`, delete the WAV
+  ffmpeg-pipe   MP3Encoder(backend="ffmpeg"): PCM piped to ffmpeg stdin
+  lameenc       MP3Encoder(backend="lameenc"): in-process LAME (if installed)
+
+Usage:
+  python3 scripts/benchmark-audio-encoder.py
+  python3 scripts/benchmark-audio-encoder.py --limit 20 --paths legacy lameenc
+
+Requires: ffmpeg (to decode the clips and for the legacy/pipe paths)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_encoder import FFMPEG_MP3_ARGS, LAMEENC_AVAILABLE, MP3Encoder
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CLIP_DIRS = ["audio/listening", "audio/interview", "audio/lr"]
+SAMPLE_RATE = 48000   # what the generators synthesize at
+PATHS = ["legacy", "ffmpeg-pipe", "lameenc"]
+
+
+def decode_to_pcm(mp3_path):
+    """Decode an MP3 to 16-bit mono PCM at SAMPLE_RATE."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(mp3_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+def legacy_encode(pcm, mp3_path):
+    """The pre-MP3Encoder path: temp WAV on disk, one ffmpeg process per clip."""
+    wav_path = mp3_path.with_suffix(".tmp.wav")
+    with wave.open(str(wav_path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+    subprocess.run(["ffmpeg", "-y", "-i", str(wav_path), *FFMPEG_MP3_ARGS, str(mp3_path)],
+                   capture_output=True, check=True)
+    wav_path.unlink()
+
+
+def run_path(name, clips, out_dir):
+    """Encode every clip with one path; returns elapsed seconds."""
+    encoder = None
+    if name == "ffmpeg-pipe":
+        encoder = MP3Encoder(SAMPLE_RATE, backend="ffmpeg")
+    elif name == "lameenc":
+        encoder = MP3Encoder(SAMPLE_RATE, backend="lameenc")
+    started = time.perf_counter()
+    for clip_path, pcm in clips:
+        mp3_path = out_dir / clip_path.name
+        if encoder is None:
+            legacy_encode(pcm, mp3_path)
+        else:
+            # Generators pass a list of chunks (silence + sentences); one chunk is equivalent
+            encoder.encode([pcm], mp3_path)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MP3 encoding paths on the existing clips")
+    parser.add_argument("--limit", type=int, help="Only use the first N clips")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS,
+                        help="Encoding paths to benchmark (default: all available)")
+    args = parser.parse_args()
+
+    clip_paths = sorted(p for d in CLIP_DIRS for p in (PROJECT_ROOT / d).glob("*.mp3"))
+    if args.limit:
+        clip_paths = clip_paths[:args.limit]
+    if not clip_paths:
+        print("No clips found.")
+        return
+
+    print(f"Decoding {len(clip_paths)} clips to PCM (not timed)...")
+    clips = [(p, decode_to_pcm(p)) for p in clip_paths]
+    audio_seconds = sum(len(pcm) for _, pcm in clips) / (2 * SAMPLE_RATE)
+    print(f"  {audio_seconds / 60:.1f} min of audio")
+
+    paths = [p for p in args.paths if p != "lameenc" or LAMEENC_AVAILABLE]
+    if "lameenc" in args.paths and not LAMEENC_AVAILABLE:
+        print("  (skipping lameenc: pip install lameenc)")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="encoder-bench-") as tmp:
+        for name in paths:
+            out_dir = Path(tmp) / name
+            out_dir.mkdir()
+            elapsed = run_path(name, clips, out_dir)
+            size = sum(p.stat().st_size for p in out_dir.glob("*.mp3"))
+            results[name] = elapsed
+            print(f"  {name:<12} {elapsed:7.2f}s  {len(clips) / elapsed:6.1f} files/s  "
+                  f"{audio_seconds / elapsed:6.0f}x realtime  {size / (1024 * 1024):6.1f} MB")
+
+    if "legacy" in results:
+        for name, elapsed in results.items():
+            if name != "legacy":
+                print(f"  {name} vs legacy: {results['legacy'] / elapsed:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of clip assembly + MP3 encoding against clip length.
+
+Each measurement runs in a fresh child process so its peak RSS
+(getrusage ru_maxrss) covers exactly one assembly. Sentences come from
+mock_inworld_server.synthesize_pcm() at 48 kHz, sentence after sentence of
+the academic talks with ACADEMIC_TALK_LAYOUT pauses, until the clip reaches
+the requested length. No API and no files in the repo are involved.
+
+  collect   how clips used to be built: every sentence's PCM and a fresh
+            zero buffer per pause in one list, then ENCODER.encode(list)
+  stream    what audio_build does now: each sentence goes through a
+            Timeline sink straight into an MP3Stream, pauses are views of
+            the shared SILENCE_BLOCK, and the sentence is dropped once encoded
+
+Peak RSS for collect grows with the clip (~5.8 MB per minute at 48 kHz);
+for stream it should be flat.
+
+Usage:
+  python3 scripts/benchmark-audio-memory.py
+  python3 scripts/benchmark-audio-memory.py --minutes 1 10 30 60 --modes stream
+  python3 scripts/benchmark-audio-memory.py --report /tmp/audio-memory.json
+
+Environment:
+  AUDIO_ENCODER   lameenc | ffmpeg (ffmpeg runs in its own process, so only Python-side memory is measured)
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_build import ACADEMIC_TALK_LAYOUT, DATA_DIR, ENCODER, SAMPLE_RATE, split_sentences
+from audio_timing import BYTES_PER_SAMPLE, Timeline
+from mock_inworld_server import synthesize_pcm
+
+# ==================== CONFIG ====================
+MODES = ["collect", "stream"]
+DEFAULT_MINUTES = [1, 5, 15, 30]
+VOICE_ID = "Dennis"
+MODEL_ID = "benchmark"
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KB on Linux
+
+
+def talk_sentences(minutes):
+    """Yield academic-talk sentences (cycled) until they add up to `minutes` of speech."""
+    with open(DATA_DIR / "academic-talk-scripts.json", encoding="utf-8") as f:
+        talks = json.load(f)["items"]
+    sentences = [s for talk in talks.values() for s in split_sentences(talk["text"])]
+    target = minutes * 60 * SAMPLE_RATE * BYTES_PER_SAMPLE
+    produced = 0
+    n = 0
+    while produced < target:
+        text = sentences[n % len(sentences)]
+        pcm = synthesize_pcm(f"{text} ({n})", VOICE_ID, MODEL_ID, SAMPLE_RATE)
+        produced += len(pcm)
+        n += 1
+        yield text, pcm
+
+
+def assemble_collect(minutes, mp3_path):
+    leading, pause = ACADEMIC_TALK_LAYOUT
+    chunks = [b"\x00\x00" * int(SAMPLE_RATE * leading)]
+    for text, pcm in talk_sentences(minutes):
+        chunks.append(pcm)
+        chunks.append(b"\x00\x00" * int(SAMPLE_RATE * pause))
+    return ENCODER.encode(chunks, mp3_path)
+
+
+def assemble_stream(minutes, mp3_path):
+    leading, pause = ACADEMIC_TALK_LAYOUT
+    with ENCODER.open(mp3_path) as stream:
+        timeline = Timeline(SAMPLE_RATE, sink=stream.write)
+        timeline.add_silence(leading)
+        for text, pcm in talk_sentences(minutes):
+            timeline.add_speech(pcm, text)
+            timeline.add_silence(pause)
+    return stream.size
+
+
+def child(mode, minutes):
+    """Run one assembly in this (fresh) process and print its measurements as JSON."""
+    with tempfile.TemporaryDirectory(prefix="memory-bench-") as tmp:
+        assemble_stream(0.02, Path(tmp) / "warmup.mp3")   # load codecs and data before the baseline
+        baseline = peak_rss_mb()
+        started = time.perf_counter()
+        size = (assemble_collect if mode == "collect" else assemble_stream)(minutes, Path(tmp) / "clip.mp3")
+        elapsed = time.perf_counter() - started
+    print(json.dumps({"mode": mode, "minutes": minutes, "baseline_mb": round(baseline, 1),
+                      "peak_mb": round(peak_rss_mb(), 1), "growth_mb": round(peak_rss_mb() - baseline, 1),
+                      "mp3_kb": round(size / 1024), "seconds": round(elapsed, 2), "backend": ENCODER.backend}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of clip assembly + encoding vs. clip length")
+    parser.add_argument("--minutes", type=float, nargs="+", default=DEFAULT_MINUTES,
+                        help=f"Clip lengths to assemble (default: {' '.join(map(str, DEFAULT_MINUTES))})")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Assembly paths (default: both)")
+    parser.add_argument("--report", help="Also write the results as JSON to this path")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "MINUTES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], float(args.child[1]))
+        return
+
+    print(f"Peak RSS of one assembly + encode ({ENCODER.backend}, {SAMPLE_RATE} Hz), fresh process each:")
+    print(f"  {'mode':<8} {'minutes':>7} {'baseline':>9} {'peak':>9} {'growth':>9} {'MP3':>8} {'time':>7}")
+    results = []
+    for mode in args.modes:
+        for minutes in args.minutes:
+            proc = subprocess.run([sys.executable, __file__, "--child", mode, str(minutes)],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"  {mode:<8} {minutes:>7g}  failed: {proc.stderr.strip().splitlines()[-1:]}", file=sys.stderr)
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(r)
+            print(f"  {mode:<8} {minutes:>7g} {r['baseline_mb']:>7.1f}MB {r['peak_mb']:>7.1f}MB "
+                  f"{r['growth_mb']:>7.1f}MB {r['mp3_kb']:>6}KB {r['seconds']:>6.1f}s")
+
+    for mode in args.modes:
+        runs = [r for r in results if r["mode"] == mode]
+        if len(runs) > 1:
+            per_minute = (runs[-1]["growth_mb"] - runs[0]["growth_mb"]) / (runs[-1]["minutes"] - runs[0]["minutes"])
+            print(f"{mode}: {per_minute:+.2f} MB of peak RSS per extra minute of audio")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps({"results": results}, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the audio build pipeline against the mock TTS server.
+
+Runs audio_build.build() over the real job graph (data/*.json). That covers
+planning, deduplication, the rate-limited synthesis engine, the pooled HTTP
+client, assembly, MP3 encoding and the timing sidecars. Requests go to
+mock_inworld_server.py on a local port, so no API key is needed and nothing
+is billed. Outputs and the build manifest go to a scratch directory, so the
+committed audio and audio/.manifest.json are never touched. The TTS cache is
+off unless --cache is given, and then it lives in the scratch directory too.
+
+Reported per run:
+  clips/s     output files per second of wall time
+  req/s       HTTP requests per second (retries included)
+  p50 / p99   client-side request latency (mock latency + HTTP + decode)
+  encoder     MP3 files/s and x realtime, over the time spent encoding
+
+The in-process mock shares the GIL (and, on a small machine, the cores) with
+the client and the encoder processes, which inflates p99 while encodes run;
+for latency numbers on their own, start mock_inworld_server.py in another
+terminal and pass --url.
+
+Usage:
+  python3 scripts/benchmark-audio-pipeline.py
+  python3 scripts/benchmark-audio-pipeline.py --tasks choose-response --runs 3
+  python3 scripts/benchmark-audio-pipeline.py --latency-ms 600 --jitter-ms 300 --error-rate 0.05
+  python3 scripts/benchmark-audio-pipeline.py --rate 50 --workers 16 --report /tmp/pipeline.json
+  python3 scripts/benchmark-audio-pipeline.py --url http://127.0.0.1:8089/tts/v1/voice   # a running mock
+
+Environment:
+  TTS_MAX_WORKERS / TTS_RATE_LIMIT   engine defaults, as in a real build (override with --workers / --rate)
+  AUDIO_ENCODER                      lameenc | ffmpeg
+  ENCODE_WORKERS                     encoder processes (default: CPU count)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import audio_build
+from audio_build import MODEL_ID, SAMPLE_RATE, TASKS, load_jobs
+from audio_manifest import BuildManifest
+from inworld_client import InworldClient
+from mock_inworld_server import add_server_args, server_from_args
+from tts_cache import TTSCache
+from tts_engine import SynthesisEngine
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_once(jobs, url, scratch, args):
+    """One full build of `jobs` (outputs already under `scratch`); returns the run's metrics."""
+    cache = TTSCache(cache_dir=scratch / "tts-cache", enabled=True) if args.cache else None
+    engine = SynthesisEngine(InworldClient("mock", MODEL_ID, SAMPLE_RATE, api_url=url),
+                             cache=cache, max_workers=args.workers, rate=args.rate)
+    manifest = BuildManifest(scratch / "manifest.json")
+    build_args = argparse.Namespace(force=True, dry_run=False, mark_current=False)
+
+    encoder = audio_build.ENCODER
+    before = (encoder.files, encoder.audio_seconds, encoder.encode_seconds)
+    log = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+        failed = audio_build.build(jobs, build_args, args.encode_workers, engine=engine, manifest=manifest)
+    wall = time.perf_counter() - started
+    files = encoder.files - before[0]
+    audio_seconds = encoder.audio_seconds - before[1]
+    encode_seconds = encoder.encode_seconds - before[2]
+    client = engine.client
+    client.close()
+
+    return {
+        "files": files,
+        "failed": failed,
+        "wall_seconds": round(wall, 3),
+        "clips_per_second": round(files / wall, 2) if wall else 0.0,
+        "requests": client.requests,
+        "retries": client.retries,
+        "requests_per_second": round(client.requests / wall, 2) if wall else 0.0,
+        "latency_p50_ms": round(client.latency.percentile(50), 1),
+        "latency_p99_ms": round(client.latency.percentile(99), 1),
+        "rate_limit": engine.limiter.target_rate,
+        "workers": engine.max_workers,
+        "unique_utterances": engine.unique,
+        "audio_seconds": round(audio_seconds, 1),
+        "encode_seconds": round(encode_seconds, 3),
+        "encoder_files_per_second": round(files / encode_seconds, 2) if encode_seconds else 0.0,
+        "encoder_realtime": round(audio_seconds / encode_seconds, 1) if encode_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audio build pipeline against a local mock TTS server")
+    parser.add_argument("--tasks", nargs="+", choices=list(TASKS), help="Only these task types (default: all)")
+    parser.add_argument("--only", nargs="+", metavar="GLOB", help='Only job ids matching these globs (e.g. "LCR-R03-*")')
+    parser.add_argument("--runs", type=int, default=1, help="Full builds to run (default: 1)")
+    parser.add_argument("--workers", type=int, help="Concurrent requests (default: TTS_MAX_WORKERS or 8)")
+    parser.add_argument("--rate", type=float, help="Requests per second (default: TTS_RATE_LIMIT or 5)")
+    parser.add_argument("--encode-workers", type=int,
+                        help="Encoder processes (default: ENCODE_WORKERS or CPU count)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Use a (scratch) TTS cache, so runs after the first measure the cache-hit path")
+    parser.add_argument("--url", help="Benchmark against an already running mock server instead of starting one")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show the build's own output")
+    parser.add_argument("--report", help="Also write the results as JSON to this path")
+    add_server_args(parser)
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.tasks, args.only)
+    if not jobs:
+        print("No jobs match")
+        return
+
+    server = None
+    url = args.url
+    if url is None:
+        server = server_from_args(args).start()
+        url = server.url
+    utterances = sum(len(job.speech) for job in jobs)
+    print(f"Benchmarking {len(jobs)} files ({utterances} utterances) against {url}")
+    if server is not None:
+        print(f"  mock latency {args.latency_ms:g} ms + {args.per_char_ms:g} ms/char, "
+              f"jitter +/-{args.jitter_ms:g} ms, error rate {args.error_rate:g}")
+
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="pipeline-bench-") as tmp:
+            scratch = Path(tmp)
+            for job in jobs:
+                job.output = scratch / "out" / job.output.resolve().relative_to(PROJECT_ROOT)
+            for n in range(1, args.runs + 1):
+                result = run_once(jobs, url, scratch, args)
+                runs.append(result)
+                print(f"  run {n}: {result['files']} files in {result['wall_seconds']:.2f}s  "
+                      f"{result['clips_per_second']:6.2f} clips/s  {result['requests_per_second']:6.2f} req/s  "
+                      f"p50 {result['latency_p50_ms']:.0f} ms  p99 {result['latency_p99_ms']:.0f} ms  "
+                      f"retries {result['retries']}  encoder {result['encoder_files_per_second']:.1f} files/s "
+                      f"({result['encoder_realtime']:.0f}x realtime)"
+                      + (f"  FAILED {result['failed']}" if result["failed"] else ""))
+    finally:
+        if server is not None:
+            server.stop()
+
+    last = runs[-1]
+    print(f"\nEngine: {last['workers']} workers @ {last['rate_limit']:g} req/s; "
+          f"{last['unique_utterances']} unique utterances per build")
+    if len(runs) > 1:
+        print(f"Median over {len(runs)} runs: "
+              f"{statistics.median(r['clips_per_second'] for r in runs):.2f} clips/s, "
+              f"p50 {statistics.median(r['latency_p50_ms'] for r in runs):.0f} ms, "
+              f"p99 {statistics.median(r['latency_p99_ms'] for r in runs):.0f} ms, "
+              f"encoder {statistics.median(r['encoder_files_per_second'] for r in runs):.1f} files/s")
+    if server is not None:
+        print(server.summary())
+    floor = last["unique_utterances"] / last["rate_limit"]
+    if last["wall_seconds"] < 1.5 * floor:
+        print(f"Rate-limit bound: {last['unique_utterances']} requests at {last['rate_limit']:g} req/s "
+              f"need {floor:.1f}s at least (raise --rate to measure the rest of the pipeline)")
+
+    if args.report:
+        report = {"url": url, "jobs": len(jobs), "utterances": utterances,
+                  "mock": None if server is None else {
+                      "latency_ms": args.latency_ms, "per_char_ms": args.per_char_ms,
+                      "jitter_ms": args.jitter_ms, "error_rate": args.error_rate},
+                  "runs": runs}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+    if any(r["failed"] for r in runs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark for the academic-discussion layout parser.
+
+Every screenshot whose D-item has complete-looking ground truth in the
+question bank (discussion_bank.reference()) is OCR'd the way
+ocr-discussion-images.py does it (preprocessed, through the OCR cache, so
+re-runs only pay for parsing) and split by discussion_layout.parse_discussion().
+Against the bank pieces that are really in the screenshot it reports:
+
+  question    capture: share of the professor's question recalled by the
+              parsed question, relative to what the OCR text itself recalls
+              (OCR misses are not the parser's fault)
+  purity      share of the parsed question that is not task instructions or
+              student post text (a parser that returns everything as the
+              question captures it all but is not pure)
+  posts       capture of each student post by the parsed post that recalls
+              it best (the bank does not always keep the screenshot's
+              order), and that post's precision (how much of it is the
+              reference post)
+  2 posts     share of images where two posts were found
+  ms/image    parse time, OCR excluded
+
+Recall counts only runs of MIN_RUN+ words in order (discussion_bank.word_recall),
+and the bank question is compared without its task preamble. The bank is
+uneven: a piece counts for an image only when the OCR text recalls
+PRESENT_MIN of it, and some questions are paraphrased or hold post text, so
+question capture stays below 1 even for a correct parse.
+
+--report writes per-image scores as JSON; --baseline compares with such a
+report and lists the images whose score dropped by more than --regression.
+
+Usage:
+  python3 scripts/benchmark-discussion-parser.py
+  python3 scripts/benchmark-discussion-parser.py --report /tmp/parser.json
+  python3 scripts/benchmark-discussion-parser.py --baseline /tmp/parser.json --only "d3*" -v
+
+Requires: pip install tesserocr pillow numpy  (or pytesseract and tesseract instead of tesserocr)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_bank import prompt_text, reference, word_recall
+from discussion_layout import parse_discussion
+from ocr_pool import OCR_AVAILABLE, default_workers, discussion_images, ocr_images, question_id
+from ocr_preprocess import ScreenshotPreprocessor
+
+# ==================== CONFIG ====================
+MIN_RUN = 3                      # words in a row for a match to count
+PRESENT_MIN = 0.3                # OCR recall above which a bank piece is in the screenshot
+TASK_TEXT = ("Write a post responding to the professor's question. In your response, you should do "
+             "the following. Express and support your opinion. Make a contribution to the discussion "
+             "in your own words. An effective response will contain at least 100 words.")
+METRICS = ("question", "purity", "post1", "post2", "post1_precision", "post2_precision")
+
+
+def recall(ref, text):
+    return word_recall(ref, text or "", MIN_RUN)
+
+
+def parsed_piece(parsed, piece, ref):
+    """The parsed question, or the parsed post that recalls ref best ("" if none was found)."""
+    if not parsed:
+        return ""
+    if piece == "question":
+        return parsed["question"]
+    return max((post["text"] for post in parsed["posts"]), key=lambda text: recall(ref, text), default="")
+
+
+def score(item, result):
+    """Per-image scores of one parse against the bank pieces present in the OCR text."""
+    started = time.perf_counter()
+    parsed = parse_discussion(result["words"], result.get("size"))
+    ms = 1000 * (time.perf_counter() - started)
+    refs = {"question": prompt_text(item["question"]), "post1": item["posts"][0], "post2": item["posts"][1]}
+    in_ocr = {piece: recall(ref, result["text"]) for piece, ref in refs.items()}
+    present = [piece for piece, value in in_ocr.items() if value >= PRESENT_MIN]
+    scores = {"ms": ms, "posts": len(parsed["posts"]) if parsed else 0, "layout": parsed and parsed["layout"]}
+    for piece in present:
+        text = parsed_piece(parsed, piece, refs[piece])
+        scores[piece] = min(1.0, recall(refs[piece], text) / in_ocr[piece])
+        if piece == "question":
+            others = " ".join(refs[p] for p in present if p != "question")
+            scores["purity"] = 1 - recall(text, f"{TASK_TEXT} {others}") if text else 0.0
+        else:
+            scores[f"{piece}_precision"] = recall(text, refs[piece]) if text else 0.0
+    return scores
+
+
+def summarize(scores):
+    values = list(scores.values())
+    summary = {"images": len(values)}
+    for metric in METRICS:
+        found = [s[metric] for s in values if metric in s]
+        summary[metric] = statistics.mean(found) if found else float("nan")
+        summary[f"{metric}_n"] = len(found)
+    summary["two_posts"] = statistics.mean(s["posts"] >= 2 for s in values)
+    summary["ms"] = statistics.mean(s["ms"] for s in values)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question/post segmentation accuracy of discussion_layout")
+    parser.add_argument("--only", default="d*", metavar="GLOB", help='Only images matching this glob (default: "d*")')
+    parser.add_argument("--limit", type=int, help="Only the first N images")
+    parser.add_argument("--jobs", "-j", type=int, default=default_workers(),
+                        help="Worker processes for OCR cache misses (default: OCR_WORKERS or CPU count)")
+    parser.add_argument("--report", help="Write per-image scores as JSON to this path")
+    parser.add_argument("--baseline", help="Compare with a --report from an earlier run")
+    parser.add_argument("--regression", type=float, default=0.1,
+                        help="With --baseline, list scores that dropped by more than this (default: 0.1)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List images with a score below 0.8")
+    args = parser.parse_args()
+
+    if not OCR_AVAILABLE:
+        print("❌ Needs pillow and tesserocr or pytesseract (pip install tesserocr pillow)")
+        sys.exit(1)
+
+    refs = reference()
+    images = [p for p in discussion_images(pattern=args.only) if question_id(p) in refs]
+    if args.limit:
+        images = images[:args.limit]
+    if not images:
+        print("No screenshots with ground truth found.")
+        return
+
+    print(f"OCR of {len(images)} images (cached results reused)...")
+    scores = {}
+    for path, result, error in ocr_images(images, workers=args.jobs, preprocessor=ScreenshotPreprocessor()):
+        if error is not None:
+            print(f"  ✗ {path.name}: {error}", file=sys.stderr)
+            continue
+        scores[path.name] = score(refs[question_id(path)], result)
+    if not scores:
+        print("\nNo image was OCR'd.")
+        sys.exit(1)
+
+    summary = summarize(scores)
+    print(f"\n{summary['images']} images, {summary['question_n']} questions and "
+          f"{summary['post1_n'] + summary['post2_n']} posts found in the OCR text\n")
+    print(f"{'question':>9} {'purity':>7} {'post 1':>7} {'post 2':>7} {'precision':>10} {'2 posts':>8} {'ms/image':>9}")
+    precision = statistics.mean(s[m] for s in scores.values() for m in ("post1_precision", "post2_precision") if m in s)
+    print(f"{summary['question']:>9.1%} {summary['purity']:>7.1%} {summary['post1']:>7.1%} {summary['post2']:>7.1%} "
+          f"{precision:>10.1%} {summary['two_posts']:>8.0%} {summary['ms']:>9.1f}")
+
+    if args.verbose:
+        weak = {image: s for image, s in scores.items() if any(s.get(m, 1) < 0.8 for m in METRICS)}
+        if weak:
+            print("\nBelow 0.8:")
+            for image, s in weak.items():
+                print(f"  {image:<48} " + " ".join(f"{m}={s[m]:.2f}" for m in METRICS if s.get(m, 1) < 0.8))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["images"]
+        regressions = [(image, metric, baseline[image][metric], s[metric])
+                       for image, s in scores.items() if image in baseline
+                       for metric in METRICS if metric in s and metric in baseline[image]
+                       and baseline[image][metric] - s[metric] > args.regression]
+        if regressions:
+            print(f"\nDown by more than {args.regression:.0%} against {args.baseline}:")
+            for image, metric, before, after in regressions:
+                print(f"  {image:<48} {metric:<16} {before:.2f} -> {after:.2f}")
+        else:
+            print(f"\nNo regressions against {args.baseline}")
+
+    if args.report:
+        report = {"summary": summary, "images": scores}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nReport: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare Listen & Repeat alignment methods against the committed SRTs.
+
+For every audio/lr/LR-S*.mp3 with a sentence list in data/lr-sentence-sets.json,
+and for a grid of (noise dB, min silence) settings, this aligns the sentences
+three ways and compares each sentence start with the committed SRT:
+
+  first-N  silence segments at the given thresholds, truncated to N
+           (generate-srt-silence.py --no-search)
+  search   sentence_align.fit_segments(): threshold bisection + merge/split
+  dp       forced_align.align(): one DP pass over candidate pauses
+
+A sentence counts as wrong when its start is more than --tolerance away
+from the SRT (default 250 ms, about a syllable). The grid matters: a method
+that is only right at hand-tuned thresholds will not align a new set without
+re-runs.
+
+Usage:
+  python3 scripts/benchmark-lr-alignment.py                  # 3 x 3 threshold grid
+  python3 scripts/benchmark-lr-alignment.py --noise-db -40 --silence-duration 0.8 --tolerance 0.1
+
+Requires: ffmpeg, numpy
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from forced_align import align
+from sentence_align import fit_segments, load_sentence_sets, segment
+from silence_detect import SilenceDetector
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LR_GLOB = "audio/lr/LR-S*.mp3"
+DEFAULT_NOISE_DB = [-50, -40, -30]
+DEFAULT_SILENCE = [0.3, 0.8, 1.5]
+SRT_START_RE = re.compile(r"^(\d+):(\d+):(\d+),(\d+) -->", re.M)
+METHODS = ["first-N", "search", "dp"]
+
+
+def srt_starts(srt_path):
+    return [int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+            for h, m, s, ms in SRT_START_RE.findall(srt_path.read_text(encoding="utf-8"))]
+
+
+def wrong(segments, reference, tolerance):
+    """Sentences whose start is off by more than tolerance (missing segments count as wrong)."""
+    starts = [seg["start"] for seg in segments]
+    return sum(1 for i, ref in enumerate(reference) if i >= len(starts) or abs(starts[i] - ref) > tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LR alignment methods against the committed SRTs")
+    parser.add_argument("--noise-db", type=float, nargs="+", default=DEFAULT_NOISE_DB,
+                        help="Noise thresholds in dB (default: %(default)s)")
+    parser.add_argument("--silence-duration", type=float, nargs="+", default=DEFAULT_SILENCE,
+                        help="Min silence durations in seconds (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Seconds (default: 0.25)")
+    args = parser.parse_args()
+
+    grid = [(noise_db, min_silence) for noise_db in args.noise_db for min_silence in args.silence_duration]
+    sets = load_sentence_sets()
+    detector = SilenceDetector()
+    totals = {m: 0 for m in METHODS}
+    times = {m: 0.0 for m in METHODS}
+    checked = 0
+    runs = 0
+
+    print(f"{'file':<36} {'setting':>10} " + " ".join(f"{m:>8}" for m in METHODS))
+    for audio_path in sorted(PROJECT_ROOT.glob(LR_GLOB)):
+        set_id = audio_path.name[3:6]
+        srt_path = audio_path.with_suffix(".srt")
+        if set_id not in sets or not srt_path.exists():
+            continue
+        sentences = sets[set_id]["sentences"]
+        reference = srt_starts(srt_path)
+        envelope = detector.envelope(audio_path)
+        for noise_db, min_silence in grid:
+            results = {}
+            started = time.perf_counter()
+            results["first-N"] = segment(envelope, noise_db, min_silence)[:len(sentences)]
+            times["first-N"] += time.perf_counter() - started
+            started = time.perf_counter()
+            results["search"] = fit_segments(envelope, sentences, noise_db, min_silence)[0]
+            times["search"] += time.perf_counter() - started
+            started = time.perf_counter()
+            results["dp"] = align(envelope, sentences, noise_db)[0]
+            times["dp"] += time.perf_counter() - started
+
+            counts = {m: wrong(results[m], reference, args.tolerance) for m in METHODS}
+            for m in METHODS:
+                totals[m] += counts[m]
+            checked += len(reference)
+            runs += 1
+            print(f"{audio_path.name:<36} {noise_db:>5g}/{min_silence:<4g} "
+                  + " ".join(f"{counts[m]:>8}" for m in METHODS))
+
+    if not checked:
+        print(f"No aligned sets found ({LR_GLOB} with .srt and a sentence list)")
+        return
+    print(f"\nWrong sentence starts (> {args.tolerance * 1000:.0f} ms) out of {checked}:")
+    for m in METHODS:
+        print(f"  {m:<8} {totals[m]:>5}  ({times[m] / runs * 1000:.1f} ms per alignment, envelope cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Compare OCR of the discussion screenshots with and without preprocessing.
+
+Every screenshot whose D-item has complete-looking ground truth in the
+question bank (discussion_bank.reference()) is OCR'd twice, as-is and
+through ocr_preprocess.ScreenshotPreprocessor. The OCR cache is bypassed so
+both passes pay for real OCR. Per pass it reports:
+
+  s/image     median and mean seconds per image (preprocessing included)
+  accuracy    share of the reference words found, in order, in the OCR text
+              (difflib), over the bank pieces (professor question, post 1,
+              post 2) that are in the screenshot at all. The bank is uneven,
+              so a piece only counts when either pass recalls half of it
+              (discussion_bank.pieces_in); the same pieces score both passes
+  posts       the same, for the student posts only
+  chrome      lines per image with exam chrome (TOEFL, Volume, Help, Next,
+              Question N of N, Hide Time, Cut/Paste/Undo/Redo, Word Count)
+
+Images whose accuracy drops by more than --regression are listed.
+
+Usage:
+  python3 scripts/benchmark-ocr-preprocess.py
+  python3 scripts/benchmark-ocr-preprocess.py --limit 20 --jobs 4
+  python3 scripts/benchmark-ocr-preprocess.py --binarize --max-width 1200 --report /tmp/ocr-preprocess.json
+
+Requires: pip install tesserocr pillow numpy  (or pytesseract and tesseract instead of tesserocr)
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_bank import pieces_in, reference, word_recall
+from ocr_cache import OCRCache
+from ocr_pool import OCR_AVAILABLE, default_workers, discussion_images, ocr_images, question_id
+from ocr_preprocess import DEFAULT_MAX_WIDTH, NUMPY_AVAILABLE, ScreenshotPreprocessor
+
+# ==================== CONFIG ====================
+CHROME_RE = re.compile(r"\b(toefl|volume|help|next|previous|hide time|question \d+ of \d+|"
+                       r"cut|paste|undo|redo|word count)\b", re.I)
+
+
+def run(name, images, preprocessor, jobs):
+    """OCR every image (no cache); ({image name: result}, wall seconds) for the successful ones."""
+    print(f"{name}: OCR of {len(images)} images with {jobs} worker(s)...")
+    results = {}
+    started = time.perf_counter()
+    for n, (path, result, error) in enumerate(
+            ocr_images(images, workers=jobs, cache=OCRCache(enabled=False), preprocessor=preprocessor), 1):
+        if error is not None:
+            print(f"  ✗ [{n}/{len(images)}] {path.name}: {error}", file=sys.stderr)
+            continue
+        results[path.name] = result
+        print(f"  ✓ [{n}/{len(images)}] {path.name} ({len(result['text'])} chars, {result['seconds']:.2f}s)")
+    return results, time.perf_counter() - started
+
+
+def score(text, seconds, pieces):
+    """Per-image metrics of one pass over the reference pieces found in the screenshot."""
+    posts = [ref for piece, ref in pieces.items() if piece != "question"]
+    return {
+        "seconds": seconds,
+        "accuracy": statistics.mean(word_recall(ref, text) for ref in pieces.values()) if pieces else None,
+        "posts": statistics.mean(word_recall(ref, text) for ref in posts) if posts else None,
+        "chrome": sum(1 for line in text.splitlines() if CHROME_RE.search(line)),
+        "pieces": len(pieces),
+    }
+
+
+def mean_of(scores, key):
+    values = [s[key] for s in scores if s[key] is not None]
+    return statistics.mean(values) if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR speed and accuracy with and without screenshot preprocessing")
+    parser.add_argument("--only", default="d*", metavar="GLOB", help='Only images matching this glob (default: "d*")')
+    parser.add_argument("--limit", type=int, help="Only the first N images")
+    parser.add_argument("--jobs", "-j", type=int, default=default_workers(),
+                        help="Worker processes (default: OCR_WORKERS or CPU count)")
+    parser.add_argument("--binarize", action="store_true", help="Add Otsu binarization to the preprocessed pass")
+    parser.add_argument("--max-width", type=int, default=DEFAULT_MAX_WIDTH,
+                        help=f"Downscale wider images to this (default: {DEFAULT_MAX_WIDTH}; 0 = never)")
+    parser.add_argument("--no-crop", action="store_true", help="Keep the exam header")
+    parser.add_argument("--no-mask", action="store_true", help="Keep the editor toolbar")
+    parser.add_argument("--regression", type=float, default=0.05,
+                        help="List images whose accuracy drops by more than this (default: 0.05)")
+    parser.add_argument("--report", help="Also write per-image scores as JSON to this path")
+    args = parser.parse_args()
+
+    if not OCR_AVAILABLE or not NUMPY_AVAILABLE:
+        print("❌ Needs pillow, numpy and tesserocr or pytesseract (pip install tesserocr pillow numpy)")
+        sys.exit(1)
+
+    refs = reference()
+    images = [p for p in discussion_images(pattern=args.only) if question_id(p) in refs]
+    if args.limit:
+        images = images[:args.limit]
+    if not images:
+        print("No screenshots with ground truth found.")
+        return
+
+    preprocessor = ScreenshotPreprocessor(enabled=True, crop=not args.no_crop, mask=not args.no_mask,
+                                          binarize=args.binarize, max_width=args.max_width)
+    passes = {}
+    walls = {}
+    for name, pre in (("raw", ScreenshotPreprocessor(enabled=False)), ("preprocessed", preprocessor)):
+        passes[name], walls[name] = run(name, images, pre, args.jobs)
+
+    common = [p.name for p in images if all(p.name in results for results in passes.values())]
+    if not common:
+        print("\nNo image was OCR'd in both passes.")
+        sys.exit(1)
+    scores = {name: {} for name in passes}
+    pieces_total = 0
+    for image in common:
+        texts = {name: passes[name][image]["text"] for name in passes}
+        pieces = pieces_in(refs[question_id(image)], list(texts.values()))
+        pieces_total += len(pieces)
+        for name in passes:
+            scores[name][image] = score(texts[name], passes[name][image]["seconds"], pieces)
+
+    print(f"\n{len(common)} images, {len(set(question_id(image) for image in common))} D-items, "
+          f"{pieces_total} of {3 * len(common)} reference pieces found in the screenshots")
+    print(f"preprocessing: {json.dumps(preprocessor.signature())}\n")
+    print(f"{'pass':<14} {'s/image (median/mean)':>22} {'wall':>8} {'accuracy':>9} {'posts':>7} {'chrome':>7}")
+    summaries = {}
+    for name in passes:
+        values = list(scores[name].values())
+        seconds = [s["seconds"] for s in values]
+        summaries[name] = {"images": len(values), "median_seconds": statistics.median(seconds),
+                           "mean_seconds": statistics.mean(seconds), "wall_seconds": walls[name],
+                           "accuracy": mean_of(values, "accuracy"), "posts": mean_of(values, "posts"),
+                           "chrome": statistics.mean(s["chrome"] for s in values)}
+        summary = summaries[name]
+        print(f"{name:<14} {summary['median_seconds']:>13.2f} / {summary['mean_seconds']:<6.2f} "
+              f"{summary['wall_seconds']:>7.1f}s {summary['accuracy']:>9.1%} {summary['posts']:>7.1%} "
+              f"{summary['chrome']:>7.1f}")
+    raw, pre = summaries["raw"], summaries["preprocessed"]
+    print(f"\nSeconds per image {pre['mean_seconds'] / raw['mean_seconds'] - 1:+.0%}, "
+          f"accuracy {100 * (pre['accuracy'] - raw['accuracy']):+.1f} points, "
+          f"chrome lines {pre['chrome'] - raw['chrome']:+.1f} per image")
+
+    regressions = [(image, scores["raw"][image]["accuracy"], scores["preprocessed"][image]["accuracy"])
+                   for image in common if scores["raw"][image]["accuracy"] is not None
+                   and scores["raw"][image]["accuracy"] - scores["preprocessed"][image]["accuracy"] > args.regression]
+    if regressions:
+        print(f"\nAccuracy down by more than {args.regression:.0%}:")
+        for image, before, after in regressions:
+            print(f"  {image:<48} {before:6.1%} -> {after:6.1%}")
+
+    if args.report:
+        report = {"preprocess": preprocessor.signature(), "summary": summaries,
+                  "images": {image: {name: scores[name][image] for name in passes} for image in common}}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nReport: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
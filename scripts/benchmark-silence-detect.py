@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark and cross-check silence detection on audio/lr.
+
+For every LR-S*.mp3 this runs the legacy path (ffmpeg silencedetect + ffprobe,
+two processes per file) and the NumPy detector, then compares the speech
+segments silences_to_speech_segments() derives from each. The detector is
+timed cold (decode + envelope, written to a scratch disk cache) and warm (a
+fresh detector reading that cache, i.e. a later run on unchanged audio). A
+parameter sweep shows what the in-memory cache buys: the legacy path
+re-decodes for every threshold, the detector decodes once.
+
+Usage:
+  python3 scripts/benchmark-silence-detect.py
+  python3 scripts/benchmark-silence-detect.py --sweep -50 -45 -40 -35 -30
+
+Requires: ffmpeg, ffprobe, numpy
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from silence_detect import (SilenceDetector, add_detector_args, get_audio_duration, run_silencedetect,
+                            silences_to_speech_segments)
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LR_GLOB = "audio/lr/LR-S*.mp3"
+
+
+def max_boundary_diff(a, b):
+    """Largest start/end difference in seconds between two segment lists (inf if counts differ)."""
+    if len(a) != len(b):
+        return float("inf")
+    return max((max(abs(x["start"] - y["start"]), abs(x["end"] - y["end"])) for x, y in zip(a, b)),
+               default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ffmpeg silencedetect with the NumPy detector")
+    parser.add_argument("--silence-duration", type=float, default=0.8, help="Min silence duration in seconds")
+    parser.add_argument("--noise-db", type=float, default=-40, help="Noise threshold in dB")
+    parser.add_argument("--sweep", type=float, nargs="*", default=[-50, -45, -40, -35, -30],
+                        help="Thresholds (dB) for the parameter-sweep timing")
+    add_detector_args(parser)
+    args = parser.parse_args()
+
+    files = sorted(PROJECT_ROOT.glob(LR_GLOB))
+    if not files:
+        print(f"No files match {LR_GLOB}")
+        return
+    have_ffprobe = shutil.which("ffprobe") is not None
+
+    # Scratch disk cache, so the cold pass really decodes and the warm pass reads it back
+    scratch = tempfile.TemporaryDirectory(prefix="envelope-bench-")
+    settings = dict(kind=args.envelope, frame_ms=args.frame_ms, hop_ms=args.hop_ms, cache_dir=scratch.name)
+    detector = SilenceDetector(**settings)
+
+    legacy_total = 0.0
+    numpy_total = 0.0
+    warm_total = 0.0
+    print(f"{'file':<36} {'legacy':>8} {'cold':>8} {'warm':>8} {'segments':>9} {'max diff':>9}")
+    for path in files:
+        started = time.perf_counter()
+        legacy_silences = run_silencedetect(str(path), args.silence_duration, args.noise_db)
+        legacy_duration = get_audio_duration(str(path)) if have_ffprobe else None
+        legacy_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        silences, duration = detector.detect(path, args.silence_duration, args.noise_db)
+        numpy_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        SilenceDetector(**settings).detect(path, args.silence_duration, args.noise_db)
+        warm_time = time.perf_counter() - started
+
+        if legacy_duration is None:
+            legacy_duration = duration  # no ffprobe: compare boundaries on the same duration
+        legacy_segments = silences_to_speech_segments(legacy_silences, legacy_duration)
+        segments = silences_to_speech_segments(silences, duration)
+        diff = max_boundary_diff(legacy_segments, segments)
+
+        legacy_total += legacy_time
+        numpy_total += numpy_time
+        warm_total += warm_time
+        counts = f"{len(legacy_segments)}/{len(segments)}"
+        print(f"{path.name:<36} {legacy_time:7.2f}s {numpy_time:7.2f}s {warm_time:7.3f}s "
+              f"{counts:>9} {diff * 1000:7.1f}ms")
+
+    n = len(files)
+    print(f"\nPer file: legacy {legacy_total / n:.2f}s, numpy cold {numpy_total / n:.2f}s "
+          f"({legacy_total / numpy_total:.1f}x), warm {warm_total / n:.3f}s ({legacy_total / warm_total:.0f}x)")
+    if not have_ffprobe:
+        print("(ffprobe not found: legacy timings exclude the duration probe)")
+
+    if args.sweep:
+        started = time.perf_counter()
+        for noise_db in args.sweep:
+            for path in files:
+                run_silencedetect(str(path), args.silence_duration, noise_db)
+        legacy_sweep = time.perf_counter() - started
+        started = time.perf_counter()
+        for noise_db in args.sweep:
+            for path in files:
+                detector.detect(path, args.silence_duration, noise_db)
+        numpy_sweep = time.perf_counter() - started
+        print(f"Sweep over {len(args.sweep)} thresholds x {n} files: legacy {legacy_sweep:.2f}s, "
+              f"numpy (cached envelopes) {numpy_sweep:.3f}s")
+    scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Pack each Choose-a-Response set into one MP3 sprite with a JSON offset index.
+
+toefl-listening-choose-response-practice.html loads a separate
+audio/listening/LCR-R01-NN.mp3 for every question: 30 HTTP requests and 30
+decoder start-ups per set. This build stage decodes every clip of a set,
+concatenates the PCM and encodes it once with audio_encoder.MP3Encoder:
+
+  gapless        one continuous encode, so there is no per-clip encoder
+                 priming or end padding between clips; the Xing/LAME frame
+                 carries the sprite's delay and padding, and PCM sample n
+                 plays at exactly n / SAMPLE_RATE seconds
+  frame-aligned  each clip is preceded by < 1 frame of digital silence so
+                 that its first sample opens an MP3 frame of the decoded
+                 stream ((start + codec delay) % 1152 == 0): a seek to a
+                 clip start never lands mid-frame, and no clip shares a
+                 frame with the tail of the one before
+
+Sets are discovered from the file names (LCR-R01-01.mp3 -> set LCR-R01,
+question R01-01), so a new R04 is packed without editing this script. A
+set with missing clips (R02 has 9 of 30) is packed with what exists; the
+page plays the rest from their own files.
+
+Outputs:
+  audio/listening/sprites/LCR-R01.mp3
+  audio/listening/sprites/LCR-R01.json    what the page loads:
+    {"version": 2, "sprite": "audio/listening/sprites/LCR-R01.mp3",
+     "sample_rate": 48000, "samples": 9914991, "codec_delay": 1105, "bytes": 2196888,
+     "clips": {"R01-01": {"source": "audio/listening/LCR-R01-01.mp3", "sha256": "3b7e...",
+                          "start": 0.000979, "end": 5.283646, "duration": 5.282667,
+                          "start_sample": 47, "end_sample": 253615}}}
+The page decodes the sprite once with Web Audio and plays [start, end) of
+it; it uses the per-file MP3s until the sprite is ready, or if the index
+is missing.
+
+Sprites are tracked in audio/.manifest.json (audio_manifest.py): a sprite
+is rebuilt only when one of its clips or the encoder settings change. Until
+then, build-audio.py and reencode-audio.py drop the clips whose MP3 they
+changed from the index (audio_sprites.drop_stale_clips), and the page plays
+those questions from their own files.
+
+After building, a size/latency report compares the sprite with the
+per-file layout: bytes, requests, and the wait before each question plays
+under a few network profiles (a transfer model: round trips + bytes /
+bandwidth, not a measurement). --verify also decodes every sprite and
+checks each clip against its source (SNR; a clip offset by even one
+sample scores well below the lossy-coding floor).
+
+Usage:
+  python3 scripts/build-audio-sprites.py
+  python3 scripts/build-audio-sprites.py --sets R01 R03 --force --verify
+  python3 scripts/build-audio-sprites.py --dry-run
+  python3 scripts/build-audio-sprites.py --report /tmp/sprite-report.json
+
+Requires: ffmpeg (decode; and encode unless lameenc is installed); numpy for --verify
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_encoder import DECODER_DELAY, ENCODER_DELAY, MP3Encoder
+from audio_manifest import BuildManifest, add_build_args, input_hash, plan_outputs
+from audio_sprites import PROJECT_ROOT, SPRITE_VERSION, SPRITES_DIR, file_digest, load_index, relative, write_index
+from audio_timing import silence
+
+# ==================== CONFIG ====================
+CLIPS_DIR = PROJECT_ROOT / "audio" / "listening"
+CLIP_RE = re.compile(r"^(LCR-(R\d+))-(\d+)\.mp3$")   # LCR-R01-07.mp3 -> sprite LCR-R01, question R01-07
+SAMPLE_RATE = 48000           # the generators write 48 kHz mono; decoding at the source rate avoids resampling
+BYTES_PER_SAMPLE = 2
+FRAME_SAMPLES = 1152          # MPEG-1 Layer III frame
+CODEC_DELAY = ENCODER_DELAY + DECODER_DELAY
+MIN_SNR_DB = 20.0             # --verify: placed clips measure ~28-32 dB; one sample off drops to ~15
+
+# Transfer model for the report: (round-trip seconds, megabits per second).
+# Every request costs one round trip on a warm connection; bodies stream at the given rate.
+NETWORK_PROFILES = {
+    "3g": (0.300, 1.6),
+    "4g": (0.070, 12.0),
+    "broadband": (0.020, 50.0),
+}
+
+ENCODER = MP3Encoder(SAMPLE_RATE)
+
+
+def decode_pcm(mp3_path):
+    """Decode to 16-bit mono PCM bytes at SAMPLE_RATE."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(mp3_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+def discover(only=None):
+    """{sprite name: [(question id, clip path)]} for every LCR clip, in question order."""
+    groups = {}
+    for path in sorted(CLIPS_DIR.glob("LCR-R*-*.mp3")):
+        match = CLIP_RE.match(path.name)
+        if not match:
+            continue
+        name, set_id, number = match.groups()
+        if only and set_id not in only:
+            continue
+        groups.setdefault(name, []).append((f"{set_id}-{number}", path))
+    return groups
+
+
+def align_pad(position):
+    """Silent samples needed so a clip starting after `position` samples opens a decoded MP3 frame."""
+    return -(position + CODEC_DELAY) % FRAME_SAMPLES
+
+
+def pack(name, clips):
+    """Decode and concatenate one set's clips; encode the sprite and return its index."""
+    sprite_path = SPRITES_DIR / f"{name}.mp3"
+    entries = {}
+    position = 0
+    with ENCODER.open(sprite_path) as stream:
+        for question_id, path in clips:
+            pad = align_pad(position)
+            for chunk in silence(pad):
+                stream.write(chunk)
+            position += pad
+            pcm = decode_pcm(path)
+            samples = len(pcm) // BYTES_PER_SAMPLE
+            stream.write(pcm[:samples * BYTES_PER_SAMPLE])
+            entries[question_id] = {
+                "source": relative(path),
+                "sha256": file_digest(path),
+                "start": round(position / SAMPLE_RATE, 6),
+                "end": round((position + samples) / SAMPLE_RATE, 6),
+                "duration": round(samples / SAMPLE_RATE, 6),
+                "start_sample": position,
+                "end_sample": position + samples,
+            }
+            position += samples
+    size = stream.size
+    return {
+        "version": SPRITE_VERSION,
+        "sprite": relative(sprite_path),
+        "sample_rate": SAMPLE_RATE,
+        "samples": position,
+        "codec_delay": CODEC_DELAY,
+        "bytes": size,
+        "clips": entries,
+    }
+
+
+def verify(index):
+    """(decoded sample count matches, worst clip SNR in dB, question id of the worst clip)."""
+    pcm = np.frombuffer(decode_pcm(PROJECT_ROOT / index["sprite"]), dtype="<i2").astype(np.float64)
+    worst, worst_id = math.inf, None
+    for question_id, clip in index["clips"].items():
+        source = np.frombuffer(decode_pcm(PROJECT_ROOT / clip["source"]), dtype="<i2").astype(np.float64)
+        packed = pcm[clip["start_sample"]:clip["end_sample"]]
+        n = min(len(source), len(packed))
+        noise = np.sum((source[:n] - packed[:n]) ** 2)
+        snr = 10 * math.log10(np.sum(source[:n] ** 2) / noise) if noise else math.inf
+        if snr < worst:
+            worst, worst_id = snr, question_id
+    return len(pcm) == index["samples"], worst, worst_id
+
+
+def transfer_seconds(requests, size, profile):
+    rtt, mbps = NETWORK_PROFILES[profile]
+    return requests * rtt + size * 8 / (mbps * 1e6)
+
+
+def compare(index):
+    """Size/latency of one sprite vs. its per-file clips."""
+    sizes = [(PROJECT_ROOT / clip["source"]).stat().st_size for clip in index["clips"].values()]
+    per_file = sum(sizes)
+    row = {
+        "sprite": index["sprite"],
+        "clips": len(sizes),
+        "per_file_bytes": per_file,
+        "sprite_bytes": index["bytes"],
+        "per_file_requests": len(sizes),
+        "sprite_requests": 1,
+        "latency": {},
+    }
+    for profile in NETWORK_PROFILES:
+        # Per file: every question waits for its own clip. Sprite: the first
+        # question waits for the whole set, every later one waits for nothing
+        # (the page prefetches it on load, which usually hides even that).
+        waits = [transfer_seconds(1, size, profile) for size in sizes]
+        sprite_wait = transfer_seconds(1, index["bytes"], profile)
+        row["latency"][profile] = {
+            "per_file_first": round(waits[0], 3),
+            "per_file_total": round(sum(waits), 3),
+            "sprite_first": round(sprite_wait, 3),
+            "sprite_total": round(sprite_wait, 3),
+        }
+    return row
+
+
+def print_report(rows):
+    print(f"\n{'sprite':<10} {'clips':>5} {'per-file':>10} {'sprite':>10} {'size':>7}  requests")
+    for r in rows:
+        change = (r["sprite_bytes"] - r["per_file_bytes"]) / r["per_file_bytes"] * 100
+        print(f"{Path(r['sprite']).stem:<10} {r['clips']:>5} {r['per_file_bytes'] / 1024:>8.0f}KB "
+              f"{r['sprite_bytes'] / 1024:>8.0f}KB {change:>+6.1f}%  {r['per_file_requests']} -> 1")
+
+    print("\nWait before playback, per-file vs. sprite (model: round trips + bytes / bandwidth):")
+    print(f"{'sprite':<10} {'network':<10} {'first question':>22} {'whole set':>22}")
+    for r in rows:
+        for profile, t in r["latency"].items():
+            print(f"{Path(r['sprite']).stem:<10} {profile:<10} "
+                  f"{t['per_file_first']:>9.2f}s -> {t['sprite_first']:>6.2f}s "
+                  f"{t['per_file_total']:>9.2f}s -> {t['sprite_total']:>6.2f}s")
+    print("The sprite's first wait is normally hidden: the page fetches it when the set opens "
+          "and plays per-file clips until it is decoded.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack Choose-a-Response clips into one sprite per set")
+    parser.add_argument("--sets", nargs="+", help="Only these set ids (e.g. R01 R03)")
+    parser.add_argument("--verify", action="store_true", help="Decode each sprite and check every clip's offset")
+    parser.add_argument("--report", help="Also write the size/latency comparison as JSON to this path")
+    add_build_args(parser)
+    args = parser.parse_args()
+
+    if args.verify and not NUMPY_AVAILABLE:
+        print("Error: --verify needs numpy (pip install numpy)", file=sys.stderr)
+        sys.exit(1)
+
+    groups = discover(args.sets)
+    if not groups:
+        print(f"No clips found ({relative(CLIPS_DIR)}/LCR-R*-*.mp3)")
+        return
+    manifest = BuildManifest()
+    targets = {}
+    for name, clips in groups.items():
+        digest = input_hash(clips=[(question_id, file_digest(path)) for question_id, path in clips],
+                            sample_rate=SAMPLE_RATE, frame=FRAME_SAMPLES, codec_delay=CODEC_DELAY,
+                            version=SPRITE_VERSION, encoder=ENCODER.signature())
+        targets[name] = (SPRITES_DIR / f"{name}.mp3", digest)
+
+    stale = set(plan_outputs(manifest, targets, args))
+    if args.dry_run or args.mark_current:
+        return
+
+    rows = []
+    for name, clips in groups.items():
+        sprite_path, digest = targets[name]
+        index_path = sprite_path.with_suffix(".json")
+        index = None if name in stale else load_index(index_path)
+        if index is None:
+            print(f"{name}: packing {len(clips)} clips")
+            index = pack(name, clips)
+            write_index(index_path, index)
+            manifest.record(sprite_path, digest)
+        if args.verify:
+            length_ok, snr, worst_id = verify(index)
+            status = "ok" if length_ok and snr >= MIN_SNR_DB else "FAILED"
+            print(f"  verify {name}: decoded length {'matches' if length_ok else 'DIFFERS'}, "
+                  f"worst clip {worst_id} at {snr:.1f} dB SNR -> {status}")
+        rows.append(compare(index))
+
+    print_report(rows)
+    if ENCODER.files:
+        print(ENCODER.summary())
+    if args.report:
+        Path(args.report).write_text(json.dumps({"profiles": NETWORK_PROFILES, "sprites": rows}, indent=2) + "\n",
+                                     encoding="utf-8")
+        print(f"Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Build speech-optimized Opus and AAC variants of every catalog MP3.
+
+The practice pages play the MP3s in audio/listening, audio/interview,
+audio/lr and audio/lr/clips. This build stage encodes each one again as
+WebM/Opus and MP4/AAC (audio_variants.py). Each source is decoded once and
+that same PCM feeds both encoders, in parallel across files
+(encode_pool.EncodePool). Each directory then gets a variants.json:
+
+  audio/listening/variants.json
+    {"version": 2,
+     "formats": {"opus": {"ext": ".webm", "mime": "audio/webm; codecs=\\"opus\\"", "bitrate": 24000},
+                 "aac": {...}},
+     "files": {"audio/listening/LA-A01-01.mp3": {
+       "duration": 44.265, "bytes": 523772, "sha256": "9f2c...",
+       "variants": {"opus": {"file": "audio/listening/LA-A01-01.webm", "bytes": 138537},
+                    "aac": {"file": "audio/listening/LA-A01-01.m4a", "bytes": 188131}}}}}
+
+The pages load the manifest of the directory they play from and pick the
+smallest variant the browser reports it can play (canPlayType "probably").
+They fall back to the MP3 when a file has no entry.
+
+Variants are tracked in audio/.manifest.json (audio_manifest.py). A variant
+is rebuilt only when its source MP3 or the variant settings change. "sha256"
+is the MP3 an entry was built from: the stages that write MP3s
+(build-audio.py, build-lr-clips.py, reencode-audio.py) drop the entries of
+the files they changed (audio_variants.drop_stale_variants), so the pages
+play the new MP3 until this is run again. Sprites are not covered: the choose-response page
+decodes them with Web Audio at MP3 frame offsets.
+
+Every run ends with a report of bytes per directory: MP3 against each
+variant and against the smallest one. --verify also decodes every variant
+and checks it against its MP3: same start (the timing sidecars rely on it)
+and a length within one codec frame.
+
+Usage:
+  python3 scripts/build-audio-variants.py
+  python3 scripts/build-audio-variants.py --dirs audio/interview --variants opus
+  python3 scripts/build-audio-variants.py --dry-run
+  python3 scripts/build-audio-variants.py --verify --report /tmp/variants.json
+
+Environment:
+  ENCODE_WORKERS   default for --jobs (CPU count otherwise)
+
+Requires: ffmpeg with libopus and aac; numpy (--verify only)
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_manifest import BuildManifest, add_build_args, input_hash, plan_outputs
+from audio_variants import (PROJECT_ROOT, SAMPLE_RATE, VARIANTS, decode_pcm, encode_variants, file_digest,
+                            load_index, relative, save_index, signature, variant_path)
+from encode_pool import EncodePool, default_workers
+
+# ==================== CONFIG ====================
+CATALOG_DIRS = ["audio/listening", "audio/interview", "audio/lr", "audio/lr/clips"]
+ALIGN_SECONDS = 2.0           # how much of the first speech is cross-correlated when verifying
+ALIGN_LEVEL = 1000            # |sample| that marks the first speech
+ALIGN_SEARCH = 1200           # samples (50 ms at 24 kHz) searched either way
+MAX_START_SHIFT = 24          # samples (1 ms) a variant may start off its MP3
+MAX_LENGTH_DIFF = 1088        # samples: one AAC frame of end padding plus its decoder delay
+
+
+def start_shift(reference, pcm):
+    """Lag in samples (within +/-ALIGN_SEARCH) that best lines `pcm` up with `reference` at its first speech."""
+    a = np.frombuffer(reference, dtype=np.int16)
+    loud = np.flatnonzero(np.abs(a.astype(np.int32)) >= ALIGN_LEVEL)
+    start = max(0, int(loud[0]) - ALIGN_SEARCH) if len(loud) else 0
+    window = slice(start, start + int(ALIGN_SECONDS * SAMPLE_RATE))
+    a = a[window].astype(np.float64)
+    b = np.frombuffer(pcm, dtype=np.int16)[window].astype(np.float64)
+    size = 1 << (len(a) + len(b)).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(b, size) * np.conj(np.fft.rfft(a, size)), size)
+    lags = np.r_[0:ALIGN_SEARCH + 1, -ALIGN_SEARCH:0]
+    return int(lags[np.argmax(corr[lags])])
+
+
+def verify(files):
+    """Decode every variant next to its MP3; returns the problems found."""
+    problems = []
+    for source, entry in files.items():
+        reference = decode_pcm(PROJECT_ROOT / source)
+        for name, variant in entry["variants"].items():
+            pcm = decode_pcm(PROJECT_ROOT / variant["file"])
+            shift = start_shift(reference, pcm)
+            extra = (len(pcm) - len(reference)) // 2
+            if abs(shift) > MAX_START_SHIFT or not 0 <= extra <= MAX_LENGTH_DIFF:
+                problems.append(f"{variant['file']}: starts {shift} samples off, "
+                                f"{extra} samples longer than {source}")
+    return problems
+
+
+def report(indexes):
+    """Per-directory totals: MP3 bytes, each variant's bytes, and the smallest-variant bytes."""
+    rows = {}
+    for directory, files in indexes.items():
+        row = {"files": len(files), "mp3": 0, "smallest": 0, **{name: 0 for name in VARIANTS}}
+        for entry in files.values():
+            row["mp3"] += entry["bytes"]
+            sizes = [entry["bytes"]]
+            for name, variant in entry["variants"].items():
+                row[name] += variant["bytes"]
+                sizes.append(variant["bytes"])
+            row["smallest"] += min(sizes)
+        rows[directory] = row
+    total = {key: sum(row[key] for row in rows.values()) for key in ("files", "mp3", "smallest", *VARIANTS)}
+    return rows, total
+
+
+def print_report(rows, total):
+    mb = lambda n: f"{n / (1024 * 1024):.1f} MB"
+    pct = lambda n, of: f"{100 * (n - of) / of:+.0f}%" if of else "-"
+    names = list(VARIANTS)
+    print(f"\n  {'directory':<18} {'files':>5} {'mp3':>9} " + " ".join(f"{n:>15}" for n in names)
+          + f" {'smallest':>15}")
+    for directory, row in [*rows.items(), ("total", total)]:
+        print(f"  {directory:<18} {row['files']:>5} {mb(row['mp3']):>9} "
+              + " ".join(f"{mb(row[n]):>8} {pct(row[n], row['mp3']):>6}" for n in names)
+              + f" {mb(row['smallest']):>8} {pct(row['smallest'], row['mp3']):>6}")
+    print(f"Saved with the smallest variant everywhere: {mb(total['mp3'] - total['smallest'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Opus/AAC speech variants of the MP3 catalog")
+    parser.add_argument("--dirs", nargs="+", default=CATALOG_DIRS,
+                        help=f"Directories to cover (default: {' '.join(CATALOG_DIRS)})")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS),
+                        help=f"Variants to build (default: {' '.join(VARIANTS)})")
+    parser.add_argument("--jobs", "-j", type=int, default=default_workers(),
+                        help="Worker processes (default: ENCODE_WORKERS or CPU count)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Decode every variant and check its start and length against the MP3")
+    parser.add_argument("--report", help="Also write the per-directory and per-file sizes as JSON to this path")
+    add_build_args(parser)
+    args = parser.parse_args()
+    if args.verify and not NUMPY_AVAILABLE:
+        parser.error("--verify needs numpy (pip install numpy)")
+
+    directories = [relative(PROJECT_ROOT / d) for d in args.dirs]
+    sources = {d: sorted(relative(p) for p in (PROJECT_ROOT / d).glob("*.mp3")) for d in directories}
+    source_digests = {s: file_digest(PROJECT_ROOT / s) for paths in sources.values() for s in paths}
+    indexes = {d: {s: e for s, e in load_index(d).items() if s in sources[d] and e.get("sha256") == source_digests[s]}
+               for d in directories}
+
+    manifest = BuildManifest()
+    digests = {}      # (source, variant) -> input hash
+    for directory, paths in sources.items():
+        for source in paths:
+            for name in VARIANTS:
+                digests[source, name] = input_hash(source=source_digests[source], variant=signature(name))
+    targets = {f"{source}:{name}": (variant_path(PROJECT_ROOT / source, name), digests[source, name])
+               for directory, paths in sources.items() for source in paths for name in args.variants}
+    stale = set(plan_outputs(manifest, targets, args))
+    if args.dry_run or args.mark_current:
+        return
+
+    todo = {}         # source -> variant names to encode ([] = only decode, for the duration)
+    for directory, paths in sources.items():
+        for source in paths:
+            names = [n for n in args.variants if f"{source}:{n}" in stale]
+            if names or source not in indexes[directory]:
+                todo[source] = names
+
+    failed = []
+    if todo:
+        print(f"Encoding {sum(map(len, todo.values()))} variants from {len(todo)} files "
+              f"({SAMPLE_RATE // 1000} kHz mono) with {args.jobs} worker(s)...")
+        with EncodePool(None, args.jobs) as pool:
+            for source, names in todo.items():
+                pool.submit(source, encode_variants, PROJECT_ROOT / source, names)
+            for n, (source, stats, error) in enumerate(pool.results(), 1):
+                if error is not None:
+                    print(f"  ✗ [{n}/{len(todo)}] {source}: {error}", file=sys.stderr)
+                    failed.append(source)
+                    continue
+                for name in stats["variants"]:
+                    manifest.record(*targets[f"{source}:{name}"])
+                index = indexes[Path(source).parent.as_posix()]
+                index[source] = {**index.get(source, {}), "duration": round(stats["audio_seconds"], 3)}
+                print(f"  ✓ [{n}/{len(todo)}] {source} ({(PROJECT_ROOT / source).stat().st_size / 1024:.1f} KB -> "
+                      + (", ".join(f"{name} {size / 1024:.1f} KB" for name, size in stats["variants"].items())
+                         or "duration only") + ")")
+
+    for directory, files in indexes.items():
+        for source, entry in files.items():
+            variants = {}
+            for name in VARIANTS:
+                path = variant_path(PROJECT_ROOT / source, name)
+                if not manifest.is_stale(path, digests[source, name]):
+                    variants[name] = {"file": relative(path), "bytes": path.stat().st_size}
+            files[source] = {"duration": entry["duration"], "bytes": (PROJECT_ROOT / source).stat().st_size,
+                             "sha256": source_digests[source], "variants": variants}
+        if files:
+            save_index(directory, files)
+
+    rows, total = report(indexes)
+    print_report(rows, total)
+
+    problems = []
+    if args.verify:
+        checked = sum(len(e["variants"]) for files in indexes.values() for e in files.values())
+        print(f"\nVerifying {checked} variants against their MP3s...")
+        for files in indexes.values():
+            problems += verify(files)
+        for problem in problems:
+            print(f"  ✗ {problem}", file=sys.stderr)
+        print(f"{checked - len(problems)}/{checked} variants start with their MP3 and match its length")
+
+    if args.report:
+        data = {"variants": {n: VARIANTS[n]["mime"] for n in VARIANTS}, "directories": rows, "total": total,
+                "files": {s: e for files in indexes.values() for s, e in files.items()}}
+        Path(args.report).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    if failed or problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Regenerate the synthesized audio tree in one command.
+
+Builds every stale output of every task type (see audio_build.py for the
+task types, data files and job graph): one deduplicated, rate-limited
+synthesis batch across all tasks, with encoding overlapped, so wall time
+is bounded by API throughput. Outputs whose inputs are unchanged are
+skipped (audio/.manifest.json).
+
+Usage:
+  python3 scripts/build-audio.py                          # everything stale
+  python3 scripts/build-audio.py --dry-run                # list what would be built
+  python3 scripts/build-audio.py --tasks academic-talk interview
+  python3 scripts/build-audio.py --only "LCR-R03-*" --force
+  python3 scripts/build-audio.py --list                   # jobs per task, with utterance counts
+
+Environment:
+  INWORLD_API_KEY   Inworld API key (or .env)
+  TTS_MAX_WORKERS / TTS_RATE_LIMIT   synthesis concurrency and pacing (tts_engine.py)
+  AUDIO_TARGET_LUFS / AUDIO_POSTPROCESS   per-utterance loudness target / 0 to skip
+                                          trim + normalization (speech_postprocess.py)
+
+Requires: requests, numpy, ffmpeg (or pip install lameenc for in-process encoding)
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_build import TASKS, add_job_args, build, load_jobs
+from audio_manifest import add_build_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build all synthesized audio from data/*.json")
+    add_job_args(parser)
+    add_build_args(parser)
+    parser.add_argument("--list", action="store_true", help="List jobs per task and exit")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.tasks, args.only)
+    if not jobs:
+        print("No jobs match")
+        return
+    if args.list:
+        for task in TASKS:
+            task_jobs = [job for job in jobs if job.task == task]
+            if task_jobs:
+                utterances = sum(len(job.speech) for job in task_jobs)
+                print(f"{task:<16} {len(task_jobs):>4} files, {utterances:>4} utterances  "
+                      f"({task_jobs[0].id} .. {task_jobs[-1].id})")
+        return
+    if build(jobs, args, args.encode_workers):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
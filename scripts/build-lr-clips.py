@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Cut every Listen & Repeat set into one small MP3 per sentence.
+
+toefl-listen-repeat-practice.html used to play a sentence as
+`new Audio(set.mp3 + '#t=start,end')`: the browser seeks inside the full
+1-2 MB file, often re-requests byte ranges on every repeat, and MP3 seeking
+lands on frame boundaries (24 ms at 48 kHz), not on the cue. This build
+stage decodes each set once, cuts each SRT cue at its exact sample range and
+encodes it on its own (in parallel, encode_pool.EncodePool) with
+audio_encoder.MP3Encoder, whose Xing/LAME frame
+carries the encoder delay and padding: gapless decoders (all current
+browsers) play exactly the cut samples. Each repeat is then one small
+cacheable file that starts at 0.
+
+Outputs:
+  audio/lr/clips/LR-S01-01.mp3 ...     one clip per SRT cue
+  audio/lr/clips/manifest.json         what the page loads:
+    {"version": 1, "sets": {"S01": {"source": "audio/lr/LR-S01-....mp3",
+      "clips": [{"index": 1, "file": "audio/lr/clips/LR-S01-01.mp3",
+                 "start": 0.0, "end": 2.53, "duration": 2.53, "bytes": 25000,
+                 "text": "..."}]}}}
+The page falls back to the #t= fragment when the manifest is missing or
+its clip count does not match the sentences.
+
+Clips are tracked in audio/.manifest.json (audio_manifest.py): a clip is
+rebuilt only when the source MP3, its cue or the encoder settings change.
+Rebuilt clips lose their entry in audio/lr/clips/variants.json
+(audio_variants.drop_stale_variants) until build-audio-variants.py runs.
+Cut points come from the SRT next to each MP3 (generate-lr-srt.py).
+
+Usage:
+  python3 scripts/build-lr-clips.py
+  python3 scripts/build-lr-clips.py --sets S01 --force
+  python3 scripts/build-lr-clips.py --dry-run
+
+Requires: ffmpeg (decode; and encode unless lameenc is installed)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_encoder import MP3Encoder
+from audio_manifest import BuildManifest, add_build_args, input_hash, plan_outputs
+from audio_variants import drop_stale_variants
+from encode_pool import EncodePool, encode_source
+from sentence_align import load_sentence_sets
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CLIPS_DIR = PROJECT_ROOT / "audio" / "lr" / "clips"
+CLIP_MANIFEST_PATH = CLIPS_DIR / "manifest.json"
+CLIP_MANIFEST_VERSION = 1
+SAMPLE_RATE = 48000           # the LR sets are 48 kHz mono; decoding at the source rate avoids resampling
+BYTES_PER_SAMPLE = 2
+SRT_CUE_RE = re.compile(r"^\d+\n(\d+):(\d+):(\d+),(\d+) --> (\d+):(\d+):(\d+),(\d+)\n(.+?)(?:\n\n|\n*\Z)", re.M | re.S)
+
+ENCODER = MP3Encoder(SAMPLE_RATE)
+
+
+def read_cues(srt_path):
+    """[(start, end, text)] in seconds from an SRT."""
+    cues = []
+    for m in SRT_CUE_RE.finditer(srt_path.read_text(encoding="utf-8")):
+        h1, m1, s1, ms1, h2, m2, s2, ms2 = (int(x) for x in m.groups()[:8])
+        cues.append((h1 * 3600 + m1 * 60 + s1 + ms1 / 1000, h2 * 3600 + m2 * 60 + s2 + ms2 / 1000,
+                     m.group(9).strip()))
+    return cues
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def decode_pcm(mp3_path):
+    """Decode to 16-bit mono PCM bytes at SAMPLE_RATE."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(mp3_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+def clip_path(audio_path, index):
+    set_prefix = "-".join(audio_path.stem.split("-")[:2])   # LR-S01-bookstore-tour -> LR-S01
+    return CLIPS_DIR / f"{set_prefix}-{index:02d}.mp3"
+
+
+def sample_range(start, end, total_samples):
+    return max(0, round(start * SAMPLE_RATE)), min(total_samples, round(end * SAMPLE_RATE))
+
+
+def relative(path):
+    return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut Listen & Repeat sets into per-sentence clips")
+    parser.add_argument("--sets", nargs="+", help="Only these set ids (e.g. S01 S04)")
+    add_build_args(parser)
+    args = parser.parse_args()
+
+    sets = load_sentence_sets()
+    manifest = BuildManifest()
+    plans = []        # (set_id, audio_path, cues, source_digest)
+    targets = {}      # "S01-01" -> (clip_path, digest)
+    for set_id, info in sets.items():
+        if args.sets and set_id not in args.sets:
+            continue
+        audio_path = PROJECT_ROOT / info["audio"]
+        srt_path = audio_path.with_suffix(".srt")
+        if not audio_path.exists() or not srt_path.exists():
+            print(f"  skip {set_id}: missing {audio_path.name if not audio_path.exists() else srt_path.name}")
+            continue
+        cues = read_cues(srt_path)
+        source_digest = file_digest(audio_path)
+        plans.append((set_id, audio_path, cues, source_digest))
+        for i, (start, end, _) in enumerate(cues, 1):
+            digest = input_hash(source=source_digest, start=round(start, 3), end=round(end, 3),
+                                sample_rate=SAMPLE_RATE, encoder=ENCODER.signature())
+            targets[f"{set_id}-{i:02d}"] = (clip_path(audio_path, i), digest)
+
+    stale = set(plan_outputs(manifest, targets, args))
+    if args.dry_run or args.mark_current:
+        return
+
+    clip_index = {"version": CLIP_MANIFEST_VERSION, "sets": {}}
+    if CLIP_MANIFEST_PATH.exists():
+        with open(CLIP_MANIFEST_PATH, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("version") == CLIP_MANIFEST_VERSION:
+            clip_index["sets"].update(previous.get("sets", {}))
+
+    failed = []
+    written = []
+    with EncodePool(ENCODER) as pool:
+        for set_id, audio_path, cues, _ in plans:
+            todo = [i for i in range(1, len(cues) + 1) if f"{set_id}-{i:02d}" in stale]
+            pcm = None
+            if todo:
+                print(f"{set_id}: cutting {len(todo)}/{len(cues)} clips from {audio_path.name}")
+                pcm = decode_pcm(audio_path)
+            total_samples = len(pcm) // BYTES_PER_SAMPLE if pcm is not None else None
+
+            clips = []
+            for i, (start, end, text) in enumerate(cues, 1):
+                clip_id = f"{set_id}-{i:02d}"
+                path, _ = targets[clip_id]
+                if i in todo:
+                    a, b = sample_range(start, end, total_samples)
+                    pool.submit(clip_id, encode_source, path, pcm[a * BYTES_PER_SAMPLE:b * BYTES_PER_SAMPLE],
+                                SAMPLE_RATE, ENCODER.backend, ENCODER.vbr_quality)
+                    start, end = a / SAMPLE_RATE, b / SAMPLE_RATE
+                clips.append({
+                    "index": i,
+                    "file": relative(path),
+                    "start": round(start, 3),
+                    "end": round(end, 3),
+                    "duration": round(end - start, 3),
+                    "bytes": None,        # filled in once the encodes are done
+                    "text": text,
+                })
+            clip_index["sets"][set_id] = {"source": relative(audio_path), "clips": clips}
+
+        for clip_id, _, error in pool.results():
+            path, digest = targets[clip_id]
+            if error is not None:
+                print(f"  ✗ {relative(path)}: {error}", file=sys.stderr)
+                failed.append(clip_id)
+                continue
+            manifest.record(path, digest)
+            written.append(path)
+
+    for set_info in clip_index["sets"].values():
+        for clip in set_info["clips"]:
+            path = PROJECT_ROOT / clip["file"]
+            clip["bytes"] = path.stat().st_size if path.exists() else 0
+
+    CLIPS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = CLIP_MANIFEST_PATH.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(clip_index, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, CLIP_MANIFEST_PATH)
+
+    dropped = drop_stale_variants(written)
+    if dropped:
+        print(f"Dropped the Opus/AAC variants of {len(dropped)} rebuilt clips "
+              f"(python3 scripts/build-audio-variants.py --dirs audio/lr/clips)")
+
+    total = sum(c["bytes"] for s in clip_index["sets"].values() for c in s["clips"])
+    count = sum(len(s["clips"]) for s in clip_index["sets"].values())
+    print(f"Manifest: {relative(CLIP_MANIFEST_PATH)} ({count} clips, {total / 1024:.0f} KB, "
+          f"{total / max(count, 1) / 1024:.1f} KB per clip)")
+    if ENCODER.files:
+        print(ENCODER.summary())
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Ground truth for the academic-discussion OCR benchmarks: the question bank.
+
+docs/academic-discussion-question-bank.md holds, per D-item, the professor
+question and the two student posts. It is uneven as ground truth:
+
+  - many posts are verbatim, but for a lot of items one post (or both) is
+    text that does not appear in the screenshot at all
+  - the professor question is often a shortened or paraphrased version of
+    the professor's paragraph
+  - a few items still hold raw OCR fragments or placeholders
+
+reference() keeps only the items that look complete (both posts at least
+MIN_POST_WORDS words). pieces_in() then picks, per image, the reference
+texts that really are in the screenshot: a piece counts when at least one
+of the OCR texts being compared recalls MATCH_MIN of its words (unrelated
+text on the same topic scores about 0.2). Taking the best of all compared
+texts keeps the choice neutral between them.
+
+Usage:
+  from discussion_bank import load_bank, pieces_in, reference
+  bank = load_bank()
+  bank["D07"]["posts"][0]      # "I think the use of automation is a positive development. ..."
+  refs = reference(bank)       # only the complete-looking items
+  pieces_in(refs["D07"], [raw_text, preprocessed_text])   # {"post1": ..., "post2": ...}
+
+Accuracy helpers:
+  words(text)                  lower-case word tokens, punctuation dropped
+  word_recall(ref, text)       share of ref's words found in order in text (difflib);
+                               min_run=3 counts only runs of 3+ words, so scattered
+                               common words do not score
+  prompt_text(question)        a bank question without the "Your professor is
+                               teaching a class on ..." task preamble
+"""
+
+import difflib
+import re
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BANK_FILE = PROJECT_ROOT / "docs" / "academic-discussion-question-bank.md"
+MIN_POST_WORDS = 15
+MATCH_MIN = 0.5                  # recall above which a reference piece counts as present in the screenshot
+WORD_RE = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+QUESTION_RE = re.compile(r"\*\*Professor Question:\*\*\s*\n(.*?)\n\*\*Student Posts:\*\*", re.DOTALL)
+POST_RE = re.compile(r"-\s+\*\*\[?Author([12])\]?:\*\*\s*\n?(.*?)(?=\n-\s+\*\*|\n\*\*Notes:\*\*|\n\*\*Status:\*\*|\n---|\Z)",
+                     re.DOTALL)
+IMAGE_RE = re.compile(r"\*\*Image:\*\*\s*`?images/([^`\s]+)`?")
+PREAMBLE_RE = re.compile(r"^Your professor is teaching a class on [^.]*\.\s*")
+
+
+def load_bank(path=BANK_FILE):
+    """{"D07": {"question", "posts": [post1, post2], "image"}} for every D-item (first entry wins)."""
+    content = Path(path).read_text(encoding="utf-8")
+    blocks = re.split(r"\n###\s+(D\d+)\b", content)
+    bank = {}
+    for q_id, block in zip(blocks[1::2], blocks[2::2]):
+        question = QUESTION_RE.search(block)
+        if q_id in bank or not question:
+            continue
+        posts = dict(POST_RE.findall(block))
+        image = IMAGE_RE.search(block)
+        bank[q_id] = {
+            "question": question.group(1).strip(),
+            "posts": [posts.get("1", "").strip(), posts.get("2", "").strip()],
+            "image": image.group(1) if image else None,
+        }
+    return bank
+
+
+def words(text):
+    """Lower-case word tokens of text (curly apostrophes folded, punctuation dropped)."""
+    return WORD_RE.findall(text.lower().replace("’", "'"))
+
+
+def usable(item):
+    """True when both posts look like real extracted text, not a placeholder or fragment."""
+    return all(len(words(post)) >= MIN_POST_WORDS and "待从截图提取" not in post for post in item["posts"])
+
+
+def reference(bank=None):
+    """The trustworthy subset of the bank (see usable())."""
+    bank = load_bank() if bank is None else bank
+    return {q_id: item for q_id, item in bank.items() if usable(item)}
+
+
+def prompt_text(question):
+    """The bank question without the task preamble the screenshots show in the instructions."""
+    return PREAMBLE_RE.sub("", question)
+
+
+def word_recall(ref, text, min_run=1):
+    """Share of ref's words that appear, in order, in text, in runs of at least min_run words
+    (0..1; 1.0 for an empty ref)."""
+    ref_words = words(ref)
+    if not ref_words:
+        return 1.0
+    matcher = difflib.SequenceMatcher(None, ref_words, words(text), autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks() if block.size >= min_run) / len(ref_words)
+
+
+def pieces_in(item, texts, min_recall=MATCH_MIN, min_run=1):
+    """{"question"/"post1"/"post2": reference text} for the pieces some OCR text in texts recalls."""
+    pieces = {"question": item["question"], "post1": item["posts"][0], "post2": item["posts"][1]}
+    return {name: ref for name, ref in pieces.items()
+            if max((word_recall(ref, text, min_run) for text in texts), default=0.0) >= min_recall}
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Layout-aware parser for academic-discussion screenshots: the professor's
+question and the two student posts, from OCR word boxes.
+
+The extraction scripts each had their own text parser. All of them guessed
+the pieces from line order, "Name:" patterns and keyword lists, and they
+failed on the exam screenshots because there is no "Name:" in them. The
+names sit under the avatars, beside the posts, and tesseract reads them
+wherever they fall in the line order. parse_discussion() works from
+positions instead:
+
+  lines     tesseract words grouped into lines (block/par/line), split where
+            a gap is much wider than the words are tall (a name label next
+            to post text, or the two columns read as one line)
+  chrome    exam header, timer and editor-toolbar lines are dropped, and so
+            is everything in the editor (right of and below the toolbar)
+  columns   exam screenshots have an empty vertical gutter between the
+            prompt column and the posts column; scans and typed documents
+            have none and are parsed as one column
+  question  left column: the paragraph under the professor's name label
+            (Dr./Prof. ..., or a short centered name) or, without one, the
+            text after the task instructions
+  posts     right column: short name lines left of the text column (in the
+            gutter too) are the authors; the posts split at the widest
+            paragraph break, preferably one between the two labels.
+            "Paragraph break" is relative to the column's own line spacing
+  document  one column: paragraphs labelled "Dr. Name:" / "Name:" (full-
+            width colons too); the professor's is the question, the others
+            are the posts, and so is unlabelled text after the question
+            (a label OCR misread)
+
+The result has the same shape the old parsers returned, so callers only
+switch the function:
+
+  {"question": "...", "professor": "Dr. Diaz",
+   "posts": [{"author": "Claire", "text": "..."}, {"author": "Paul", "text": "..."}],
+   "layout": "exam" | "document"}
+
+Authors that were not read are "Student1"/"Student2". Words come from
+ocr_pool results (result["words"], result["size"]) or, for macOS Vision,
+from vision_words(). Coordinates are in source-image pixels.
+
+benchmark-discussion-parser.py scores it against the question bank.
+
+Usage:
+  from discussion_layout import parse_discussion
+  parsed = parse_discussion(result["words"], result["size"])
+"""
+
+import re
+import statistics
+
+# ==================== CONFIG ====================
+WORD_GAP = 2.5                   # a gap wider than this many word heights splits a line
+MIN_CONF = 20                    # words tesseract is less sure of are dropped (avatar and icon noise)
+GUTTER_RANGE = (0.25, 0.65)      # the column gutter lies within this span of the width
+GUTTER_MIN = 0.008               # and is at least this wide (fraction of the width)
+COLUMN_MIN_WORDS = 25            # each column has at least this many words
+PARA_GAP = 0.8                   # a gap this many line heights over the usual spacing starts a paragraph
+LABEL_MAX_WORDS = 4              # name labels are at most this long
+EDITOR_MARGIN = 0.02             # the editor starts this far (fraction of W/H) before the toolbar
+CHROME_MAX_WORDS = 8             # only lines up to this long can be chrome
+CHROME_RE = re.compile(r"\b(toefl|ets|volume|help|next|previous|back|hide time|show time|"
+                       r"question \d+ of \d+|writing|hide word count|word count|"
+                       r"cut|paste|undo|redo)\b|\d{1,2}:\d{2}:\d{2}", re.I)
+TOOLBAR_WORDS = {"cut", "paste", "undo", "redo"}
+INSTRUCTION_RE = re.compile(r"professor is teaching|write a post|responding to the|professor.s question|"
+                            r"in your response|following\.|express and support|contribution to the|"
+                            r"your own words|effective response|at least \d+|^words\.?$", re.I)
+PROFESSOR_RE = re.compile(r"^(?:dr|doctor|prof|professor|mr|mrs|ms)\b\.?\s*[A-Z]", re.I)
+NAME_TOKEN_RE = re.compile(r"^[A-Z][a-z]+(?:['’-][A-Za-z]+)?$")
+LABEL_RE = re.compile(r"^((?:(?:Dr|Doctor|Prof|Professor|Mr|Mrs|Ms)\.?\s*)?[A-Z][a-z]+(?:\s[A-Z][a-z]+)?)\s*[:：]\s*(.*)$")
+
+
+def build_lines(words):
+    """Tesseract words -> lines {"text", "left", "top", "right", "bottom", "height", "words"}, top to bottom."""
+    groups = {}
+    for word in words:
+        if word.get("conf", 100) < MIN_CONF:
+            continue
+        groups.setdefault((word["block"], word["par"], word["line"]), []).append(word)
+    lines = []
+    for group in groups.values():
+        group.sort(key=lambda w: w["left"])
+        height = statistics.median(w["height"] for w in group)
+        current = [group[0]]
+        for word in group[1:]:
+            previous = current[-1]
+            if word["left"] - (previous["left"] + previous["width"]) > WORD_GAP * height:
+                lines.append(_line(current))
+                current = []
+            current.append(word)
+        lines.append(_line(current))
+    # by vertical centre: a tall first letter must not move a fragment above the rest of its row
+    return sorted(lines, key=lambda line: (line["top"] + line["bottom"], line["left"]))
+
+
+def _line(words):
+    return {
+        "text": " ".join(w["text"] for w in words),
+        "left": min(w["left"] for w in words),
+        "top": min(w["top"] for w in words),
+        "right": max(w["left"] + w["width"] for w in words),
+        "bottom": max(w["top"] + w["height"] for w in words),
+        "height": statistics.median(w["height"] for w in words),
+        "words": len(words),
+    }
+
+
+def drop_chrome(lines, width, height):
+    """Lines without the exam header, timer, toolbar and the editor below the toolbar."""
+    toolbar = [line for line in lines
+               if len(TOOLBAR_WORDS & set(re.findall(r"[a-z]+", line["text"].lower()))) >= 2]
+    if toolbar:
+        editor_top = min(line["top"] for line in toolbar) - EDITOR_MARGIN * height
+        editor_left = min(line["left"] for line in toolbar) - EDITOR_MARGIN * width
+        lines = [line for line in lines if line["top"] < editor_top or line["right"] <= editor_left]
+    return [line for line in lines
+            if not (line["words"] <= CHROME_MAX_WORDS and CHROME_RE.search(line["text"]))
+            and re.search(r"[A-Za-z]{2}", line["text"])]
+
+
+def find_gutter(lines, width):
+    """x of the empty band between the prompt and posts columns, or None."""
+    lo, hi = int(width * GUTTER_RANGE[0]), int(width * GUTTER_RANGE[1])
+    cover = [0] * (hi - lo)
+    # name labels can sit in the gap between the columns; only running text defines it
+    for line in lines:
+        if line["words"] <= LABEL_MAX_WORDS:
+            continue
+        for x in range(max(line["left"], lo), min(line["right"], hi)):
+            cover[x - lo] += 1
+    best, run_start = None, None
+    for x, count in enumerate(cover + [1]):
+        if count == 0 and run_start is None:
+            run_start = x
+        elif count and run_start is not None:
+            if best is None or x - run_start > best[1] - best[0]:
+                best = (run_start, x)
+            run_start = None
+    if best is None or best[1] - best[0] < GUTTER_MIN * width:
+        return None
+    gutter = lo + (best[0] + best[1]) // 2
+    left = sum(line["words"] for line in lines if line["right"] <= gutter)
+    right = sum(line["words"] for line in lines if line["left"] >= gutter)
+    return gutter if min(left, right) >= COLUMN_MIN_WORDS else None
+
+
+def split_columns(lines, gutter):
+    """(prompt lines, posts lines) on either side of the gutter; name labels right of
+    the prompt's text go with the posts."""
+    prompt = [line for line in lines if line["right"] <= gutter]
+    text_right = max((line["right"] for line in prompt if line["words"] > LABEL_MAX_WORDS), default=gutter)
+    posts = [line for line in lines if line["left"] >= gutter
+             or (line["left"] > text_right and name_of(line))]
+    return [line for line in prompt if line not in posts], posts
+
+
+def name_of(line):
+    """The name in a short label line ("Claire", "Dr. Diaz", "N Kelly" -> "Kelly"), else None."""
+    text = line["text"].strip().rstrip(":：")
+    if line["words"] > LABEL_MAX_WORDS:
+        return None
+    if PROFESSOR_RE.match(text):
+        return text
+    tokens = [t for t in text.split() if len(t) > 1 or t.isalnum()]
+    names = [t for t in tokens if NAME_TOKEN_RE.match(t)]
+    if not names or len(names) > 2 or len(tokens) - len(names) > 1:
+        return None
+    return " ".join(names)
+
+
+def join_lines(lines):
+    """Line texts as one paragraph; words hyphenated across lines are rejoined."""
+    text = ""
+    for line in lines:
+        part = line["text"].strip()
+        if text.endswith("-") and part[:1].islower() and text[-2:-1].isalpha():
+            text = text[:-1] + part
+        else:
+            text = f"{text} {part}" if text else part
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def break_gap(lines):
+    """Vertical gap above which a new paragraph starts: the usual line spacing plus PARA_GAP line heights."""
+    gaps = [b["top"] - a["bottom"] for a, b in zip(lines, lines[1:])]
+    spacing = max(0, statistics.median(gaps)) if gaps else 0
+    return spacing + PARA_GAP * statistics.median(line["height"] for line in lines)
+
+
+def paragraphs(lines):
+    """Consecutive lines, split where the vertical gap is wider than break_gap()."""
+    if not lines:
+        return []
+    limit = break_gap(lines)
+    groups = [[lines[0]]]
+    for line in lines[1:]:
+        if line["top"] - groups[-1][-1]["bottom"] > limit:
+            groups.append([line])
+        else:
+            groups[-1].append(line)
+    return groups
+
+
+def _question(column):
+    """(professor name, question lines) of the prompt column."""
+    for i, line in enumerate(column):
+        name = name_of(line)
+        if name and PROFESSOR_RE.match(name):
+            return name, column[i + 1:]
+    instructions = [i for i, line in enumerate(column) if INSTRUCTION_RE.search(line["text"])]
+    rest = column[instructions[-1] + 1:] if instructions else column
+    # a short centered label right after the instructions is the professor's name
+    if rest and name_of(rest[0]) and len(rest) > 1:
+        return name_of(rest[0]), rest[1:]
+    return None, [line for line in rest if not INSTRUCTION_RE.search(line["text"])]
+
+
+def _posts(column):
+    """[(author, post lines)] of the posts column."""
+    long_lines = [line for line in column if line["words"] >= 4]
+    if not long_lines:
+        return []
+    text_left = statistics.median(line["left"] for line in long_lines)
+    tolerance = 2 * statistics.median(line["height"] for line in long_lines)
+    labels = [(line, name_of(line)) for line in column if line["right"] < text_left + tolerance
+              and line["left"] < text_left - tolerance]
+    labels = [(line, name) for line, name in labels if name]
+    text = [line for line in column if line["left"] >= text_left - tolerance]
+    if not text:
+        return []
+
+    limit = break_gap(text)
+    gaps = [(b["top"] - a["bottom"], i + 1) for i, (a, b) in enumerate(zip(text, text[1:]))]
+    gaps = [(gap, i) for gap, i in gaps if gap > limit]
+    if len(labels) >= 2:
+        # prefer the break between the two labels; scrolled screenshots can put it elsewhere
+        first, second = labels[0][0], labels[1][0]
+        between = [(gap, i) for gap, i in gaps if text[i - 1]["bottom"] > first["top"] and text[i]["top"] < second["top"]]
+        gaps = between or gaps
+    split = max(gaps)[1] if gaps else None
+    blocks = [text[:split], text[split:]] if split else [text]
+    authors = [name for _, name in labels[:2]]
+    return [(authors[i] if i < len(authors) else f"Student{i + 1}", block) for i, block in enumerate(blocks)]
+
+
+def _document(lines):
+    """(professor, question, [(author, text)]) from a one-column "Name: text" layout."""
+    blocks = []                                  # [label or None, [line texts]]
+    for paragraph in paragraphs(lines):
+        blocks.append([None, []])
+        for line in paragraph:
+            label = LABEL_RE.match(line["text"].strip())
+            if label:
+                blocks.append([label.group(1), [label.group(2)]])
+            else:
+                blocks[-1][1].append(line["text"].strip())
+    merged = []
+    for label, parts in blocks:
+        if merged and label is None and merged[-1][0] and not any(merged[-1][1]):
+            merged[-1][1] = parts                # "Dr. Gupta:" alone, text in the next paragraph
+        else:
+            merged.append([label, parts])
+
+    professor, question, posts = None, "", []
+    for label, parts in merged:
+        text = join_lines({"text": part} for part in parts if part)
+        if not text or (label is None and INSTRUCTION_RE.search(text)):
+            continue
+        if label and PROFESSOR_RE.match(label) and professor is None:
+            professor, question = label, text
+        elif label:
+            posts.append((label, text))
+        elif not question and not posts and "?" in text:
+            question = text
+        elif question and len(text.split()) > LABEL_MAX_WORDS:
+            posts.append((f"Student{len(posts) + 1}", text))   # its label was not read
+    return professor, question, posts
+
+
+def parse_discussion(words, size=None):
+    """{"question", "professor", "posts": [{"author", "text"}], "layout"} from OCR word boxes; None if nothing was found."""
+    if not words:
+        return None
+    if size is None:
+        size = (max(w["left"] + w["width"] for w in words), max(w["top"] + w["height"] for w in words))
+    width, height = size
+    lines = drop_chrome(build_lines(words), width, height)
+    gutter = find_gutter(lines, width)
+    if gutter is None:
+        layout = "document"
+        professor, question, posts = _document(lines)
+    else:
+        layout = "exam"
+        prompt, replies = split_columns(lines, gutter)
+        professor, question_lines = _question(prompt)
+        question = join_lines(question_lines)
+        posts = [(author, join_lines(block)) for author, block in _posts(replies)]
+    posts = [{"author": author, "text": text} for author, text in posts if text][:2]
+    if not question and not posts:
+        return None
+    return {"question": question, "professor": professor, "posts": posts, "layout": layout}
+
+
+def vision_words(observations, size):
+    """Word dicts for parse_discussion() from macOS Vision: [(text, (x, y, w, h))] with
+    Vision's normalized, bottom-left-origin line boxes. Vision only boxes lines, so each
+    word gets a share of its line's width in proportion to its characters."""
+    width, height = size
+    words = []
+    for n, (text, (x, y, w, h)) in enumerate(observations, 1):
+        tokens = text.split()
+        left, top = x * width, (1 - y - h) * height
+        scale = w * width / max(1, len(" ".join(tokens)))
+        offset = 0
+        for token in tokens:
+            words.append({"text": token, "left": round(left + offset * scale), "top": round(top),
+                          "width": max(1, round(len(token) * scale)), "height": round(h * height),
+                          "conf": 100.0, "block": n, "par": 1, "line": 1})
+            offset += len(token) + 1
+    return words
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Parallel MP3 encoding: a process pool sized to the machine.
+
+lameenc holds the GIL while it encodes, so encoder threads in one process
+run one at a time. EncodePool runs each encode in a worker process instead,
+one per core by default (ffmpeg-backed encodes get a bounded number of
+ffmpeg processes the same way):
+
+  ordered progress   ready() / results() yield items in submission order,
+                     each as soon as it and everything before it is done, so
+                     logs read like a sequential run
+  failure isolation  an exception fails only its own item. A worker that dies
+                     outright (crash, OOM kill) breaks the whole pool, so
+                     every item caught in it is retried alone in a fresh
+                     worker, and only an item that kills that one too fails
+  start method       forkserver (spawn where unavailable): workers are
+                     never forked from a process whose synthesis threads may
+                     hold locks
+
+A task is any top-level function returning MP3Stream.stats(); the parent
+folds those into its own MP3Encoder, so ENCODER.summary() still covers
+every file. Without an encoder the pool runs any picklable task the same
+way (ocr_pool.py uses it for OCR). encode_source() handles plain inputs: PCM bytes or a chunk list,
+a 16-bit .wav file, or an existing .mp3 (decoded with ffmpeg; gapless, so
+sample n stays at n / sample_rate and timing sidecars remain valid).
+
+Usage:
+  with EncodePool(ENCODER) as pool:
+      for path, pcm in clips:
+          pool.submit(path, encode_source, path, pcm, SAMPLE_RATE)
+      for path, stats, error in pool.results():
+          ...
+  print(ENCODER.summary())
+
+Environment:
+  ENCODE_WORKERS   worker processes (default: CPU count)
+"""
+
+import multiprocessing
+import os
+import subprocess
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from audio_encoder import MP3Encoder, mp3_format
+
+# ==================== CONFIG ====================
+READ_BYTES = 256 * 1024       # PCM read size when decoding a .wav/.mp3 source
+
+
+def default_workers():
+    """ENCODE_WORKERS, else one worker per CPU."""
+    return int(os.getenv("ENCODE_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def encode_source(output, source, sample_rate=None, backend=None, vbr_quality=None):
+    """Worker task: encode one input to `output`; returns MP3Stream.stats().
+
+    source: PCM bytes or a list of chunks (16-bit, sample_rate required), or
+    the path of a .wav or .mp3 file (format read from the file). Decoding
+    streams into the encoder, and output may be the source itself (it is
+    replaced only when the encode succeeds).
+    """
+    if not isinstance(source, (str, Path)):
+        encoder = MP3Encoder(sample_rate, backend=backend, vbr_quality=vbr_quality)
+        with encoder.open(output) as stream:
+            for chunk in [source] if isinstance(source, (bytes, bytearray, memoryview)) else source:
+                stream.write(chunk)
+        return stream.stats()
+
+    path = Path(source)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"{path.name}: only 16-bit PCM WAV is supported")
+            encoder = MP3Encoder(wf.getframerate(), backend=backend, channels=wf.getnchannels(),
+                                 vbr_quality=vbr_quality)
+            with encoder.open(output) as stream:
+                for chunk in iter(lambda: wf.readframes(READ_BYTES // 2), b""):
+                    stream.write(chunk)
+        return stream.stats()
+
+    sample_rate, channels = mp3_format(path)
+    encoder = MP3Encoder(sample_rate, backend=backend, channels=channels, vbr_quality=vbr_quality)
+    proc = subprocess.Popen(["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(path),
+                             "-f", "s16le", "-ac", str(channels), "-ar", str(sample_rate), "pipe:1"],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        with encoder.open(output) as stream:
+            for chunk in iter(lambda: proc.stdout.read(READ_BYTES), b""):
+                stream.write(chunk)
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg decode of {path.name} failed: {stderr.decode(errors='replace').strip()}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    return stream.stats()
+
+
+def _run_alone(fn, args):
+    """Retry one item in its own single-worker pool (after a worker crash)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=_context()) as pool:
+        try:
+            return pool.submit(fn, *args).result(), None
+        except BrokenProcessPool:
+            return None, RuntimeError("encoder worker crashed")
+        except Exception as e:
+            return None, e
+
+
+class EncodePool:
+    """Process pool for encode tasks, with in-order results and per-item failures."""
+
+    def __init__(self, encoder=None, workers=None):
+        self.encoder = encoder        # MP3Encoder whose stats receive every finished encode
+        self.workers = max(1, workers or default_workers())
+        self.failed = 0
+        self._pool = None
+        self._items = []              # [key, fn, args, executor, future], None once consumed
+        self._next = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel=exc_type is not None)
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_context())
+        return self._pool
+
+    def submit(self, key, fn, *args):
+        """Queue fn(*args) under `key`: a top-level function (returning MP3Stream.stats() with an encoder)."""
+        try:
+            future = self._executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._discard(self._pool)
+            future = self._executor().submit(fn, *args)
+        self._items.append([key, fn, args, self._pool, future])
+
+    def _discard(self, pool):
+        """Drop a broken pool; the next submit() starts a fresh one."""
+        if pool is self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def _take(self):
+        key, fn, args, pool, future = self._items[self._next]
+        self._items[self._next] = None    # drop the args (PCM) as soon as the item is reported
+        self._next += 1
+        try:
+            stats, error = future.result(), None
+        except BrokenProcessPool:
+            self._discard(pool)
+            stats, error = _run_alone(fn, args)
+        except Exception as e:
+            stats, error = None, e
+        if error is not None:
+            self.failed += 1
+        elif self.encoder is not None:
+            self.encoder.record(stats["audio_seconds"], stats["seconds"], stats["size"])
+        return key, stats, error
+
+    def ready(self):
+        """Yield (key, stats, error) for the finished prefix of the queue, without waiting."""
+        while self._next < len(self._items) and self._items[self._next][4].done():
+            yield self._take()
+
+    def results(self):
+        """Yield (key, stats, error) for every remaining item, in submission order."""
+        while self._next < len(self._items):
+            yield self._take()
+
+    def close(self, cancel=False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=cancel)
+            self._pool = None
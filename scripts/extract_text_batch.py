@@ -5,11 +5,18 @@ Batch extract text from all question images using macOS OCR capabilities.
 Uses AppleScript to leverage macOS Preview's OCR functionality.
 """
 
+import os
 import subprocess
+import sys
 import json
 import re
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_layout import parse_discussion
+from ocr_cache import OCRCache
+from ocr_pool import OCR_AVAILABLE, ocr_images
+
 PROJECT_ROOT = Path(__file__).parent.parent
 IMAGES_DIR = PROJECT_ROOT / "docs" / "academic-discussion" / "images"
 BANK_FILE = PROJECT_ROOT / "docs" / "academic-discussion-question-bank.md"
@@ -40,113 +47,6 @@ def extract_text_using_applescript(image_path):
         return None
 
 
-def try_pytesseract():
-    """Try using pytesseract if available."""
-    try:
-        import pytesseract
-        from PIL import Image
-        return True
-    except ImportError:
-        return False
-
-
-def extract_with_tesseract(image_path):
-    """Extract text using Tesseract OCR."""
-    try:
-        import pytesseract
-        from PIL import Image
-        
-        image = Image.open(image_path)
-        # Try English first, then Chinese if needed
-        text = pytesseract.image_to_string(image, lang='eng')
-        if len(text.strip()) < 50:  # If too short, try Chinese
-            text = pytesseract.image_to_string(image, lang='chi_sim+eng')
-        return text.strip()
-    except Exception as e:
-        print(f"  ⚠️  OCR error: {e}")
-        return None
-
-
-def parse_discussion_text(text):
-    """Parse extracted text to find Professor Question and Student Posts."""
-    if not text or len(text.strip()) < 50:
-        return None
-    
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    # Find Professor Question (usually contains "?" and is longer)
-    question = None
-    question_start_idx = None
-    
-    for i, line in enumerate(lines):
-        if '?' in line and len(line) > 30:
-            # Check if it looks like a question
-            if any(word in line.lower() for word in ['do you', 'should', 'think', 'believe', 'what', 'why', 'how']):
-                question = line
-                question_start_idx = i
-                break
-    
-    # If no clear question found, take first long line
-    if not question:
-        for line in lines:
-            if len(line) > 50:
-                question = line
-                break
-    
-    # Find student posts (look for names followed by text)
-    posts = []
-    if question_start_idx:
-        remaining_lines = lines[question_start_idx + 1:]
-    else:
-        remaining_lines = lines
-    
-    # Common patterns: "Name:" or "Name " at start of line
-    name_pattern = re.compile(r'^([A-Z][a-z]+)\s*:?\s*(.*)$')
-    current_author = None
-    current_text = []
-    
-    for line in remaining_lines:
-        # Skip if it's part of the question
-        if question and line in question:
-            continue
-        
-        match = name_pattern.match(line)
-        if match:
-            # Save previous post
-            if current_author and current_text:
-                posts.append({
-                    'author': current_author,
-                    'text': ' '.join(current_text).strip()
-                })
-            current_author = match.group(1)
-            current_text = [match.group(2).strip()] if match.group(2).strip() else []
-        elif current_author:
-            current_text.append(line)
-    
-    # Save last post
-    if current_author and current_text:
-        posts.append({
-            'author': current_author,
-            'text': ' '.join(current_text).strip()
-        })
-    
-    # If we didn't find posts by name pattern, try to find by content
-    if len(posts) < 2:
-        # Look for lines that might be student responses
-        for line in remaining_lines:
-            if len(line) > 30 and line not in question:
-                if len(posts) < 2:
-                    posts.append({
-                        'author': f'Student{len(posts)+1}',
-                        'text': line
-                    })
-    
-    return {
-        'question': question or '[Unable to extract]',
-        'posts': posts[:2] if len(posts) >= 2 else posts
-    }
-
-
 def update_bank_file():
     """Update bank file with extracted text."""
     # Read current bank
@@ -169,11 +69,11 @@ def update_bank_file():
     image_files = sorted(IMAGES_DIR.glob('*.png'))
     print(f"Found {len(image_files)} images to process")
     
-    if not try_pytesseract():
-        print("\n⚠️  pytesseract not available.")
+    if not OCR_AVAILABLE:
+        print("\n⚠️  No OCR engine available.")
         print("To install:")
-        print("  pip install pytesseract pillow")
-        print("  brew install tesseract")
+        print("  pip install tesserocr pillow")
+        print("  or: pip install pytesseract pillow; brew install tesseract")
         print("\nFor now, you can manually extract text using macOS Preview:")
         print("  1. Open each image in Preview")
         print("  2. Cmd+A to select all text")
@@ -182,19 +82,23 @@ def update_bank_file():
         return
     
     processed = 0
-    for img_file in image_files:
+    ocr_cache = OCRCache()
+    # OCR in a process pool (English, then Chinese+English if too short); results arrive in file order
+    for img_file, result, error in ocr_images(image_files, 'eng', 'chi_sim+eng', min_chars=50, cache=ocr_cache):
         q_num = img_file.stem.split('-')[0].replace('d', 'D')
         print(f"\nProcessing {q_num}: {img_file.name}")
         
         # Extract text
-        text = extract_with_tesseract(img_file)
+        if error is not None:
+            print(f"  ⚠️  OCR error: {error}")
+        text = result['text'] if result else None
         if not text:
             print(f"  ⚠️  Could not extract text")
             continue
         
         # Parse
-        parsed = parse_discussion_text(text)
-        if not parsed or parsed['question'] == '[Unable to extract]':
+        parsed = parse_discussion(result['words'], result.get('size'))
+        if not parsed or not parsed['question']:
             print(f"  ⚠️  Could not parse text")
             continue
         
@@ -205,6 +109,7 @@ def update_bank_file():
         processed += 1
     
     print(f"\n✅ Processed {processed} images")
+    print(ocr_cache.summary())
     print("\nNote: Text extraction complete, but bank file update requires manual review.")
     print("Please review extracted text and update the bank file manually.")
 
@@ -14,27 +14,28 @@ import os
 from pathlib import Path
 import json
 
-try:
-    from PIL import Image
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    print("Warning: pytesseract or PIL not installed. Install with:")
-    print("  pip install pytesseract pillow")
-    print("  brew install tesseract  # macOS")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_layout import parse_discussion
+from ocr_cache import OCRCache
+from ocr_pool import OCR_AVAILABLE, ocr_image, ocr_images
+
+if not OCR_AVAILABLE:
+    print("Warning: no OCR engine or PIL not installed. Install with:")
+    print("  pip install tesserocr pillow")
+    print("  or: pip install pytesseract pillow; brew install tesseract  # macOS")
+from ocr_preprocess import ScreenshotPreprocessor
+
+OCR_LANG = 'eng+chi_sim'    # English + Chinese
+PREPROCESS = ScreenshotPreprocessor()   # crop exam header, mask editor toolbar, grayscale, downscale
 
 
 def extract_text_from_image(image_path):
-    """Extract text from an image using OCR."""
+    """OCR an image: {"text", "words", "size", ...} (ocr_pool.ocr_image()), or None."""
     if not OCR_AVAILABLE:
         return None
     
     try:
-        image = Image.open(image_path)
-        # Use English + Chinese OCR
-        text = pytesseract.image_to_string(image, lang='eng+chi_sim')
-        return text.strip()
+        return ocr_image(image_path, OCR_LANG, preprocessor=PREPROCESS)
     except Exception as e:
         print(f"Error processing {image_path}: {e}")
         return None
@@ -62,72 +63,12 @@ def find_best_image(folder_path):
     return max(images, key=lambda p: p.stat().st_size)
 
 
-def parse_discussion_text(ocr_text):
-    """Parse OCR text to extract Professor Question and Student Posts."""
-    lines = [line.strip() for line in ocr_text.split('\n') if line.strip()]
-    
-    # Try to find Professor Question (usually starts with "Professor:" or question mark)
-    question_start = None
-    for i, line in enumerate(lines):
-        if 'professor' in line.lower() or '?' in line:
-            question_start = i
-            break
-    
-    if question_start is None:
-        question_start = 0
-    
-    # Extract question (usually ends before student names)
-    question_lines = []
-    for i in range(question_start, len(lines)):
-        line = lines[i]
-        # Stop if we see common student name patterns
-        if any(name in line.lower() for name in ['alex', 'sam', 'jordan', 'casey', 'riley', 'morgan']):
-            break
-        question_lines.append(line)
-    
-    question = ' '.join(question_lines).replace('Professor:', '').replace('Professor', '').strip()
-    
-    # Find student posts (look for names followed by text)
-    posts = []
-    current_author = None
-    current_text = []
-    
-    for line in lines:
-        # Check if line starts with a name (common patterns)
-        potential_name = None
-        for name in ['Alex', 'Sam', 'Jordan', 'Casey', 'Riley', 'Morgan', 'Taylor', 'Jamie', 
-                     'Quinn', 'Avery', 'Parker', 'Skyler', 'Chris', 'Pat', 'Lee', 'Kim']:
-            if line.startswith(name + ':') or line.startswith(name + ':'):
-                potential_name = name
-                break
-        
-        if potential_name:
-            # Save previous post if exists
-            if current_author:
-                posts.append({
-                    'author': current_author,
-                    'text': ' '.join(current_text).strip()
-                })
-            current_author = potential_name
-            current_text = [line.split(':', 1)[1].strip() if ':' in line else '']
-        elif current_author:
-            current_text.append(line)
-    
-    # Save last post
-    if current_author:
-        posts.append({
-            'author': current_author,
-            'text': ' '.join(current_text).strip()
-        })
-    
-    return {
-        'question': question,
-        'posts': posts[:2]  # Only take first 2 posts
-    }
-
-
-def process_question_folder(folder_path, output_file=None):
-    """Process a single question folder and extract text."""
+def process_question_folder(folder_path, output_file=None, ocr=None):
+    """Process a single question folder and extract text.
+
+    ocr: (image_file, result, error) from ocr_images() when the folder's
+    image was already read in the pool (--all); OCR runs here otherwise.
+    """
     folder = Path(folder_path)
     
     if not folder.is_dir():
@@ -138,7 +79,7 @@ def process_question_folder(folder_path, output_file=None):
     print("-" * 60)
     
     # Find best image
-    image_file = find_best_image(folder)
+    image_file = ocr[0] if ocr else find_best_image(folder)
     if not image_file:
         print("  ❌ No image found")
         return None
@@ -146,8 +87,14 @@ def process_question_folder(folder_path, output_file=None):
     print(f"  📷 Using image: {image_file.name}")
     
     # Extract text
-    print("  🔍 Extracting text...")
-    ocr_text = extract_text_from_image(image_file)
+    if ocr:
+        _, ocr_result, error = ocr
+        if error is not None:
+            print(f"Error processing {image_file}: {error}")
+    else:
+        print("  🔍 Extracting text...")
+        ocr_result = extract_text_from_image(image_file)
+    ocr_text = ocr_result['text'] if ocr_result else None
     
     if not ocr_text:
         print("  ❌ Failed to extract text")
@@ -155,7 +102,10 @@ def process_question_folder(folder_path, output_file=None):
     
     # Parse text
     print("  📝 Parsing discussion...")
-    parsed = parse_discussion_text(ocr_text)
+    parsed = parse_discussion(ocr_result['words'], ocr_result.get('size'))
+    if not parsed:
+        print("  ❌ No question or posts found")
+        return None
     
     # Display results
     print(f"\n  ✅ Professor Question:")
@@ -187,7 +137,8 @@ def main():
         print("     brew install tesseract  # macOS")
         print("     # or download from: https://github.com/tesseract-ocr/tesseract")
         print("\n  2. Install Python libraries:")
-        print("     pip install pytesseract pillow")
+        print("     pip install tesserocr pillow   # tesseract kept in-process")
+        print("     # or: pip install pytesseract pillow")
         sys.exit(1)
     
     if len(sys.argv) < 2:
@@ -214,9 +165,15 @@ def main():
         print(f"Output: {output_file}")
         print("\nProcessing all questions...")
         
+        # OCR every folder's image in a process pool; results come back in
+        # folder order and are parsed and saved here one by one
+        images = {folder: find_best_image(folder) for folder in folders}
+        ocr_cache = OCRCache()
+        results = ocr_images([img for img in images.values() if img], OCR_LANG, cache=ocr_cache)
+        
         for folder in folders:
             try:
-                process_question_folder(folder, output_file)
+                process_question_folder(folder, output_file, next(results) if images[folder] else None)
             except KeyboardInterrupt:
                 print("\n\n⚠️  Interrupted by user")
                 break
@@ -225,6 +182,7 @@ def main():
                 continue
         
         print(f"\n✅ Done! Results saved to: {output_file}")
+        print(ocr_cache.summary())
     else:
         # Process single folder
         result = process_question_folder(target_path)
@@ -4,12 +4,16 @@ Extract text using macOS Vision framework (same as Preview app uses).
 This should be more accurate than Tesseract.
 """
 
+import os
 import sys
 import re
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_layout import parse_discussion, vision_words
+
 try:
-    from Cocoa import NSURL
+    from Cocoa import NSImage, NSURL
     from Vision import VNImageRequestHandler, VNRecognizeTextRequest
     import objc
     VISION_AVAILABLE = True
@@ -19,7 +23,7 @@ except ImportError as e:
 
 
 def extract_text_vision(image_path):
-    """Extract text using macOS Vision framework."""
+    """Extract text using macOS Vision framework: {"text", "words", "size"} with a box per line."""
     if not VISION_AVAILABLE:
         return None
     
@@ -44,14 +48,16 @@ def extract_text_vision(image_path):
         if not observations:
             return None
         
-        text_lines = []
+        lines = []
         for observation in observations:
             candidates = observation.topCandidates_(1)
             if candidates and len(candidates) > 0:
-                text = candidates[0].string()
-                text_lines.append(text)
+                box = observation.boundingBox()
+                lines.append((candidates[0].string(), (box.origin.x, box.origin.y, box.size.width, box.size.height)))
         
-        return '\n'.join(text_lines)
+        image = NSImage.alloc().initWithContentsOfURL_(image_url).representations()[0]
+        size = [image.pixelsWide(), image.pixelsHigh()]
+        return {"text": '\n'.join(text for text, _ in lines), "words": vision_words(lines, size), "size": size}
     
     except Exception as e:
         print(f"  Vision OCR error: {e}")
@@ -60,100 +66,6 @@ def extract_text_vision(image_path):
         return None
 
 
-def parse_discussion_text(text):
-    """Parse extracted text."""
-    if not text or len(text.strip()) < 50:
-        return None
-    
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
-    
-    # Find question (line with ?)
-    question = None
-    question_idx = 0
-    for i, line in enumerate(lines):
-        if '?' in line and len(line) > 30:
-            question = line
-            question_idx = i
-            break
-    
-    if not question:
-        # Try to find any long line that might be a question
-        for line in lines:
-            if len(line) > 50:
-                question = line
-                break
-    
-    if not question:
-        return None
-    
-    # Find student posts
-    posts = []
-    remaining = lines[question_idx + 1:] if question_idx > 0 else lines
-    
-    # Look for names followed by text
-    name_pattern = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*:?\s*(.*)$')
-    
-    current_author = None
-    current_text = []
-    
-    for line in remaining:
-        if len(line) < 5:
-            continue
-        
-        match = name_pattern.match(line)
-        if match:
-            name = match.group(1).strip()
-            # Check if it's a valid name (1-2 words, capitalized)
-            if len(name.split()) <= 2 and name[0].isupper():
-                # Save previous
-                if current_author and current_text:
-                    posts.append({
-                        'author': current_author,
-                        'text': ' '.join(current_text).strip()
-                    })
-                current_author = name
-                rest = match.group(2).strip()
-                current_text = [rest] if rest else []
-            else:
-                if current_author:
-                    current_text.append(line)
-        else:
-            if current_author:
-                current_text.append(line)
-    
-    # Save last post
-    if current_author and current_text:
-        posts.append({
-            'author': current_author,
-            'text': ' '.join(current_text).strip()
-        })
-    
-    # If we don't have 2 posts, try to find them another way
-    if len(posts) < 2:
-        # Look for paragraphs that might be student posts
-        all_text = ' '.join(remaining)
-        if len(all_text) > 100:
-            # Try to split by common patterns
-            parts = re.split(r'(?:^|\n)([A-Z][a-z]+\s*:?\s*)', all_text, flags=re.MULTILINE)
-            if len(parts) >= 3:
-                for i in range(1, len(parts), 2):
-                    if i + 1 < len(parts):
-                        author = parts[i].strip().rstrip(':').strip()
-                        text = parts[i+1].strip()
-                        if len(text) > 20:
-                            posts.append({'author': author, 'text': text})
-                            if len(posts) >= 2:
-                                break
-    
-    if len(posts) < 2:
-        return None
-    
-    return {
-        'question': question,
-        'posts': posts[:2]
-    }
-
-
 def update_question_in_bank(q_id, parsed):
     """Update one question in bank file."""
     bank_file = Path(__file__).parent.parent / "docs" / "academic-discussion-question-bank.md"
@@ -231,14 +143,14 @@ def main():
         print(f"{q_id}: {img_file.name[:50]}...", end=' ')
         
         # Extract text
-        text = extract_text_vision(img_file)
-        if not text:
+        result = extract_text_vision(img_file)
+        if not result or not result['text']:
             print("❌ No text")
             failed += 1
             continue
         
         # Parse
-        parsed = parse_discussion_text(text)
+        parsed = parse_discussion(result['words'], result['size'])
         if not parsed or len(parsed['posts']) < 2:
             print(f"❌ Parse failed (Q={bool(parsed)}, P={len(parsed['posts']) if parsed else 0})")
             failed += 1
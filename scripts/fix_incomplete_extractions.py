@@ -3,20 +3,37 @@
 Fix incomplete extractions by re-processing with better parsing logic.
 """
 
+import os
+import platform
 import sys
 import re
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_layout import parse_discussion, vision_words
+from ocr_cache import OCRCache
+
 try:
-    from Cocoa import NSURL
+    from Cocoa import NSImage, NSURL
     from Vision import VNImageRequestHandler, VNRecognizeTextRequest
     VISION_AVAILABLE = True
 except ImportError:
     VISION_AVAILABLE = False
 
+OCR_CACHE = OCRCache()
+VISION_PARAMS = {"recognition_level": 1, "boxes": True}   # accurate; entries carry line boxes
+
 
 def extract_all_text_vision(image_path):
-    """Extract ALL text from image using Vision framework."""
+    """Vision {"text", "words", "size"} of an image, from the OCR cache when this image was read before."""
+    if not VISION_AVAILABLE:
+        return None
+    return OCR_CACHE.fetch(image_path, "apple-vision", platform.mac_ver()[0], VISION_PARAMS,
+                           lambda: _extract_all_text_vision_uncached(image_path))
+
+
+def _extract_all_text_vision_uncached(image_path):
+    """Extract ALL text from image using Vision framework, with a box per line."""
     if not VISION_AVAILABLE:
         return None
     
@@ -32,139 +49,22 @@ def extract_all_text_vision(image_path):
         if not observations:
             return None
         
-        # Get all text, preserving order
-        all_text = []
+        # Get all text, preserving order, with each line's normalized box
+        lines = []
         for obs in observations:
             candidates = obs.topCandidates_(1)
             if candidates and len(candidates) > 0:
-                text = candidates[0].string()
-                all_text.append(text)
+                box = obs.boundingBox()
+                lines.append((candidates[0].string(), (box.origin.x, box.origin.y, box.size.width, box.size.height)))
         
-        return '\n'.join(all_text)
+        image = NSImage.alloc().initWithContentsOfURL_(image_url).representations()[0]
+        size = [image.pixelsWide(), image.pixelsHigh()]
+        return {"text": '\n'.join(text for text, _ in lines), "words": vision_words(lines, size), "size": size}
     
     except Exception as e:
         return None
 
 
-def parse_discussion_improved(text):
-    """Improved parsing that handles various formats."""
-    if not text or len(text.strip()) < 50:
-        return None
-    
-    # Clean up text
-    lines = [l.strip() for l in text.split('\n') if l.strip() and len(l.strip()) > 2]
-    
-    # Find question - look for lines with ? that are complete sentences
-    question = None
-    question_end = 0
-    
-    for i, line in enumerate(lines):
-        # Skip header lines
-        if any(word in line.lower() for word in ['toefl', 'volume', 'writing', 'question', 'help', 'next']):
-            continue
-        
-        if '?' in line:
-            # Check if it's a complete question
-            if len(line) > 30 and any(word in line.lower() for word in 
-                ['do you', 'should', 'think', 'believe', 'what', 'why', 'how', 'would', 'could', 'is', 'are']):
-                question = line
-                question_end = i
-                break
-    
-    # If no question with ?, try to find longest line that might be a question
-    if not question:
-        for i, line in enumerate(lines):
-            if any(word in line.lower() for word in ['toefl', 'volume', 'writing']):
-                continue
-            if len(line) > 60:
-                question = line
-                question_end = i
-                break
-    
-    if not question:
-        return None
-    
-    # Find student posts - look for names or paragraphs after question
-    remaining = lines[question_end + 1:]
-    posts = []
-    
-    # Pattern 1: Name: text
-    name_pattern = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*:?\s*(.*)$')
-    
-    current_author = None
-    current_text = []
-    
-    for line in remaining:
-        # Skip UI elements
-        if any(word in line.lower() for word in ['toefl', 'volume', 'writing', 'question', 'help', 'next', 'previous']):
-            continue
-        
-        match = name_pattern.match(line)
-        if match:
-            name = match.group(1).strip()
-            # Valid name: 1-2 words, starts with capital
-            if len(name.split()) <= 2 and name[0].isupper() and len(name) > 2:
-                # Save previous
-                if current_author and current_text:
-                    post_text = ' '.join(current_text).strip()
-                    if len(post_text) > 15:
-                        posts.append({
-                            'author': current_author,
-                            'text': post_text
-                        })
-                
-                current_author = name
-                rest = match.group(2).strip()
-                current_text = [rest] if rest else []
-            else:
-                if current_author:
-                    current_text.append(line)
-        else:
-            if current_author:
-                current_text.append(line)
-            elif len(posts) < 2 and len(line) > 30:
-                # Might be a post without clear name
-                posts.append({
-                    'author': f'Student{len(posts)+1}',
-                    'text': line
-                })
-    
-    # Save last post
-    if current_author and current_text:
-        post_text = ' '.join(current_text).strip()
-        if len(post_text) > 15:
-            posts.append({
-                'author': current_author,
-                'text': post_text
-            })
-    
-    # If still don't have 2 posts, try to find paragraphs
-    if len(posts) < 2:
-        # Look for long paragraphs
-        all_remaining = ' '.join(remaining)
-        if len(all_remaining) > 100:
-            # Try to split into 2 parts
-            sentences = re.split(r'[.!?]\s+', all_remaining)
-            if len(sentences) >= 4:
-                mid = len(sentences) // 2
-                post1_text = '. '.join(sentences[:mid]) + '.'
-                post2_text = '. '.join(sentences[mid:])
-                
-                if len(post1_text) > 30 and len(post2_text) > 30:
-                    posts = [
-                        {'author': 'Student1', 'text': post1_text},
-                        {'author': 'Student2', 'text': post2_text}
-                    ]
-    
-    if len(posts) < 2:
-        return None
-    
-    return {
-        'question': question,
-        'posts': posts[:2]
-    }
-
-
 def update_question(q_id, parsed):
     """Update question in bank file."""
     bank_file = Path(__file__).parent.parent / "docs" / "academic-discussion-question-bank.md"
@@ -236,14 +136,14 @@ def main():
         print(f"{q_id}: {img_file.name[:50]}...", end=' ')
         
         # Extract all text
-        text = extract_all_text_vision(img_file)
-        if not text:
+        result = extract_all_text_vision(img_file)
+        if not result or not result['text']:
             print("❌ No text")
             failed += 1
             continue
         
-        # Parse with improved logic
-        parsed = parse_discussion_improved(text)
+        # Parse the layout of the line boxes
+        parsed = parse_discussion(result['words'], result['size'])
         if not parsed or len(parsed['posts']) < 2:
             print(f"❌ Parse failed")
             failed += 1
@@ -260,6 +160,7 @@ def main():
     print("\n" + "="*60)
     print(f"✅ Fixed: {fixed}")
     print(f"❌ Failed: {failed}")
+    print(OCR_CACHE.summary())
     print("="*60)
 
 
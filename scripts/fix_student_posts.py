@@ -3,20 +3,37 @@
 Fix incomplete student posts by re-extracting and better parsing.
 """
 
+import os
+import platform
 import sys
 import re
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from discussion_layout import parse_discussion, vision_words
+from ocr_cache import OCRCache
+
 try:
-    from Cocoa import NSURL
+    from Cocoa import NSImage, NSURL
     from Vision import VNImageRequestHandler, VNRecognizeTextRequest
     VISION_AVAILABLE = True
 except ImportError:
     VISION_AVAILABLE = False
 
+OCR_CACHE = OCRCache()
+VISION_PARAMS = {"recognition_level": 1, "boxes": True}   # accurate; entries carry line boxes
+
 
 def extract_all_text(image_path):
-    """Extract all text using Vision."""
+    """Vision {"text", "words", "size"} of an image, from the OCR cache when this image was read before."""
+    if not VISION_AVAILABLE:
+        return None
+    return OCR_CACHE.fetch(image_path, "apple-vision", platform.mac_ver()[0], VISION_PARAMS,
+                           lambda: _extract_all_text_uncached(image_path))
+
+
+def _extract_all_text_uncached(image_path):
+    """Extract all text using Vision, with a box per line."""
     if not VISION_AVAILABLE:
         return None
     
@@ -32,112 +49,20 @@ def extract_all_text(image_path):
         if not observations:
             return None
         
-        all_text = []
+        lines = []
         for obs in observations:
             candidates = obs.topCandidates_(1)
             if candidates:
-                all_text.append(candidates[0].string())
+                box = obs.boundingBox()
+                lines.append((candidates[0].string(), (box.origin.x, box.origin.y, box.size.width, box.size.height)))
         
-        return '\n'.join(all_text)
+        image = NSImage.alloc().initWithContentsOfURL_(image_url).representations()[0]
+        size = [image.pixelsWide(), image.pixelsHigh()]
+        return {"text": '\n'.join(text for text, _ in lines), "words": vision_words(lines, size), "size": size}
     except:
         return None
 
 
-def find_student_posts_improved(text):
-    """Better algorithm to find student posts."""
-    if not text:
-        return None
-    
-    lines = [l.strip() for l in text.split('\n') if l.strip() and len(l.strip()) > 2]
-    
-    # Skip header lines
-    filtered_lines = []
-    for line in lines:
-        if any(word in line.lower() for word in ['toefl', 'volume', 'writing', 'question', 'help', 'next', 'previous', 'hide time']):
-            continue
-        if len(line) < 5:
-            continue
-        filtered_lines.append(line)
-    
-    # Find student names (common patterns)
-    name_pattern = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*:?\s*(.*)$')
-    
-    posts = []
-    current_author = None
-    current_text = []
-    
-    for i, line in enumerate(filtered_lines):
-        match = name_pattern.match(line)
-        if match:
-            name = match.group(1).strip()
-            # Check if it's a valid name
-            if (len(name.split()) <= 2 and 
-                name[0].isupper() and 
-                len(name) > 2 and 
-                name.lower() not in ['question', 'writing', 'help', 'next', 'previous']):
-                
-                # Save previous post
-                if current_author and current_text:
-                    post_text = ' '.join(current_text).strip()
-                    if len(post_text) > 15:
-                        posts.append({
-                            'author': current_author,
-                            'text': post_text
-                        })
-                
-                current_author = name
-                rest = match.group(2).strip()
-                current_text = [rest] if rest else []
-            else:
-                if current_author:
-                    current_text.append(line)
-        else:
-            if current_author:
-                current_text.append(line)
-    
-    # Save last post
-    if current_author and current_text:
-        post_text = ' '.join(current_text).strip()
-        if len(post_text) > 15:
-            posts.append({
-                'author': current_author,
-                'text': post_text
-            })
-    
-    # If we have posts but less than 2, try to find more
-    if len(posts) == 1:
-        # Look for another post after the first one
-        first_post_end = None
-        for i, line in enumerate(filtered_lines):
-            if posts[0]['author'].lower() in line.lower():
-                first_post_end = i
-                break
-        
-        if first_post_end:
-            # Look for another name after first post
-            for i in range(first_post_end + 5, min(len(filtered_lines), first_post_end + 20)):
-                match = name_pattern.match(filtered_lines[i])
-                if match:
-                    name = match.group(1).strip()
-                    if len(name.split()) <= 2 and name[0].isupper():
-                        # Found second author
-                        post_text_parts = []
-                        for j in range(i+1, min(len(filtered_lines), i+15)):
-                            if name_pattern.match(filtered_lines[j]):
-                                break
-                            if len(filtered_lines[j]) > 5:
-                                post_text_parts.append(filtered_lines[j])
-                        
-                        if post_text_parts:
-                            posts.append({
-                                'author': name,
-                                'text': ' '.join(post_text_parts).strip()
-                            })
-                        break
-    
-    return posts[:2] if len(posts) >= 2 else None
-
-
 def update_student_posts(q_id, posts):
     """Update student posts in bank file."""
     bank_file = Path(__file__).parent.parent / "docs" / "academic-discussion-question-bank.md"
@@ -213,14 +138,15 @@ def main():
         print(f"{q_id}: {img_file.name[:45]}...", end=' ')
         
         # Extract text
-        text = extract_all_text(img_file)
-        if not text:
+        result = extract_all_text(img_file)
+        if not result or not result['text']:
             print("❌ No text")
             failed += 1
             continue
         
-        # Find posts
-        posts = find_student_posts_improved(text)
+        # Find posts (the posts column of the layout)
+        parsed = parse_discussion(result['words'], result['size'])
+        posts = parsed['posts'] if parsed else None
         if not posts or len(posts) < 2:
             print(f"❌ Posts not found ({len(posts) if posts else 0})")
             failed += 1
@@ -237,6 +163,7 @@ def main():
     print("\n" + "="*60)
     print(f"✅ Fixed: {fixed}")
     print(f"❌ Failed: {failed}")
+    print(OCR_CACHE.summary())
     print("="*60)
 
 
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Text-aware forced alignment of a known sentence list to Listen & Repeat audio.
+
+silence -> segments -> "segment i is sentence i" (generate-srt-silence.py)
+only works when the thresholds produce exactly one segment per sentence;
+fit_segments() searches thresholds to get there. align() instead picks the
+boundaries directly, in one dynamic-programming pass:
+
+  candidates  every quiet run >= CANDIDATE_MIN_SILENCE on the envelope
+              (far looser than a sentence gap, so mid-sentence pauses are
+              candidates too); a boundary sits at the run's midpoint, the
+              same convention as silences_to_speech_segments()
+  durations   sentence k is expected to last a * units_k + c seconds:
+              units are characters (or syllables), c is the per-sentence
+              overhead, mostly the repeat pause. On audio/lr this affine
+              model fits segment lengths to ~5% (proportional-only: ~9%).
+  cost        sum over sentences of log(actual / expected)^2, plus a
+              penalty for each boundary on a short pause (log of the
+              typical gap length over this one) and for intro speech
+              skipped before sentence 1
+  DP          best[k][j] = cheapest way to end sentence k at candidate j,
+              taking only predecessors whose distance is within a factor
+              MAX_STRETCH of the expected duration: O(N * M * window)
+              rather than O(N * M^2)
+
+a and c start from a prior (overhead ~ half an average sentence) and are
+refit by least squares on the chosen segments; the DP re-runs until the
+boundaries stop moving (2-3 passes). The last sentence runs to the end of
+the file, so only a too-short last segment is penalized.
+
+Usage:
+  env = SilenceDetector().envelope("audio/lr/LR-S02-museum-tour.mp3")
+  segments, info = align(env, sentences)
+
+Requires: numpy
+"""
+
+import bisect
+import math
+import re
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ==================== CONFIG ====================
+CANDIDATE_NOISE_DB = -40.0      # quiet-run threshold for candidates (raised if too few are found)
+CANDIDATE_MIN_SILENCE = 0.1     # seconds
+MAX_STRETCH = 2.5               # a sentence may be 1/2.5x .. 2.5x its expected duration
+GAP_WEIGHT = 0.5                # cost per unit of log(typical gap / this gap)
+INTRO_WEIGHT = 0.5              # cost per expected-sentence-length of skipped intro
+MAX_INTRO = 0.1                 # sentence 1 starts in the first 10% of the file at the latest
+MAX_PASSES = 4
+PRIOR_OVERHEAD = 0.5            # c = 0.5 * a * mean(units) before the first refit
+
+
+def syllables(text):
+    """Rough English syllable count (vowel groups, silent final e)."""
+    count = 0
+    for word in re.findall(r"[a-z]+", text.lower()):
+        groups = len(re.findall(r"[aeiouy]+", word))
+        if word.endswith("e") and not word.endswith(("le", "ee")) and groups > 1:
+            groups -= 1
+        count += max(1, groups)
+    return count
+
+
+def sentence_units(sentences, unit="chars"):
+    if unit == "syllables":
+        return [max(1, syllables(s)) for s in sentences]
+    return [max(1, len(s.strip())) for s in sentences]
+
+
+def candidates(envelope, count, noise_db=CANDIDATE_NOISE_DB):
+    """(silences, noise_db): quiet runs >= CANDIDATE_MIN_SILENCE, at least `count` of them if possible.
+
+    Raises the threshold 5 dB at a time until there are enough.
+    """
+    while True:
+        silences = envelope.silences(noise_db, CANDIDATE_MIN_SILENCE)
+        if len(silences) >= count or noise_db >= -15:
+            return silences, noise_db
+        noise_db += 5
+
+
+def _dp(times, gap_cost, starts, expected, duration, intro_cost):
+    """One DP pass. Returns (boundaries, cost): boundaries[0] is sentence 1's start."""
+    n = len(expected)
+    end = len(times)                          # virtual candidate: end of file
+    points = times + [duration]
+    inf = float("inf")
+    # best[j]: cheapest cost with the current sentence ending at candidate j
+    best = {j: intro_cost[j] for j in starts}
+    back = []
+    for k in range(n):
+        e = expected[k]
+        last = k == n - 1
+        nxt = {}
+        links = {}
+        targets = [end] if last else range(len(times))
+        for j in targets:
+            t = points[j]
+            if k > 0 and not last:
+                lo = bisect.bisect_left(points, t - e * MAX_STRETCH)
+                hi = bisect.bisect_right(points, t - e / MAX_STRETCH)
+                preds = (i for i in range(lo, min(hi, j)) if i in best)
+            else:
+                preds = best   # sentence 1: the few start options; last sentence: one target
+            cost_j, link = inf, None
+            for i in preds:
+                d = t - (points[i] if i >= 0 else 0.0)
+                if d <= 0:
+                    continue
+                ratio = math.log(d / e)
+                if last:
+                    ratio = min(ratio, 0.0)       # trailing silence may pad the last sentence
+                c = best[i] + ratio * ratio + (0.0 if last else gap_cost[j])
+                if c < cost_j:
+                    cost_j, link = c, i
+            if link is not None:
+                nxt[j], links[j] = cost_j, link
+        if not nxt:
+            return None, inf
+        best = nxt
+        back.append(links)
+
+    # Walk back from the end of file
+    bounds = [duration]
+    j = end
+    for k in range(n - 1, -1, -1):
+        j = back[k][j]
+        bounds.append(points[j] if j >= 0 else 0.0)
+    bounds.reverse()
+    return bounds, best[end]
+
+
+def _refit(bounds, units):
+    """Least-squares (a, c) for duration = a * units + c over all but the last sentence."""
+    d = np.diff(bounds)[:-1]
+    x = np.asarray(units[:-1], dtype=float)
+    if len(d) < 2:
+        return None
+    a, c = np.linalg.lstsq(np.vstack([x, np.ones_like(x)]).T, d, rcond=None)[0]
+    if a <= 0 or c < 0:
+        # Degenerate fit: keep the mean rate with no overhead
+        return float(d.sum() / x.sum()), 0.0
+    return float(a), float(c)
+
+
+def align(envelope, sentences, noise_db=CANDIDATE_NOISE_DB, unit="chars"):
+    """Boundaries for len(sentences) sentences on an Envelope.
+
+    Returns (segments, info) like sentence_align.fit_segments(): segments are
+    [{"start", "end"}], info has method "dp", candidate count, passes, the
+    fitted rate (s per unit) and overhead (s), whether sentence 1 starts
+    after an intro/leading silence, and the final cost.
+    """
+    n = len(sentences)
+    units = sentence_units(sentences, unit)
+    duration = envelope.duration
+    silences, used_db = candidates(envelope, n - 1, noise_db)
+    times = [(s["start"] + s["end"]) / 2 for s in silences]
+    lengths = [s["end"] - s["start"] for s in silences]
+    info = {"method": "dp", "candidates": len(times), "noise_db": used_db}
+    if n == 0 or len(times) < n - 1:
+        return [], dict(info, passes=0, cost=float("inf"), leading_silence=False)
+
+    # Typical sentence gap: median of the n-1 longest runs
+    typical = float(np.median(sorted(lengths, reverse=True)[:max(1, n - 1)])) or CANDIDATE_MIN_SILENCE
+    gap_cost = [GAP_WEIGHT * max(0.0, math.log(typical / max(l, 1e-3))) for l in lengths]
+
+    # Prior: a * sum(units) + n * c = duration, with c = PRIOR_OVERHEAD * a * mean(units)
+    mean_units = sum(units) / n
+    a = duration / (sum(units) + n * PRIOR_OVERHEAD * mean_units)
+    c = PRIOR_OVERHEAD * a * mean_units
+
+    # Sentence 1 starts at 0, or mid-way through a leading silence (the
+    # silences_to_speech_segments() convention), or after any pause in the
+    # first MAX_INTRO of the file; intro speech skipped that way is penalized.
+    leading = (bool(silences) and silences[0]["start"] <= envelope.hop_s
+               and lengths[0] >= typical / 2)   # not just a few ms of encoder pre-roll
+    intro_start = silences[0]["end"] if leading else 0.0
+    starts = [0 if leading else -1] + [j for j, t in enumerate(times) if 0 < t <= MAX_INTRO * duration]
+    starts = list(dict.fromkeys(starts))
+
+    bounds, cost, passes = None, float("inf"), 0
+    for passes in range(1, MAX_PASSES + 1):
+        expected = [a * u + c for u in units]
+        intro_cost = {j: (0.0 if j < 0 or (leading and j == 0)
+                          else INTRO_WEIGHT * (silences[j]["start"] - intro_start) / expected[0])
+                      for j in starts}
+        new_bounds, new_cost = _dp(times, gap_cost, starts, expected, duration, intro_cost)
+        if new_bounds is None:
+            break
+        converged = new_bounds == bounds
+        bounds, cost = new_bounds, new_cost
+        if converged:
+            break
+        fit = _refit(bounds, units)
+        if fit is None:
+            break
+        a, c = fit
+
+    if bounds is None:
+        return [], dict(info, passes=passes, cost=float("inf"), leading_silence=False)
+    segments = [{"start": round(s, 6), "end": round(e, 6)} for s, e in zip(bounds[:-1], bounds[1:])]
+    return segments, dict(info, passes=passes, cost=round(cost, 4), rate=round(a, 4), overhead=round(c, 3),
+                          leading_silence=bounds[0] > 0)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Re-align every Listen & Repeat audio file in one command.
+
+Discovers audio/lr/LR-S*.mp3, pairs each with its sentence list from
+data/lr-sentence-sets.json (matched on the set id, LR-S04-... -> S04), and
+aligns them in a process pool, one file per task: forced_align.align() (one
+DP pass over candidate pauses, default) or sentence_align.fit_segments()
+(threshold search, --align search). Each worker keeps its own SilenceDetector, so envelopes
+come from audio/.envelope-cache when the audio is unchanged. Writes
+<audio>.srt next to every MP3 and prints a per-file quality summary:
+
+  method   dp, or exact / merged / split (see sentence_align.py); fixed
+           with --align fixed when the count is off
+  cost     expected-length boundary cost (0 = boundaries exactly where the
+           sentences' character counts predict; audio/lr sets sit ~0.3-0.8)
+  worst    largest |log2(actual / expected)| segment length, as a ratio
+  shift    largest start-time change vs. the SRT being replaced
+
+Sets whose MP3 has a <name>.json timing sidecar were synthesized by
+generate-audio-inworld.py and already have exact SRTs; they are skipped
+unless --include-synthesized.
+
+Usage:
+  python3 scripts/generate-lr-srt.py
+  python3 scripts/generate-lr-srt.py --sets S02 S04 --dry-run
+  python3 scripts/generate-lr-srt.py --align search
+  python3 scripts/generate-lr-srt.py --jobs 4 --report /tmp/lr-srt-report.json
+
+Requires: ffmpeg, numpy
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sentence_align import (NUMPY_AVAILABLE, boundary_cost, expected_weights, fit_segments, load_sentence_sets,
+                            segment, to_srt)
+from forced_align import align
+from silence_detect import SilenceDetector, add_detector_args
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LR_GLOB = "audio/lr/LR-S*.mp3"
+SET_ID_RE = re.compile(r"^LR-(S\d+)")
+SRT_TIME_RE = re.compile(r"^(\d+):(\d+):(\d+),(\d+) -->", re.M)
+
+_detector = None
+
+
+def _init_worker(kind, frame_ms, hop_ms):
+    global _detector
+    _detector = SilenceDetector(kind=kind, frame_ms=frame_ms, hop_ms=hop_ms)
+
+
+def srt_starts(srt_path):
+    """Cue start times (seconds) of an existing SRT, or None if there is none."""
+    if not srt_path.exists():
+        return None
+    return [int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+            for h, m, s, ms in SRT_TIME_RE.findall(srt_path.read_text(encoding="utf-8"))]
+
+
+def align_file(audio_path, sentences, noise_db, silence_duration, method, dry_run):
+    """Align one file and (unless dry_run) write its SRT. Runs in a worker process."""
+    started = time.perf_counter()
+    envelope = _detector.envelope(audio_path)
+    srt_path = audio_path.with_suffix(".srt")
+    if method == "dp":
+        segments, info = align(envelope, sentences, noise_db)
+        info = dict(info, count=len(segments), probes=info["passes"], silence_duration=None,
+                    cost=round(boundary_cost(segments, expected_weights(sentences)), 4) if segments else float("inf"))
+    elif method == "search":
+        segments, info = fit_segments(envelope, sentences, noise_db, silence_duration)
+    else:
+        # Fixed thresholds, first N segments: what generate-srt-silence.py --no-search writes
+        segments = segment(envelope, noise_db, silence_duration)[:len(sentences)]
+        info = {"method": "exact" if len(segments) == len(sentences) else "fixed", "probes": 1,
+                "count": len(segments), "noise_db": noise_db, "silence_duration": silence_duration,
+                "leading_silence": True, "cost": round(boundary_cost(segments, expected_weights(sentences)), 4)}
+
+    durations = [seg["end"] - seg["start"] for seg in segments[:len(sentences)]]
+    span = sum(durations) or 1.0
+    worst = max((abs(math.log2(max(d, 1e-3) / (w * span)))
+                 for d, w in zip(durations, expected_weights(sentences))), default=0.0)
+    previous = srt_starts(srt_path)
+    shift = None
+    if previous is not None and len(previous) == len(segments):
+        shift = max(abs(a - seg["start"]) for a, seg in zip(previous, segments))
+
+    if not dry_run:
+        srt_path.write_text(to_srt(segments, sentences), encoding="utf-8")
+    return {
+        "audio": str(audio_path.relative_to(PROJECT_ROOT)),
+        "srt": str(srt_path.relative_to(PROJECT_ROOT)),
+        "sentences": len(sentences),
+        "segments": len(segments),
+        "method": info["method"],
+        "probes": info["probes"],
+        "raw_count": info["count"],
+        "noise_db": info["noise_db"],
+        "silence_duration": info["silence_duration"],
+        "leading_silence": info["leading_silence"],
+        "cost": info["cost"],
+        "worst_ratio": round(2 ** worst, 2),
+        "shift_ms": None if shift is None else round(shift * 1000, 1),
+        "duration": round(envelope.duration, 2),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def discover(sets, only=None, include_synthesized=False):
+    """[(set_id, audio_path, sentences)] for every LR MP3 with a sentence list; prints what is skipped."""
+    jobs = []
+    for audio_path in sorted(PROJECT_ROOT.glob(LR_GLOB)):
+        match = SET_ID_RE.match(audio_path.name)
+        set_id = match.group(1) if match else None
+        if only and set_id not in only:
+            continue
+        if set_id not in sets:
+            print(f"  skip {audio_path.name}: no sentence list in data/lr-sentence-sets.json")
+            continue
+        if audio_path.with_suffix(".json").exists() and not include_synthesized:
+            print(f"  skip {audio_path.name}: exact timings from synthesis (.json sidecar)")
+            continue
+        jobs.append((set_id, audio_path, sets[set_id]["sentences"]))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch SRT generation for all Listen & Repeat audio")
+    parser.add_argument("--sets", nargs="+", help="Only these set ids (e.g. S02 S04)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--silence-duration", type=float, default=0.8, help="Min silence duration in seconds (default: 0.8)")
+    parser.add_argument("--noise-db", type=float, default=-40, help="Noise threshold in dB (default: -40)")
+    parser.add_argument("--align", choices=["dp", "search", "fixed"], default="dp",
+                        help="dp: forced alignment (default); search: threshold search; "
+                             "fixed: given thresholds, first N segments")
+    parser.add_argument("--dry-run", action="store_true", help="Align and report, but don't write SRTs")
+    parser.add_argument("--include-synthesized", action="store_true",
+                        help="Also re-align sets that have a synthesis timing sidecar")
+    parser.add_argument("--report", help="Also write the summary as JSON to this path")
+    add_detector_args(parser)
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("Error: numpy is required (pip install numpy)", file=sys.stderr)
+        sys.exit(1)
+
+    jobs = discover(load_sentence_sets(), args.sets, args.include_synthesized)
+    if not jobs:
+        print(f"Nothing to align ({LR_GLOB})")
+        return
+    workers = max(1, min(args.jobs or 1, len(jobs)))
+    print(f"Aligning {len(jobs)} files with {workers} worker(s)...")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(args.envelope, args.frame_ms, args.hop_ms)) as pool:
+        futures = [pool.submit(align_file, audio_path, sentences, args.noise_db, args.silence_duration,
+                               args.align, args.dry_run)
+                   for _, audio_path, sentences in jobs]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - started
+
+    print(f"\n{'file':<36} {'method':<7} {'segs':>5} {'probes':>6} {'cost':>6} {'worst':>6} {'shift':>9} {'time':>7}")
+    for r in results:
+        shift = "new" if r["shift_ms"] is None else f"{r['shift_ms']:.0f}ms"
+        print(f"{Path(r['audio']).name:<36} {r['method']:<7} {r['segments']:>2}/{r['sentences']:<2} "
+              f"{r['probes']:>6} {r['cost']:>6.3f} {r['worst_ratio']:>5.2f}x {shift:>9} {r['seconds']:>6.2f}s")
+
+    busy = sum(r["seconds"] for r in results)
+    inexact = [Path(r["audio"]).name for r in results if r["method"] in ("merged", "split", "fixed")]
+    print(f"\n{len(results)} files in {wall:.2f}s wall ({busy:.2f}s of work, {busy / wall:.1f}x parallel)")
+    if inexact:
+        print(f"Check by ear (segments merged/split or truncated): {', '.join(inexact)}")
+    if args.dry_run:
+        print("Dry run: no SRTs written")
+    else:
+        print("Re-cut the practice clips: python3 scripts/build-lr-clips.py")
+
+    if args.report:
+        report = {"wall_seconds": round(wall, 3), "workers": workers, "files": results}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
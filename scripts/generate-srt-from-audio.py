@@ -3,79 +3,75 @@
 Generate SRT subtitle file from audio using OpenAI Whisper.
 Each sentence typically has ~1–1.5s silence between them; Whisper segments on natural pauses.
 
+Several files (or globs) share one loaded model (whisper_worker.WhisperWorker),
+so the model load is paid once per run. With --socket the files are queued on
+a running `whisper_worker.py --serve` instead and no model is loaded here.
+
 Usage:
   python generate-srt-from-audio.py path/to/audio.mp3
   python generate-srt-from-audio.py LR-S04-dining-hall.mp3 --output LR-S04-dining-hall.srt
+  python generate-srt-from-audio.py audio/lr/*.mp3 --vad
+  python generate-srt-from-audio.py audio/lr/*.mp3 --socket
 
 Requires: pip install openai-whisper
 Also: brew install ffmpeg
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from whisper_worker import DEFAULT_SOCKET, WhisperWorker, expand, report, submit
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate SRT from audio using Whisper")
-    parser.add_argument("audio", help="Path to audio file (mp3, wav, flac, etc.)")
-    parser.add_argument("-o", "--output", help="Output SRT path (default: same name as audio)")
+    parser.add_argument("audio", nargs="+", help="Path(s) or glob(s) of audio files (mp3, wav, flac, etc.)")
+    parser.add_argument("-o", "--output", help="Output SRT path (default: same name as audio; single file only)")
     parser.add_argument("-m", "--model", default="base.en", help="Whisper model: tiny.en, base.en, small.en, medium.en (default: base.en)")
     parser.add_argument("--language", default="en", help="Language code (default: en)")
+    parser.add_argument("--vad", action="store_true", help="One segment per pause-delimited span, batch-decoded (see whisper_worker.py)")
+    parser.add_argument("--socket", nargs="?", const=DEFAULT_SOCKET,
+                        help=f"Queue files on a running whisper_worker.py --serve (default socket: {DEFAULT_SOCKET})")
     args = parser.parse_args()
 
-    audio_path = Path(args.audio)
-    if not audio_path.exists():
-        print(f"Error: File not found: {audio_path}", file=sys.stderr)
+    files = expand(args.audio)
+    missing = [f for f in files if not Path(f).exists()]
+    if missing:
+        print(f"Error: File not found: {missing[0]}", file=sys.stderr)
         sys.exit(1)
-
-    output_path = Path(args.output) if args.output else audio_path.with_suffix(".srt")
-
-    try:
-        import whisper
-    except ImportError:
-        print("Error: Whisper not installed. Run: pip install openai-whisper", file=sys.stderr)
+    if args.output and len(files) > 1:
+        print("Error: --output only works with a single audio file", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Loading model '{args.model}'...")
-    model = whisper.load_model(args.model)
-
-    print(f"Transcribing {audio_path}...")
-    result = model.transcribe(
-        str(audio_path),
-        language=args.language,
-        word_timestamps=False,
-        verbose=False,
-    )
-
-    # Build SRT from segments
-    segments = result.get("segments", [])
-    if not segments:
-        print("Warning: No segments detected. Check audio quality.", file=sys.stderr)
+    failed = 0
+    if args.socket:
+        try:
+            for result in submit(files, args.socket, args.output, vad=args.vad):
+                report(result)
+                failed += not result["ok"]
+        except (ConnectionRefusedError, FileNotFoundError):
+            print(f"Error: no worker on {args.socket}. Start one: python3 scripts/whisper_worker.py --serve",
+                  file=sys.stderr)
+            sys.exit(1)
+    else:
+        try:
+            worker = WhisperWorker(args.model, args.language)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Transcribing {len(files)} file(s)...")
+        for path in files:
+            result = worker.transcribe_to_srt(path, args.output, vad=args.vad)
+            report(result)
+            failed += not result["ok"]
+        print(worker.summary())
+
+    if failed:
         sys.exit(1)
 
-    def to_srt_time(seconds):
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        ms = int((seconds % 1) * 1000)
-        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
-
-    lines = []
-    for i, seg in enumerate(segments, 1):
-        start = seg["start"]
-        end = seg["end"]
-        text = seg["text"].strip()
-        if not text:
-            continue
-        lines.append(f"{i}")
-        lines.append(f"{to_srt_time(start)} --> {to_srt_time(end)}")
-        lines.append(text)
-        lines.append("")
-
-    output_path.write_text("\n".join(lines), encoding="utf-8")
-    print(f"Saved: {output_path} ({len(segments)} segments)")
-
 
 if __name__ == "__main__":
     main()
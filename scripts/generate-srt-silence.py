@@ -1,145 +1,57 @@
 #!/usr/bin/env python3
 """
-Generate SRT from audio using ffmpeg silence detection.
+Generate SRT from audio using silence detection.
 Use when you have ~1–1.5s silence between sentences and know the sentence text.
+--set takes any Listen & Repeat set in data/lr-sentence-sets.json; for the
+whole catalog at once use generate-lr-srt.py.
+
+Silences come from the NumPy detector in silence_detect.py (one decode per
+file, cached envelope); without NumPy it falls back to ffmpeg silencedetect.
+
+If --noise-db / --silence-duration do not give exactly one segment per
+sentence, sentence_align.fit_segments() bisects both on the cached envelope
+and, failing an exact count, merges/splits segments by expected sentence
+length. --no-search keeps the old behaviour (first N segments, warning).
+--align dp skips the silence thresholds altogether and places one boundary
+per sentence with forced_align.align() (needs the sentence text, numpy).
 
 Usage:
-  python generate-srt-silence.py audio.mp3 sentences.txt -o output.srt
+  python generate-srt-silence.py audio.mp3 --sentences sentences.txt -o output.srt
   python generate-srt-silence.py audio.mp3 --set S04 -o output.srt
+  python generate-srt-silence.py audio.mp3 --set S04 --no-search
 
-Requires: ffmpeg
+Requires: ffmpeg, numpy (recommended)
 """
 
 import argparse
-import re
-import subprocess
+import os
 import sys
 from pathlib import Path
 
-# Sentences from lr-question-bank.md (S04 Campus Dining Hall)
-S04_SENTENCES = [
-    "Hi there, welcome to the dining hall.",
-    "We serve breakfast, lunch, and dinner.",
-    "Breakfast starts at seven thirty every morning.",
-    "You can pick up a tray at the entrance.",
-    "The salad bar is on your left when you walk in.",
-    "Hot meals are served at the counter straight ahead.",
-    "Today's special is grilled chicken with roasted vegetables.",
-    "All drinks are included with your meal plan.",
-    "You can refill your water bottle at the station over there.",
-    "Please return your tray to the drop-off area when you're done.",
-    "We have a vegetarian section with fresh options every day.",
-    "If you have any food allergies, please check the labels on each dish.",
-    "The dessert table is next to the beverage station near the window.",
-    "We try to use locally grown ingredients whenever they are available.",
-    "Students with a meal plan can eat here up to three times a day.",
-    "Guest passes can be purchased at the front desk for five dollars each.",
-    "The dining hall gets really busy around noon, so you might want to come a little earlier.",
-    "On weekends, we offer a special brunch menu from ten in the morning until two in the afternoon.",
-    "If you have any suggestions about the menu, there's a feedback box right next to the exit.",
-    "We hope you enjoy your meals here, and please don't hesitate to ask the staff if you need anything at all.",
-]
-
-SENTENCE_SETS = {"S04": S04_SENTENCES}
-
-
-def run_silencedetect(audio_path: str, silence_duration: float = 1.0, noise_dB: float = -30) -> list:
-    """Run ffmpeg silencedetect and return list of (silence_start, silence_end)."""
-    cmd = [
-        "ffmpeg", "-i", audio_path,
-        "-af", f"silencedetect=noise={noise_dB}dB:d={silence_duration}",
-        "-f", "null", "-",
-        "-nostats", "-loglevel", "info"
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    stderr = (result.stderr or "") + (result.stdout or "")
-
-    silences = []
-    for line in stderr.splitlines():
-        m = re.search(r"silence_start: ([\d.]+)", line)
-        if m:
-            silences.append({"start": float(m.group(1)), "end": None})
-            continue
-        m = re.search(r"silence_end: ([\d.]+)", line)
-        if m and silences and silences[-1]["end"] is None:
-            silences[-1]["end"] = float(m.group(1))
-
-    return [s for s in silences if s["end"] is not None]
-
-
-def silences_to_speech_segments(silences: list, total_duration: float, has_leading_silence: bool = True) -> list:
-    """
-    Convert silence periods to speech segments using midpoints of silence gaps.
-
-    Key idea: use the MIDPOINT of each silence gap as the boundary between
-    sentences. This avoids clipping the tail of the previous sentence or the
-    onset of the next sentence.
-
-    has_leading_silence: True if the audio starts with silence before sentence 1.
-                         False if sentence 1 starts right at the beginning.
-    """
-    if not silences:
-        return [{"start": 0.0, "end": total_duration}]
-
-    segments = []
-
-    if has_leading_silence and len(silences) >= 2:
-        # First silence is leading silence; skip it.
-        # Sentence 1 starts at midpoint of first silence gap.
-        # Sentence boundaries use midpoints of subsequent silences.
-        for i in range(len(silences) - 1):
-            mid_start = (silences[i]["start"] + silences[i]["end"]) / 2
-            mid_end = (silences[i + 1]["start"] + silences[i + 1]["end"]) / 2
-            if mid_end - mid_start > 0.1:
-                segments.append({"start": mid_start, "end": mid_end})
-        # Last sentence: from midpoint of last silence to end of file
-        mid_last = (silences[-1]["start"] + silences[-1]["end"]) / 2
-        if total_duration - mid_last > 0.1:
-            segments.append({"start": mid_last, "end": total_duration})
-    else:
-        # No leading silence: sentence 1 starts at 0
-        first_mid = (silences[0]["start"] + silences[0]["end"]) / 2
-        segments.append({"start": 0.0, "end": first_mid})
-        for i in range(len(silences) - 1):
-            mid_start = (silences[i]["start"] + silences[i]["end"]) / 2
-            mid_end = (silences[i + 1]["start"] + silences[i + 1]["end"]) / 2
-            if mid_end - mid_start > 0.1:
-                segments.append({"start": mid_start, "end": mid_end})
-        # Last sentence: from midpoint of last silence to end of file
-        mid_last = (silences[-1]["start"] + silences[-1]["end"]) / 2
-        if total_duration - mid_last > 0.1:
-            segments.append({"start": mid_last, "end": total_duration})
-
-    return segments
-
-
-def get_audio_duration(audio_path: str) -> float:
-    """Get audio duration in seconds using ffprobe."""
-    cmd = [
-        "ffprobe", "-v", "error", "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1", audio_path
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return float(result.stdout.strip()) if result.returncode == 0 else 0.0
-
-
-def to_srt_time(seconds: float) -> str:
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int((seconds % 1) * 1000)
-    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_timing import srt_text
+from forced_align import align
+from sentence_align import fit_segments, load_sentence_sets
+from silence_detect import add_detector_args, detect_silences, detector_from_args, silences_to_speech_segments
+
+SENTENCE_SETS = {set_id: info["sentences"] for set_id, info in load_sentence_sets().items()}
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate SRT from audio using silence detection")
     parser.add_argument("audio", help="Path to audio file")
-    parser.add_argument("--set", "-s", choices=list(SENTENCE_SETS), help="Use predefined sentence set (e.g. S04)")
+    parser.add_argument("--set", "-s", choices=list(SENTENCE_SETS), help="Use a sentence set from data/lr-sentence-sets.json (e.g. S04)")
     parser.add_argument("--sentences", "-t", help="Path to text file with one sentence per line (alternative to --set)")
     parser.add_argument("-o", "--output", help="Output SRT path")
     parser.add_argument("--silence-duration", type=float, default=0.8, help="Min silence duration in seconds (default: 0.8)")
     parser.add_argument("--noise-db", type=float, default=-40, help="Noise threshold in dB (default: -40)")
     parser.add_argument("--no-leading-silence", action="store_true", help="Audio starts immediately with sentence 1 (no silence before it)")
+    parser.add_argument("--align", choices=["search", "dp"], default="search",
+                        help="search: silence thresholds, searched if the count is off (default); "
+                             "dp: forced alignment over candidate pauses")
+    parser.add_argument("--no-search", action="store_true",
+                        help="Use the given thresholds as-is and keep the first N segments (no threshold search)")
+    add_detector_args(parser)
     args = parser.parse_args()
 
     audio_path = Path(args.audio)
@@ -158,34 +70,43 @@ def main():
 
     output_path = Path(args.output) if args.output else audio_path.with_suffix(".srt")
 
-    print("Getting audio duration...")
-    duration = get_audio_duration(str(audio_path))
+    detector = detector_from_args(args)
+    print(f"Detecting silences (duration >= {args.silence_duration}s)...")
+    silences, duration = detect_silences(audio_path, args.silence_duration, args.noise_db, detector=detector)
     if duration <= 0:
         print("Error: Could not get audio duration", file=sys.stderr)
         sys.exit(1)
-
-    print(f"Detecting silences (duration >= {args.silence_duration}s)...")
-    silences = run_silencedetect(str(audio_path), args.silence_duration, args.noise_db)
-    print(f"Found {len(silences)} silence periods")
+    print(f"Found {len(silences)} silence periods ({duration:.1f}s of audio)")
 
     has_leading = not args.no_leading_silence
     segments = silences_to_speech_segments(silences, duration, has_leading_silence=has_leading)
 
+    if args.align == "dp":
+        if detector is None:
+            print("Error: --align dp needs numpy (pip install numpy)", file=sys.stderr)
+            sys.exit(1)
+        segments, info = align(detector.envelope(audio_path), sentences, args.noise_db)
+        print(f"  dp: {info['candidates']} candidate pauses, {info['passes']} passes, "
+              f"{info.get('rate', 0) * 1000:.0f} ms/char + {info.get('overhead', 0):.2f}s per sentence")
+    elif len(segments) != len(sentences) and not args.no_search:
+        if detector is None:
+            print("Warning: threshold search needs numpy (pip install numpy); keeping first N segments",
+                  file=sys.stderr)
+        else:
+            print(f"{len(segments)} segments for {len(sentences)} sentences, searching thresholds...")
+            segments, info = fit_segments(detector.envelope(audio_path), sentences, args.noise_db,
+                                          args.silence_duration, False if args.no_leading_silence else None)
+            print(f"  {info['method']}: noise {info['noise_db']} dB, min silence {info['silence_duration']}s, "
+                  f"leading silence {'yes' if info['leading_silence'] else 'no'} "
+                  f"({info['probes']} probes, {info['count']} segments before merge/split)")
+
     # Match segments to sentences (take first N segments)
     n = min(len(segments), len(sentences))
     if n < len(sentences):
         print(f"Warning: Only {n} segments for {len(sentences)} sentences", file=sys.stderr)
 
-    lines = []
-    for i in range(n):
-        seg = segments[i]
-        text = sentences[i]
-        lines.append(f"{i + 1}")
-        lines.append(f"{to_srt_time(seg['start'])} --> {to_srt_time(seg['end'])}")
-        lines.append(text)
-        lines.append("")
-
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    output_path.write_text(srt_text((seg["start"], seg["end"], text) for seg, text in zip(segments, sentences)),
+                           encoding="utf-8")
     print(f"Saved: {output_path} ({n} segments)")
 
 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the Inworld TTS API.
+
+All generate-*-audio scripts go through InworldClient instead of calling
+requests.post() inline:
+  - one keep-alive requests.Session per run, so sentences reuse the TCP+TLS
+    connection instead of paying a handshake each time;
+  - a bounded per-host connection pool (pool_block=True), so concurrent
+    workers never open more than TTS_MAX_CONNECTIONS sockets;
+  - jittered exponential retries on network errors, timeouts, 429 and 5xx
+    (a TTS request has no side effects, so it is safe to repeat);
+  - a per-request latency histogram printed at the end of a run.
+
+Usage:
+  client = InworldClient(load_api_key(), MODEL_ID, SAMPLE_RATE)
+  pcm = client.synthesize("Hello.", "Ashley")
+  print(client.stats_summary())
+
+Environment:
+  INWORLD_API_KEY        API key (or put INWORLD_API_KEY=... in the project .env)
+  INWORLD_API_URL        override the endpoint (e.g. mock_inworld_server.py)
+  TTS_MAX_CONNECTIONS    pooled connections to the API host (default 8)
+  TTS_MAX_RETRIES        retries per request on network errors, 429 and 5xx (default 5)
+"""
+
+import base64
+import bisect
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ==================== CONFIG ====================
+API_URL = "https://api.inworld.ai/tts/v1/voice"
+DEFAULT_TIMEOUT = 60          # seconds per attempt
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 0.5            # seconds, doubled per retry
+BACKOFF_CAP = 30.0            # seconds
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = [100, 200, 400, 800, 1600, 3200, 6400, 12800, 25600]
+
+
+def load_api_key():
+    """Load INWORLD_API_KEY from the project .env, falling back to the environment."""
+    env_path = Path(__file__).resolve().parent.parent / ".env"
+    if env_path.exists():
+        with open(env_path, "r") as f:
+            for line in f:
+                if line.startswith("INWORLD_API_KEY="):
+                    return line.split("=", 1)[1].strip()
+    return os.getenv("INWORLD_API_KEY")
+
+
+class LatencyHistogram:
+    """Thread-safe request latency histogram with percentile lookup."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # last bucket = overflow
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+            self.samples.append(ms)
+
+    def percentile(self, pct):
+        """Latency in ms at the given percentile (0-100), or 0.0 with no samples."""
+        with self._lock:
+            if not self.samples:
+                return 0.0
+            ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def render(self, width=30):
+        """Multi-line text histogram."""
+        with self._lock:
+            counts = list(self.counts)
+        peak = max(counts) or 1
+        last = max((i for i, c in enumerate(counts) if c), default=0)  # hide empty tail buckets
+        lines = []
+        lower = 0
+        for bound, count in list(zip(self.buckets_ms + [None], counts))[:last + 1]:
+            label = f"{lower:>6}-{bound:<6}ms" if bound is not None else f"{lower:>6}+{'':6}ms"
+            lines.append(f"  {label} {'#' * int(width * count / peak):<{width}} {count}")
+            lower = bound
+        return "\n".join(lines)
+
+
+class InworldClient:
+    """Pooled, retrying client for the Inworld /tts/v1/voice endpoint."""
+
+    def __init__(self, api_key, model_id, sample_rate, api_url=None, timeout=DEFAULT_TIMEOUT,
+                 max_connections=None, max_retries=None, rate_limiter=None):
+        self.api_url = api_url or os.getenv("INWORLD_API_URL") or API_URL
+        self.model_id = model_id
+        self.sample_rate = sample_rate
+        self.audio_config = {
+            "audio_encoding": "LINEAR16",
+            "sample_rate_hertz": sample_rate,
+        }
+        self.timeout = timeout
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("TTS_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        # Optional tts_engine.TokenBucket: acquired before every attempt, slowed on 429/5xx
+        self.rate_limiter = rate_limiter
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+        max_connections = max_connections or int(os.getenv("TTS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections,
+                              pool_block=True, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Basic {api_key}",
+        })
+
+    def _post(self, text, voice_id):
+        payload = {
+            "text": text,
+            "voice_id": voice_id,
+            "model_id": self.model_id,
+            "audio_config": self.audio_config,
+        }
+        started = time.monotonic()
+        try:
+            resp = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+        finally:
+            self.latency.record(time.monotonic() - started)
+            with self._lock:
+                self.requests += 1
+        resp.raise_for_status()
+        audio_bytes = base64.b64decode(resp.json()["audioContent"])
+        # Strip WAV header if present
+        if len(audio_bytes) > 44 and audio_bytes[:4] == b"RIFF":
+            audio_bytes = audio_bytes[44:]
+        return audio_bytes
+
+    def synthesize(self, text, voice_id):
+        """Synthesize one sentence. Returns raw PCM (16-bit mono); raises after retries."""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                pcm = self._post(text, voice_id)
+            except requests.RequestException as e:
+                response = getattr(e, "response", None)
+                status = getattr(response, "status_code", None)
+                retryable = (isinstance(e, (requests.ConnectionError, requests.Timeout))
+                             or status in RETRYABLE_STATUS)
+                if not retryable or attempt >= self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    detail = f" — {response.text[:200]}" if response is not None else ""
+                    print(f"    Error synthesizing '{text[:50]}...': {e}{detail}", file=sys.stderr)
+                    raise
+                if status is not None and self.rate_limiter is not None:
+                    self.rate_limiter.slow_down()
+                delay = None
+                if response is not None and response.headers.get("Retry-After"):
+                    try:
+                        delay = float(response.headers["Retry-After"])
+                    except ValueError:
+                        delay = None
+                if delay is None:
+                    # Exponential backoff with full jitter
+                    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt + 1)))
+                with self._lock:
+                    self.retries += 1
+                print(f"    Retry {attempt + 1}/{self.max_retries} for '{text[:40]}...' "
+                      f"({status or type(e).__name__}); waiting {delay:.1f}s", file=sys.stderr)
+                time.sleep(delay)
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.speed_up()
+            return pcm
+
+    def stats_summary(self):
+        """Request counts plus p50/p90/p99 latency and the histogram."""
+        return (f"HTTP: {self.requests} requests, {self.retries} retries, {self.failures} failed; "
+                f"latency p50 {self.latency.percentile(50):.0f} ms, "
+                f"p90 {self.latency.percentile(90):.0f} ms, p99 {self.latency.percentile(99):.0f} ms\n"
+                f"{self.latency.render()}")
+
+    def close(self):
+        self.session.close()
@@ -17,6 +17,7 @@ VOICE_IDS = {
     "ashley": "Ashley",      # Warm, natural female voice
     "deborah": "Deborah",    # Female voice (verify ID)
     "sarah": "Sarah",        # Female voice (verify ID)
+    "olivia": "Olivia",      # American female voice
     
     # Male voices (general)
     "dennis": "Dennis",      # Middle-aged man, smooth, calm, friendly
@@ -50,22 +51,25 @@ INTERVIEW_VOICES = {
 }
 
 # Conversation Practice (dialogue between two speakers)
+# Roles used in data/conversation-scripts.json
 CONVERSATION_VOICES = {
-    "female": "ashley",   # Default female voice for conversations
-    "male": "dennis",     # Default male voice for conversations
+    "female": "olivia",   # American female (the published LC audio)
+    "male": "dennis",     # American male
 }
 
 # Choose Response Practice (short dialogues)
+# Roles used in data/choose-response-dialogues.json
 CHOOSE_RESPONSE_VOICES = {
-    "female": "ashley",   # Default female voice
-    "male": "dennis",     # Default male voice
+    "female": "olivia",   # American female (the published LCR audio)
+    "male": "dennis",     # American male
 }
 
 # Announcement Practice (campus announcements)
+# Roles used in data/announcement-scripts.json
 ANNOUNCEMENT_VOICES = {
     "default": "mark",    # General announcements
-    "female": "sarah",    # Female announcer option
-    "male": "mark",       # Male announcer option
+    "female": "olivia",   # Female announcer (the published LA audio)
+    "male": "dennis",     # Male announcer (the published LA audio)
 }
 
 # Academic Talk Practice (short lectures A2–C1)
@@ -93,6 +97,11 @@ def get_voice_id(voice_name):
     return voice_name.capitalize()
 
 
+def get_voice_id_for_role(assignments, role):
+    """Get the Inworld API voice ID for a role ("female", "male", ...) in one of the tables above."""
+    return get_voice_id(assignments.get(role, role))
+
+
 def get_lr_voice(set_id):
     """Get the voice name for a Listen & Repeat set."""
     return LR_VOICES.get(set_id, "ashley")  # Default to Ashley
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Inworld TTS API, for running the audio pipeline offline.
+
+Serves the same contract as https://api.inworld.ai/tts/v1/voice:
+
+  POST /tts/v1/voice
+  Authorization: Basic <any key>
+  {"text": ..., "voice_id": ..., "model_id": ...,
+   "audio_config": {"audio_encoding": "LINEAR16", "sample_rate_hertz": 48000}}
+  -> 200 {"audioContent": "<base64 WAV-wrapped LINEAR16 PCM>"}
+
+The audio is deterministic: the same (text, voice, model, sample rate) always
+returns the same bytes, so the TTS cache and build hashes behave as they do
+against the real API. Each word becomes a tone burst (pitch from the voice
+and text, length from the word) followed by a short gap, about as long as
+real speech. Silence detection and alignment therefore see plausible pauses.
+Latency, jitter and an error rate are configurable so retries, backoff and
+rate limiting can be exercised:
+
+  latency   latency_ms + per_char_ms * len(text), +/- jitter_ms (uniform)
+  errors    error_rate of requests fail with one of error_statuses
+            (429s carry Retry-After when retry_after is set)
+
+Usage:
+  python3 scripts/mock_inworld_server.py --port 8089 --latency-ms 300 --jitter-ms 150 --error-rate 0.02
+  INWORLD_API_URL=http://127.0.0.1:8089/tts/v1/voice INWORLD_API_KEY=mock \
+      python3 scripts/build-audio.py --force
+
+  (inside a script)
+  with MockInworldServer(latency_ms=200) as server:
+      client = InworldClient("mock", MODEL_ID, SAMPLE_RATE, api_url=server.url)
+
+See benchmark-audio-pipeline.py for the end-to-end benchmark built on it.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import struct
+import threading
+import time
+from array import array
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==================== CONFIG ====================
+API_PATH = "/tts/v1/voice"
+DEFAULT_PORT = 8089
+DEFAULT_LATENCY_MS = 250.0     # fixed part of every request
+DEFAULT_PER_CHAR_MS = 2.0      # synthesis time grows with the text
+DEFAULT_JITTER_MS = 100.0
+DEFAULT_ERROR_STATUSES = (429, 503)
+BLOCK_MS = 20                  # tone bursts and gaps are whole blocks
+MS_PER_CHAR = 65               # ~15 characters per second, a relaxed speaking rate
+WORD_GAP_BLOCKS = 4            # 80 ms between words
+AMPLITUDE = 0.3
+
+
+def wav_header(sample_rate, data_bytes):
+    """44-byte RIFF header for 16-bit mono PCM (the API wraps LINEAR16 in one)."""
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + data_bytes, b"WAVE", b"fmt ", 16, 1, 1,
+                       sample_rate, sample_rate * 2, 2, 16, b"data", data_bytes)
+
+
+@lru_cache(maxsize=None)
+def _tone_block(sample_rate, cycles):
+    """One BLOCK_MS block holding a whole number of sine cycles, so blocks tile without clicks."""
+    n = sample_rate * BLOCK_MS // 1000
+    peak = AMPLITUDE * 32767
+    return array("h", (int(peak * math.sin(2 * math.pi * cycles * i / n)) for i in range(n))).tobytes()
+
+
+def synthesize_pcm(text, voice_id, model_id, sample_rate):
+    """Deterministic 16-bit mono PCM standing in for the speech of `text`."""
+    digest = hashlib.sha256(f"{model_id}\0{voice_id}\0{text}".encode("utf-8")).digest()
+    voice_pitch = hashlib.sha256(voice_id.encode("utf-8")).digest()[0] % 4   # voices sit apart
+    silence = bytes(sample_rate * BLOCK_MS // 1000 * 2)
+    chunks = []
+    for i, word in enumerate(text.split() or [text]):
+        cycles = 2 + voice_pitch + digest[i % len(digest)] % 3            # 100-400 Hz at 20 ms blocks
+        blocks = max(2, round(len(word) * MS_PER_CHAR / BLOCK_MS))
+        chunks.append(_tone_block(sample_rate, cycles) * blocks)
+        chunks.append(silence * WORD_GAP_BLOCKS)
+    return b"".join(chunks)
+
+
+class MockInworldServer:
+    """Threaded HTTP server implementing /tts/v1/voice; use as a context manager or start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=DEFAULT_LATENCY_MS, per_char_ms=DEFAULT_PER_CHAR_MS,
+                 jitter_ms=DEFAULT_JITTER_MS, error_rate=0.0, error_statuses=DEFAULT_ERROR_STATUSES,
+                 retry_after=None, wav=True, seed=0, verbose=False):
+        self.latency_ms = latency_ms
+        self.per_char_ms = per_char_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.retry_after = retry_after
+        self.wav = wav
+        self.verbose = verbose
+        self.requests = 0
+        self.errors = 0
+        self.characters = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-inworld", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _draw(self, text):
+        """(delay seconds, injected error status or None) for one request."""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            status = self._random.choice(self.error_statuses) if fail else None
+        delay_ms = max(0.0, self.latency_ms + self.per_char_ms * len(text) + jitter)
+        return delay_ms / 1000, status
+
+    def handle(self, headers, body):
+        """(status, extra headers, JSON response) for one request body."""
+        if not headers.get("Authorization", "").startswith("Basic "):
+            return 401, {}, {"code": 16, "message": "Missing or malformed Authorization header"}
+        try:
+            payload = json.loads(body)
+            text = payload["text"]
+            voice_id = payload["voice_id"]
+            model_id = payload["model_id"]
+            audio_config = payload.get("audio_config", {})
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {}, {"code": 3, "message": f"Invalid request: {e}"}
+        if audio_config.get("audio_encoding", "LINEAR16") != "LINEAR16":
+            return 400, {}, {"code": 3, "message": "Mock server only produces LINEAR16"}
+        sample_rate = int(audio_config.get("sample_rate_hertz", 48000))
+
+        delay, status = self._draw(text)
+        time.sleep(delay)
+        with self._lock:
+            self.requests += 1
+            if status is not None:
+                self.errors += 1
+        if status is not None:
+            extra = {"Retry-After": str(self.retry_after)} if status == 429 and self.retry_after is not None else {}
+            return status, extra, {"code": 8 if status == 429 else 14, "message": f"Injected error {status}"}
+
+        pcm = synthesize_pcm(text, voice_id, model_id, sample_rate)
+        audio = wav_header(sample_rate, len(pcm)) + pcm if self.wav else pcm
+        with self._lock:
+            self.characters += len(text)
+        return 200, {}, {"audioContent": base64.b64encode(audio).decode("ascii")}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"    # keep-alive, like the real endpoint
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.split("?")[0] != API_PATH:
+                    status, extra, response = 404, {}, {"code": 5, "message": f"Not found: {self.path}"}
+                else:
+                    status, extra, response = server.handle(self.headers, body)
+                data = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with server._lock:
+                    server.bytes_sent += len(data)
+
+            def log_message(self, fmt, *args):
+                if server.verbose:
+                    super().log_message(fmt, *args)
+
+        return Handler
+
+    def summary(self):
+        return (f"Mock server: {self.requests} requests, {self.errors} injected errors, "
+                f"{self.characters:,} characters synthesized, {self.bytes_sent / (1024 * 1024):.1f} MB sent")
+
+
+def add_server_args(parser):
+    """Latency / jitter / error options shared with benchmark-audio-pipeline.py."""
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                        help=f"Fixed latency per request (default: {DEFAULT_LATENCY_MS:g})")
+    parser.add_argument("--per-char-ms", type=float, default=DEFAULT_PER_CHAR_MS,
+                        help=f"Extra latency per character of text (default: {DEFAULT_PER_CHAR_MS:g})")
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_JITTER_MS,
+                        help=f"Uniform +/- jitter on the latency (default: {DEFAULT_JITTER_MS:g})")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (default: 0)")
+    parser.add_argument("--error-statuses", type=int, nargs="+", default=list(DEFAULT_ERROR_STATUSES),
+                        help="HTTP statuses used for injected errors (default: 429 503)")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and error injection (default: 0)")
+    return parser
+
+
+def server_from_args(args, host="127.0.0.1", port=0, verbose=False):
+    return MockInworldServer(host=host, port=port, latency_ms=args.latency_ms, per_char_ms=args.per_char_ms,
+                             jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                             error_statuses=args.error_statuses, retry_after=args.retry_after,
+                             seed=args.seed, verbose=verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of the Inworld TTS API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--raw", action="store_true", help="Return bare PCM instead of WAV-wrapped PCM")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    add_server_args(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port, args.verbose)
+    server.wav = not args.raw
+    print(f"Mock Inworld TTS listening on {server.url}")
+    print(f"  export INWORLD_API_URL={server.url} INWORLD_API_KEY=mock")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n{server.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+OCR every academic-discussion screenshot in parallel and save the raw text.
+
+Runs ocr_pool.ocr_images() over docs/academic-discussion/images (one
+worker process per core) and writes one JSON line per image to
+docs/academic-discussion/ocr_results.jsonl, in file-name order:
+
+  {"image": "docs/academic-discussion/images/d07-Automation.png", "question": "D07",
+   "lang": "eng", "seconds": 1.84, "text": "..."}
+
+Progress prints as images finish (in order). The run ends with a summary
+of wall time against the summed per-image OCR time, which shows how well
+the pool used the cores. A failing image is reported and left out of the
+output, and the exit code is 1.
+
+Results come from the OCR cache (ocr_cache.py) when the image, tesseract
+version and settings are unchanged, so a re-run only OCRs new screenshots.
+Screenshots go through ocr_preprocess.ScreenshotPreprocessor first (exam
+header cropped, editor toolbar masked, grayscale, downscaled).
+
+Usage:
+  python3 scripts/ocr-discussion-images.py
+  python3 scripts/ocr-discussion-images.py --only "d1*" --jobs 4
+  python3 scripts/ocr-discussion-images.py --limit 20 --output /tmp/ocr.jsonl --report /tmp/ocr-timing.json
+  python3 scripts/ocr-discussion-images.py --no-cache     # OCR everything, bypassing the cache
+  python3 scripts/ocr-discussion-images.py --no-preprocess   # OCR the screenshots unchanged
+
+Environment:
+  OCR_WORKERS        default for --jobs (CPU count otherwise)
+  OCR_CACHE=0        same as --no-cache
+  OCR_PREPROCESS=0   same as --no-preprocess
+  OCR_ENGINE         tesserocr (in-process, default when installed) or pytesseract
+
+Requires: pip install tesserocr pillow  (or: pip install pytesseract pillow; tesseract)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ocr_cache import OCRCache
+from ocr_engine import engine_name
+from ocr_pool import DEFAULT_LANG, IMAGES_DIR, OCR_AVAILABLE, default_workers, discussion_images, ocr_images, question_id
+from ocr_preprocess import ScreenshotPreprocessor
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_PATH = PROJECT_ROOT / "docs" / "academic-discussion" / "ocr_results.jsonl"
+
+
+def relative(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel OCR of the academic-discussion screenshots")
+    parser.add_argument("--images-dir", default=str(IMAGES_DIR), help="Screenshot directory")
+    parser.add_argument("--only", default="d*", metavar="GLOB", help='Only images matching this glob (default: "d*")')
+    parser.add_argument("--lang", default=DEFAULT_LANG, help=f"Tesseract language(s) (default: {DEFAULT_LANG})")
+    parser.add_argument("--fallback-lang", help='Re-read short results in this language (e.g. "chi_sim+eng")')
+    parser.add_argument("--jobs", "-j", type=int, default=default_workers(),
+                        help="Worker processes (default: OCR_WORKERS or CPU count)")
+    parser.add_argument("--limit", type=int, help="Only the first N images")
+    parser.add_argument("--output", default=str(OUTPUT_PATH), help=f"JSONL output (default: {relative(OUTPUT_PATH)})")
+    parser.add_argument("--report", help="Also write per-image timings as JSON to this path")
+    parser.add_argument("--no-cache", action="store_true", help="OCR every image, ignoring and not filling the cache")
+    parser.add_argument("--no-preprocess", action="store_true",
+                        help="OCR the screenshots unchanged (no crop, mask, grayscale or downscale)")
+    args = parser.parse_args()
+
+    if not OCR_AVAILABLE:
+        print("❌ OCR libraries not available.")
+        print("  pip install tesserocr pillow")
+        print("  or: pip install pytesseract pillow; brew install tesseract  # or apt-get install tesseract-ocr")
+        sys.exit(1)
+
+    images = discussion_images(args.images_dir, args.only)
+    if args.limit:
+        images = images[:args.limit]
+    if not images:
+        print("No images found.")
+        return
+    print(f"OCR of {len(images)} images with {args.jobs} worker(s), {engine_name()} engine...")
+
+    cache = OCRCache(enabled=False if args.no_cache else None)
+    records = []
+    timings = []
+    failed = []
+    started = time.perf_counter()
+    preprocessor = ScreenshotPreprocessor(enabled=False if args.no_preprocess else None)
+    results = ocr_images(images, args.lang, args.fallback_lang, args.jobs, cache=cache, preprocessor=preprocessor)
+    for n, (path, result, error) in enumerate(results, 1):
+        if error is not None:
+            print(f"  ✗ [{n}/{len(images)}] {path.name}: {error}", file=sys.stderr)
+            failed.append(path.name)
+            continue
+        source = "cached" if result.get("cached") else f"{result['seconds']:.2f}s"
+        print(f"  ✓ [{n}/{len(images)}] {path.name} ({len(result['text'])} chars, {source})")
+        records.append({"image": relative(path), "question": question_id(path), "lang": result["lang"],
+                        "seconds": round(result["seconds"], 3), "cached": bool(result.get("cached")),
+                        "text": result["text"]})
+        if not result.get("cached"):
+            timings.append(result["seconds"])
+    wall = time.perf_counter() - started
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, output)
+
+    ocr_total = sum(timings)
+    if timings:
+        print(f"\n{len(records)}/{len(images)} images in {wall:.1f}s wall ({len(timings)} OCR'd: "
+              f"{ocr_total:.1f}s of OCR, {ocr_total / wall:.1f}x parallel on {args.jobs} worker(s))")
+        print(f"Per image: median {statistics.median(timings):.2f}s, max {max(timings):.2f}s")
+    else:
+        print(f"\n{len(records)}/{len(images)} images in {wall:.2f}s wall (all cached)")
+    print(cache.summary())
+    print(f"Output: {relative(output)}")
+
+    if args.report:
+        report = {"workers": args.jobs, "lang": args.lang, "wall_seconds": round(wall, 3),
+                  "ocr_seconds": round(ocr_total, 3), "failed": failed,
+                  "images": [{"image": r["image"], "seconds": r["seconds"], "cached": r["cached"],
+                              "chars": len(r["text"])} for r in records]}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for OCR results of the discussion screenshots.
+
+Every extraction and "fix" script used to OCR its images from scratch, even
+when only the parsing changed. OCR output depends only on the image bytes,
+the engine and its version, and the settings (languages, fallback,
+preprocessing), so it is cached under a SHA-256 of exactly those. A parser
+change then re-runs over cached text in milliseconds. A new screenshot, a
+tesseract upgrade or different settings get a different key and are read
+again.
+
+An entry holds the raw text and, where the engine provides them, the word
+boxes (tesseract TSV, level-5 rows):
+
+  {"image": "d07-Automation.png", "engine": "tesseract", "engine_version": "5.5.1",
+   "params": {...}, "text": "...", "lang": "eng", "seconds": 1.84,
+   "words": [{"text": "Volume", "left": 978, "top": 30, "width": 69, "height": 14,
+              "conf": 91.8, "block": 1, "par": 1, "line": 1}, ...]}
+
+Layout: docs/academic-discussion/.ocr-cache/<key[:2]>/<key>.json
+Entries are a few tens of KB and the corpus is fixed-size, so there is no
+eviction; --clear starts over.
+
+Usage:
+  python3 scripts/ocr_cache.py            # show cache size and entry count
+  python3 scripts/ocr_cache.py --clear    # delete all cached results
+
+  cache = OCRCache()
+  result = cache.fetch(path, "apple-vision", "14.5", {"level": 1}, lambda: {"text": run_vision(path)})
+
+Environment:
+  OCR_CACHE_DIR   override cache directory
+  OCR_CACHE=0     disable the cache (always OCR)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "docs" / "academic-discussion" / ".ocr-cache"
+CACHE_SUFFIX = ".json"
+
+
+def image_digest(path):
+    """Hex SHA-256 of an image file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def make_key(image_sha256, engine, engine_version, params=None):
+    """Return the cache key (hex SHA-256) for one OCR run."""
+    payload = {
+        "image": image_sha256,
+        "engine": engine,
+        "engine_version": engine_version,
+        "params": params or {},
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class OCRCache:
+    """On-disk OCR result cache (JSON per image and settings) with hit/miss stats."""
+
+    def __init__(self, cache_dir=None, enabled=None):
+        if cache_dir is None:
+            cache_dir = os.getenv("OCR_CACHE_DIR") or DEFAULT_CACHE_DIR
+        if enabled is None:
+            enabled = os.getenv("OCR_CACHE", "1") != "0"
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*/*{CACHE_SUFFIX}"))
+
+    def key(self, image_path, engine, engine_version, params=None):
+        """Cache key of image_path's current bytes under this engine and settings."""
+        return make_key(image_digest(image_path), engine, engine_version, params)
+
+    def get(self, key):
+        """Return the cached entry (dict) for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.seconds_saved += entry.get("seconds", 0.0)
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry under key (atomic rename)."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.writes += 1
+
+    def fetch(self, image_path, engine, engine_version, params, ocr):
+        """Cached result for image_path, else ocr() (a dict with at least "text"), stored.
+
+        A None or empty-text result is returned but not cached, so a failed
+        read is retried next time.
+        """
+        if not self.enabled:
+            return ocr()
+        key = self.key(image_path, engine, engine_version, params)
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        result = ocr()
+        if result and result.get("text"):
+            self.put(key, self.entry(image_path, engine, engine_version, params, result))
+        return result
+
+    @staticmethod
+    def entry(image_path, engine, engine_version, params, result):
+        """The stored form of an OCR result: its fields plus what it was made from."""
+        return {"image": Path(image_path).name, "engine": engine, "engine_version": engine_version,
+                "params": params or {}, **result}
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            for p in self._entries():
+                p.unlink()
+
+    def size_bytes(self):
+        """Current on-disk size of the cache."""
+        return sum(p.stat().st_size for p in self._entries())
+
+    def summary(self):
+        """One-line hit/miss report for the end of an extraction run."""
+        if not self.enabled:
+            return "OCR cache: off"
+        lookups = self.hits + self.misses
+        rate = (100.0 * self.hits / lookups) if lookups else 0.0
+        return (f"OCR cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+                f"{self.writes} new, {self.seconds_saved:.1f}s of OCR skipped ({self.cache_dir})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the OCR result cache")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached entries")
+    args = parser.parse_args()
+
+    cache = OCRCache()
+    if args.clear:
+        cache.clear()
+        print(f"Cleared {cache.cache_dir}")
+        return
+    entries = cache._entries()
+    print(f"{cache.cache_dir}: {len(entries)} entries, {cache.size_bytes() / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
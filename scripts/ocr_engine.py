@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Resident tesseract for batch OCR: one engine per process, models loaded once.
+
+pytesseract runs a new tesseract process for every call. That process
+loads the language model again, reads a temporary PNG that pytesseract
+wrote, and hands its text and TSV back through more temporary files. Over
+a batch of screenshots this startup is paid once per image.
+
+  TesserocrEngine   libtesseract inside the process, through tesserocr's C
+                    API bindings. One initialized API per language, created
+                    on first use and kept for the life of the process. The
+                    image is passed in memory.
+  SubprocessEngine  the pytesseract path as before, used when tesserocr is
+                    not installed
+
+Both return (text, words) from read(image, lang). words are tsv_words()
+dicts. For the same tesseract version both give the same text and TSV, so
+OCR cache entries do not depend on the backend (ocr_pool keys on
+"tesseract" and version()).
+
+get_engine() returns this process's engine. It is created once, so each
+ocr_pool worker initializes tesseract once for its whole share of the
+batch. Engines are not thread-safe: use one per process, as the pool does.
+
+Usage:
+  from ocr_engine import get_engine
+  engine = get_engine()
+  text, words = engine.read(image, "eng")
+  engine.version()        # "5.5.1"
+
+Environment:
+  OCR_ENGINE        auto (default: tesserocr when installed), tesserocr or pytesseract
+  TESSDATA_PREFIX   tessdata directory for tesserocr (default: the one it was built with)
+
+Requires: pip install tesserocr pillow  (or: pip install pytesseract pillow; tesseract)
+"""
+
+import os
+
+# libgomp reads this when libtesseract is loaded, so it is set before the
+# import: one OpenMP thread per engine, the pool supplies the parallelism.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+ENGINE_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+
+# ==================== CONFIG ====================
+ENGINES = ("tesserocr", "pytesseract")
+TSV_INT_FIELDS = ("block_num", "par_num", "line_num", "left", "top", "width", "height")
+SOURCE_DPI = 70                  # tesseract's fallback for the resolution-less PNGs pytesseract writes
+
+_engine = None
+
+
+class OCRError(RuntimeError):
+    """A tesseract run failed (e.g. the language pack is not installed)."""
+
+
+def tsv_words(tsv):
+    """Word boxes from tesseract TSV output: one dict per recognized word, in reading order.
+
+    {"text", "left", "top", "width", "height", "conf", "block", "par", "line"}
+    (block/par/line are tesseract's layout numbers within the page).
+    """
+    rows = [line.split("\t") for line in tsv.splitlines()]
+    if rows and rows[0][0] == "level":
+        header, rows = rows[0], rows[1:]
+    else:
+        header = ["level", "page_num", "block_num", "par_num", "line_num", "word_num",
+                  "left", "top", "width", "height", "conf", "text"]
+    words = []
+    for row in rows:
+        if len(row) < len(header):
+            continue
+        row = dict(zip(header, row))
+        if row["level"] != "5" or not row["text"].strip():
+            continue
+        word = {"text": row["text"]}
+        for field in TSV_INT_FIELDS:
+            word[field.replace("_num", "")] = int(row[field])
+        word["conf"] = round(float(row["conf"]), 1)
+        words.append(word)
+    return words
+
+
+class TesserocrEngine:
+    """libtesseract in-process; one API per language, initialized on first use."""
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata=None):
+        if not TESSEROCR_AVAILABLE:
+            raise RuntimeError("tesserocr is not installed (pip install tesserocr)")
+        self.tessdata = tessdata or os.getenv("TESSDATA_PREFIX")
+        self._apis = {}
+
+    def _api(self, lang):
+        api = self._apis.get(lang)
+        if api is None:
+            options = {"lang": lang}
+            if self.tessdata:
+                options["path"] = self.tessdata
+            try:
+                api = tesserocr.PyTessBaseAPI(**options)
+            except RuntimeError as e:
+                raise OCRError(f"tesseract could not load {lang!r}: {e}") from e
+            self._apis[lang] = api
+        return api
+
+    def read(self, image, lang):
+        """(text, words) of one image."""
+        api = self._api(lang)
+        api.SetImage(image)
+        # tesserocr passes a BMP stamped 96 dpi; pin what the CLI sees so both engines agree
+        api.SetSourceResolution(SOURCE_DPI)
+        text = api.GetUTF8Text()
+        return text.strip(), tsv_words(api.GetTSVText(0))
+
+    def version(self):
+        return tesserocr.tesseract_version().split()[1]
+
+    def close(self):
+        for api in self._apis.values():
+            api.End()
+        self._apis.clear()
+
+
+class SubprocessEngine:
+    """pytesseract: one tesseract process per image, text and TSV from the same run."""
+
+    name = "pytesseract"
+
+    def __init__(self):
+        if not PYTESSERACT_AVAILABLE:
+            raise RuntimeError("pytesseract is not installed (pip install pytesseract)")
+
+    def read(self, image, lang):
+        """(text, words) of one image."""
+        try:
+            text, tsv = pytesseract.pytesseract.run_and_get_multiple_output(image, ["txt", "tsv"], lang=lang)
+        except pytesseract.TesseractError as e:
+            raise OCRError(str(e)) from e
+        return text.strip(), tsv_words(tsv)
+
+    def version(self):
+        return str(pytesseract.get_tesseract_version())
+
+    def close(self):
+        pass
+
+
+def engine_name():
+    """OCR_ENGINE, with auto resolved to tesserocr when installed, pytesseract otherwise."""
+    name = os.getenv("OCR_ENGINE", "auto").lower()
+    if name == "auto":
+        return "tesserocr" if TESSEROCR_AVAILABLE else "pytesseract"
+    if name not in ENGINES:
+        raise ValueError(f"OCR_ENGINE must be auto, {' or '.join(ENGINES)}; got {name!r}")
+    return name
+
+
+def get_engine():
+    """This process's OCR engine (created on first call, then reused)."""
+    global _engine
+    if _engine is None:
+        _engine = TesserocrEngine() if engine_name() == "tesserocr" else SubprocessEngine()
+    return _engine
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Parallel OCR of the academic-discussion screenshots: a process pool sized to the machine.
+
+The extraction scripts used to call pytesseract one image at a time, so a
+pass over docs/academic-discussion/images (~150 screenshots) kept a single
+core busy. ocr_images() runs ocr_image() in an encode_pool.EncodePool
+instead (one worker process per core), which gives the same guarantees as
+for audio encodes:
+
+  ordered results    (path, result, error) in input order, each as soon as it
+                     and every image before it are done
+  per-image timing   result["seconds"]: wall time of the image's OCR
+  failure isolation  an unreadable image or a failed tesseract run fails only
+                     its own item; a worker that dies is replaced and its
+                     images are retried alone
+
+Each worker reads its images with ocr_engine.get_engine(): libtesseract
+kept resident through tesserocr (language model loaded once per worker),
+or a tesseract process per image through pytesseract when tesserocr is
+not installed. tesseract is limited to one OpenMP thread
+(OMP_THREAD_LIMIT=1), so N workers use N cores and do not oversubscribe
+them. One run gives both the text and the TSV, so every result also
+carries its word boxes (result["words"], see ocr_engine.tsv_words()).
+
+Each image goes through ocr_preprocess.ScreenshotPreprocessor first (exam
+header cropped, editor toolbar masked, grayscale, downscaled); word boxes
+are mapped back to source-image coordinates.
+
+Results are cached (ocr_cache.OCRCache) by image content, tesseract version
+and settings, preprocessing included. Cached images are answered in the
+parent without OCR, and when every image is cached no pool is started at
+all; result["cached"] tells them apart.
+
+Usage:
+  from ocr_pool import discussion_images, ocr_images, question_id
+  for path, result, error in ocr_images(discussion_images()):
+      if error is None:
+          print(question_id(path), result["text"][:60], f"{result['seconds']:.1f}s")
+
+See ocr-discussion-images.py for the command-line runner.
+
+Environment:
+  OCR_WORKERS        worker processes (default: CPU count)
+  OCR_CACHE=0        always OCR (see ocr_cache.py)
+  OCR_PREPROCESS=0   OCR the screenshots unchanged (see ocr_preprocess.py)
+  OCR_ENGINE         auto, tesserocr or pytesseract (see ocr_engine.py)
+
+Requires: pip install tesserocr pillow  (or: pip install pytesseract pillow; tesseract)
+"""
+
+import os
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from encode_pool import EncodePool
+from ocr_cache import OCRCache
+from ocr_engine import ENGINE_AVAILABLE, OCRError, get_engine
+from ocr_preprocess import ScreenshotPreprocessor, map_words
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMAGES_DIR = PROJECT_ROOT / "docs" / "academic-discussion" / "images"
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+DEFAULT_LANG = "eng"
+FALLBACK_MIN_CHARS = 100      # retry with fallback_lang when the first pass reads less than this
+QUESTION_ID_RE = re.compile(r"^d(\d+)", re.I)
+ENGINE = "tesseract"           # cache keys name tesseract itself, whichever backend runs it
+OCR_AVAILABLE = PIL_AVAILABLE and ENGINE_AVAILABLE
+
+
+def default_workers():
+    """OCR_WORKERS, else one worker per CPU."""
+    return int(os.getenv("OCR_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def discussion_images(images_dir=IMAGES_DIR, pattern="d*"):
+    """Screenshots in images_dir matching the glob pattern, sorted by name."""
+    return sorted(p for p in Path(images_dir).glob(pattern) if p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def question_id(path):
+    """d07-Automation.png -> "D07"; None for names without a question number."""
+    m = QUESTION_ID_RE.match(Path(path).name)
+    return f"D{int(m.group(1)):02d}" if m else None
+
+
+@lru_cache(maxsize=1)
+def engine_version():
+    """Version string of the tesseract the OCR engine runs (part of every cache key)."""
+    return get_engine().version()
+
+
+def ocr_params(lang=DEFAULT_LANG, fallback_lang=None, min_chars=FALLBACK_MIN_CHARS, preprocessor=None):
+    """Settings that determine an OCR result, for cache keys."""
+    return {"lang": lang, "fallback_lang": fallback_lang, "min_chars": min_chars if fallback_lang else None,
+            "preprocess": preprocessor.signature() if preprocessor else None}
+
+
+def ocr_image(path, lang=DEFAULT_LANG, fallback_lang=None, min_chars=FALLBACK_MIN_CHARS, preprocessor=None):
+    """Worker task: OCR one image. Returns {"text", "lang", "seconds", "words", "size"}.
+
+    preprocessor: a ScreenshotPreprocessor run on the image first; "words"
+    are in source-image coordinates either way and "size" is the source
+    image's [width, height]. "seconds" includes the preprocessing.
+
+    With fallback_lang, an image that yields fewer than FALLBACK_MIN_CHARS
+    characters is read again in that language and the longer text is kept
+    (min_chars overrides the threshold).
+    """
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    started = time.perf_counter()
+    with Image.open(path) as source:
+        size = list(source.size)
+        image, transform = preprocessor.process(source) if preprocessor else (source, (0, 0, 1.0))
+        engine = get_engine()
+        text, words = engine.read(image, lang)
+        used = lang
+        if fallback_lang and len(text) < min_chars:
+            try:
+                retry, retry_words = engine.read(image, fallback_lang)
+            except OCRError:
+                retry = ""            # language pack not installed: keep the first pass
+            if len(retry) > len(text):
+                text, words, used = retry, retry_words, fallback_lang
+    return {"text": text, "lang": used, "seconds": time.perf_counter() - started,
+            "words": map_words(words, transform), "size": size}
+
+
+def ocr_images(paths, lang=DEFAULT_LANG, fallback_lang=None, workers=None, min_chars=FALLBACK_MIN_CHARS,
+               cache=None, preprocessor=None):
+    """Yield (path, result, error) for every image, in order; result is ocr_image()'s dict.
+
+    cache: an OCRCache (default: a new one, honouring OCR_CACHE); results
+    read from it have result["cached"] = True, new ones are stored in it.
+    preprocessor: a ScreenshotPreprocessor (default: a new one, honouring
+    OCR_PREPROCESS).
+    """
+    if not OCR_AVAILABLE:
+        raise RuntimeError("OCR needs pillow and tesserocr or pytesseract (pip install tesserocr pillow)")
+    cache = OCRCache() if cache is None else cache
+    preprocessor = ScreenshotPreprocessor() if preprocessor is None else preprocessor
+    paths = list(paths)
+    params = ocr_params(lang, fallback_lang, min_chars, preprocessor)
+    keys, hits = {}, {}
+    if cache.enabled:
+        for path in paths:
+            keys[path] = cache.key(path, ENGINE, engine_version(), params)
+            entry = cache.get(keys[path])
+            if entry is not None:
+                hits[path] = {**entry, "cached": True}
+    misses = [path for path in paths if path not in hits]
+    if not misses:
+        for path in paths:
+            yield path, hits[path], None
+        return
+
+    with EncodePool(workers=workers or default_workers()) as pool:
+        for path in misses:
+            pool.submit(path, ocr_image, path, lang, fallback_lang, min_chars, preprocessor)
+        results = pool.results()
+        for path in paths:
+            if path in hits:
+                yield path, hits[path], None
+                continue
+            path, result, error = next(results)
+            if error is None and result["text"] and cache.enabled:
+                cache.put(keys[path], cache.entry(path, ENGINE, engine_version(), params, result))
+            yield path, result, error
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Screenshot clean-up before OCR: drop the exam chrome, grayscale, binarize, scale.
+
+The discussion screenshots are full browser/exam-window captures (some
+photos of a screen, some several MB). Passed as they are, tesseract also
+reads the ETS header (TOEFL, Volume, Help, Next) and the editor toolbar
+(Cut, Paste, Undo, Redo, Hide Word Count), which the parsers then have to
+filter out by keyword. ScreenshotPreprocessor.process() runs in the OCR
+worker, in NumPy/Pillow, before the image is handed to tesseract:
+
+  crop      the header bar is the top band of rows that are mostly dark (the
+            teal bar, or its washed-out grey in photos, plus any bezel above
+            it); everything down to its last row is cut
+  mask      the editor toolbar starts at the "Cut" button, a solid teal
+            rectangle in the right part of the page; the editor from there
+            to the bottom-right corner is painted white (no text lives there)
+  grayscale one channel; also makes the temporary PNG pytesseract writes for
+            every call several times smaller than RGBA
+  scale     images wider than max_width are downscaled (Lanczos); tesseract
+            spends its time per pixel and screen text stays well above its
+            minimum glyph size at that width
+  binarize  optional global Otsu threshold (1-bit image)
+
+Images without the exam layout (document scans, typed notes) have no dark
+header band and no teal button, so they only get grayscale and scale.
+process() also returns the transform, and map_words() uses it to put word
+boxes back into source-image coordinates, so layout code never sees the
+crop or the scale. signature() is part of every OCR cache key
+(ocr_pool.ocr_params).
+
+benchmark-ocr-preprocess.py measures seconds per image and accuracy with
+and without it.
+
+Usage:
+  PREPROCESS = ScreenshotPreprocessor()
+  image, transform = PREPROCESS.process(Image.open(path))
+  words = map_words(words, transform)
+
+Environment:
+  OCR_PREPROCESS   0 to OCR the screenshots unchanged (default on)
+
+Requires: numpy, pillow
+"""
+
+import os
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ==================== CONFIG ====================
+HEADER_SEARCH = 0.15             # header band is looked for in this top fraction of the height
+HEADER_DARK_SHARE = 0.5          # a header row is at least this share of dark pixels
+DARK_MAX = 130                   # a pixel is dark when no channel exceeds this
+TOOLBAR_LEFT = 0.4               # the Cut button lies right of this fraction of the width
+BUTTON_MIN_WIDTH = 0.03          # solid teal run, as a fraction of the width
+BUTTON_MIN_HEIGHT = 0.02         # rows of such runs, as a fraction of the height
+BUTTON_FILL = 0.75               # share of teal pixels in a run (the white "Cut" label is the rest)
+TEAL_MIN_TINT = 20               # green and blue above red by at least this
+TEAL_MAX = 170                   # and neither above this (avatar backgrounds are lighter)
+MASK_MARGIN = 0.01               # white-out starts this far (fraction of W/H) before the button
+DEFAULT_MAX_WIDTH = 1440
+
+
+def preprocess_enabled():
+    """OCR_PREPROCESS (default on); off without numpy."""
+    return NUMPY_AVAILABLE and os.getenv("OCR_PREPROCESS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def header_bottom(rgb):
+    """First row below the exam header bar (0 when there is none)."""
+    band = rgb[:int(len(rgb) * HEADER_SEARCH)]
+    dark_share = (band.max(axis=2) < DARK_MAX).mean(axis=1)
+    rows = np.flatnonzero(dark_share > HEADER_DARK_SHARE)
+    return int(rows[-1]) + 1 if len(rows) else 0
+
+
+def toolbar_corner(rgb, top=0):
+    """(x, y) of the editor's "Cut" button below row `top`, or None."""
+    height, width = rgb.shape[:2]
+    x0 = int(width * TOOLBAR_LEFT)
+    region = rgb[top:, x0:].astype(np.int16)
+    red, green, blue = region[..., 0], region[..., 1], region[..., 2]
+    teal = (green - red >= TEAL_MIN_TINT) & (blue - red >= TEAL_MIN_TINT) & (np.maximum(green, blue) < TEAL_MAX)
+
+    run = max(1, int(width * BUTTON_MIN_WIDTH))
+    counts = np.cumsum(teal, axis=1, dtype=np.int32)
+    counts = np.pad(counts, ((0, 0), (1, 0)))
+    solid = (counts[:, run:] - counts[:, :-run]) >= BUTTON_FILL * run   # mostly teal from x on
+    rows = solid.any(axis=1)
+    need = max(1, int(height * BUTTON_MIN_HEIGHT))
+    stacked = np.flatnonzero(np.convolve(rows, np.ones(need, dtype=int), "valid") == need)
+    if not len(stacked):
+        return None
+    y = int(stacked[0])
+    return x0 + int(np.argmax(solid[y])), top + y
+
+
+def otsu_threshold(gray):
+    """Global Otsu threshold of an 8-bit grayscale array."""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    p = hist / hist.sum()
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    return int(np.nanargmax(between))
+
+
+def map_words(words, transform):
+    """Word boxes from a processed image, moved back to source-image coordinates."""
+    left, top, scale = transform
+    if (left, top, scale) == (0, 0, 1.0):
+        return words
+    mapped = []
+    for word in words:
+        word = dict(word)
+        word["left"] = round(word["left"] / scale) + left
+        word["top"] = round(word["top"] / scale) + top
+        word["width"] = round(word["width"] / scale)
+        word["height"] = round(word["height"] / scale)
+        mapped.append(word)
+    return mapped
+
+
+class ScreenshotPreprocessor:
+    """Crop/mask/grayscale/scale (and optionally binarize) exam screenshots for OCR."""
+
+    def __init__(self, enabled=None, crop=True, mask=True, binarize=False, max_width=DEFAULT_MAX_WIDTH):
+        self.enabled = preprocess_enabled() if enabled is None else enabled
+        if self.enabled and not NUMPY_AVAILABLE:
+            raise RuntimeError("OCR preprocessing needs numpy and pillow (pip install numpy pillow)")
+        self.crop = crop
+        self.mask = mask
+        self.binarize = binarize
+        self.max_width = max_width
+
+    def signature(self):
+        """Settings for OCR cache keys; None when disabled (keys stay as they were)."""
+        if not self.enabled:
+            return None
+        return {"crop": [self.crop, HEADER_SEARCH, HEADER_DARK_SHARE, DARK_MAX],
+                "mask": [self.mask, TOOLBAR_LEFT, BUTTON_MIN_WIDTH, BUTTON_MIN_HEIGHT, BUTTON_FILL,
+                         TEAL_MIN_TINT, TEAL_MAX, MASK_MARGIN],
+                "binarize": self.binarize, "max_width": self.max_width}
+
+    def process(self, image):
+        """(processed image, transform): transform is (left, top, scale) for map_words()."""
+        if not self.enabled:
+            return image, (0, 0, 1.0)
+        rgb = np.asarray(image.convert("RGB"))
+        height, width = rgb.shape[:2]
+        gray = image.convert("L")
+
+        top = header_bottom(rgb) if self.crop else 0
+        if self.mask:
+            corner = toolbar_corner(rgb, top)
+            if corner is not None:
+                x, y = corner
+                ImageDraw.Draw(gray).rectangle(
+                    [x - int(width * MASK_MARGIN), y - int(height * MASK_MARGIN), width, height], fill=255)
+        if top:
+            gray = gray.crop((0, top, width, height))
+
+        scale = 1.0
+        if self.max_width and gray.width > self.max_width:
+            scale = self.max_width / gray.width
+            gray = gray.resize((self.max_width, round(gray.height * scale)), Image.LANCZOS)
+        if self.binarize:
+            pixels = np.asarray(gray)
+            gray = Image.fromarray(pixels > otsu_threshold(pixels)).convert("1")
+        return gray, (0, top, scale)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Re-encode the existing MP3 catalog at new settings in one parallel pass.
+
+Every clip in audio/listening, audio/interview and audio/lr (recordings
+included; sprites and Listen & Repeat clips are derived, see below) is
+decoded and re-encoded by an encode_pool.EncodePool, one process per core.
+Progress is reported in catalog order, and a failing file is reported
+without stopping the rest. Files are replaced atomically, and only when their
+encode succeeds.
+
+Decoding honours the gapless info frame, so every clip keeps its exact
+sample count and its .srt/.json timing sidecars stay valid. Re-encoding is
+lossy on top of lossy: use it to move the catalog to new settings, not
+repeatedly.
+
+After re-encoding in place:
+  - the variants.json entries and sprite clips of the re-encoded files are
+    dropped (audio_variants.drop_stale_variants, audio_sprites.drop_stale_clips),
+    so the pages play the new MP3s
+  - sprites, LR clips and the Opus/AAC variants are stale by construction
+    (their build hashes cover the source bytes):
+      python3 scripts/build-audio-sprites.py && python3 scripts/build-lr-clips.py
+      python3 scripts/build-audio-variants.py
+  - for synthesized outputs, build with the same AUDIO_MP3_QUALITY from now
+    on and adopt the new files: AUDIO_MP3_QUALITY=<q> python3 scripts/build-audio.py --mark-current
+
+Usage:
+  python3 scripts/reencode-audio.py --quality 4 --dry-run
+  python3 scripts/reencode-audio.py --quality 4                      # in place
+  python3 scripts/reencode-audio.py --quality 6 --output-dir /tmp/v6 --report /tmp/v6.json
+  python3 scripts/reencode-audio.py --dirs audio/interview --jobs 4
+
+Environment:
+  ENCODE_WORKERS      default for --jobs (CPU count otherwise)
+  AUDIO_ENCODER       lameenc | ffmpeg
+  AUDIO_MP3_QUALITY   default for --quality (2)
+
+Requires: ffmpeg (decoding), lameenc or ffmpeg (encoding)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from audio_encoder import MP3Encoder, default_quality
+from audio_sprites import drop_stale_clips
+from audio_variants import drop_stale_variants
+from encode_pool import EncodePool, default_workers, encode_source
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATALOG_DIRS = ["audio/listening", "audio/interview", "audio/lr"]
+
+
+def relative(path):
+    return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-encode the existing MP3s at new settings, in parallel")
+    parser.add_argument("--quality", "-q", type=int, choices=range(10), default=default_quality(),
+                        help="LAME VBR quality, 0 (best) .. 9 (smallest) (default: AUDIO_MP3_QUALITY or 2)")
+    parser.add_argument("--dirs", nargs="+", default=CATALOG_DIRS,
+                        help=f"Directories to re-encode (default: {' '.join(CATALOG_DIRS)})")
+    parser.add_argument("--output-dir", help="Write here (same relative paths) instead of replacing in place")
+    parser.add_argument("--jobs", "-j", type=int, default=default_workers(),
+                        help="Worker processes (default: ENCODE_WORKERS or CPU count)")
+    parser.add_argument("--limit", type=int, help="Only the first N files")
+    parser.add_argument("--dry-run", action="store_true", help="List the files and exit")
+    parser.add_argument("--report", help="Also write per-file sizes and timings as JSON to this path")
+    args = parser.parse_args()
+
+    sources = sorted(p for d in args.dirs for p in (PROJECT_ROOT / d).glob("*.mp3"))
+    if args.limit:
+        sources = sources[:args.limit]
+    if not sources:
+        print("No MP3s found.")
+        return
+    if args.dry_run:
+        print(f"{len(sources)} files would be re-encoded at -V{args.quality}:")
+        for path in sources:
+            print(f"  {relative(path)}")
+        return
+
+    out_root = Path(args.output_dir).resolve() if args.output_dir else None
+    encoder = MP3Encoder(48000, vbr_quality=args.quality)   # collects the workers' stats for summary()
+    print(f"Re-encoding {len(sources)} files at -V{args.quality} ({encoder.backend}) "
+          f"with {args.jobs} worker(s){'' if out_root else ', in place'}...")
+
+    results = []
+    started = time.perf_counter()
+    before = {path: path.stat().st_size for path in sources}
+    with EncodePool(encoder, args.jobs) as pool:
+        for path in sources:
+            output = out_root / relative(path) if out_root else path
+            pool.submit(path, encode_source, output, path, None, encoder.backend, args.quality)
+        for n, (path, stats, error) in enumerate(pool.results(), 1):
+            if error is not None:
+                print(f"  ✗ [{n}/{len(sources)}] {relative(path)}: {error}", file=sys.stderr)
+                results.append({"file": relative(path), "error": str(error)})
+                continue
+            print(f"  ✓ [{n}/{len(sources)}] {relative(path)} "
+                  f"({before[path] / 1024:.1f} KB -> {stats['size'] / 1024:.1f} KB)")
+            results.append({"file": relative(path), "before": before[path], "after": stats["size"],
+                            "audio_seconds": round(stats["audio_seconds"], 3),
+                            "encode_seconds": round(stats["seconds"], 3)})
+    wall = time.perf_counter() - started
+
+    ok = [r for r in results if "error" not in r]
+    written = [] if out_root else [PROJECT_ROOT / r["file"] for r in ok]
+    dropped = drop_stale_variants(written)
+    unsprited = drop_stale_clips(written)
+    old_total = sum(r["before"] for r in ok)
+    new_total = sum(r["after"] for r in ok)
+    print(f"\n{len(ok)}/{len(sources)} files in {wall:.1f}s wall "
+          f"({encoder.encode_seconds:.1f}s of encoding, {encoder.encode_seconds / wall:.1f}x parallel)")
+    if old_total:
+        print(f"Size: {old_total / (1024 * 1024):.1f} MB -> {new_total / (1024 * 1024):.1f} MB "
+              f"({100 * (new_total - old_total) / old_total:+.1f}%)")
+    print(encoder.summary())
+    if pool.failed:
+        print(f"Failed: {pool.failed} (left unchanged)")
+    if dropped:
+        print(f"Dropped the Opus/AAC variants of {len(dropped)} files from variants.json")
+    if unsprited:
+        print(f"Dropped {len(unsprited)} questions from the sprite indexes")
+    if not out_root and ok:
+        print("Next: python3 scripts/build-audio-sprites.py && python3 scripts/build-lr-clips.py")
+        print("      python3 scripts/build-audio-variants.py")
+        if args.quality != default_quality():
+            print(f"      AUDIO_MP3_QUALITY={args.quality} python3 scripts/build-audio.py --mark-current")
+
+    if args.report:
+        report = {"quality": args.quality, "backend": encoder.backend, "workers": args.jobs,
+                  "wall_seconds": round(wall, 3), "files": results}
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report: {args.report}")
+    if pool.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Fit silence-based segmentation to a known sentence list.
+
+Silence detection with fixed --noise-db / --silence-duration often yields one
+segment too many (a long mid-sentence pause) or too few (two sentences read
+with a short gap). fit_segments() works on a cached silence_detect.Envelope,
+so every probe is a NumPy pass over the envelope, not a decode:
+
+  1. bisect the minimum silence duration at the given noise threshold
+     (segment count only falls as the minimum grows), then
+  2. bisect the noise threshold at that duration (count rises with the
+     threshold, give or take runs that merge);
+  3. merge or split the segments of the closest setting, choosing each edit
+     so the boundaries best match the sentences' expected relative lengths
+     (character counts). Splits go at the quietest point inside a segment.
+A count of exactly N is not proof of a correct segmentation (a mid-sentence
+pause can stand in for a missed sentence gap), so an exact bisection hit
+still has to beat the merge/split result from the requested setting on that
+same expected-length cost.
+
+Unless the caller says whether the first segment is leading silence/intro,
+both readings are tried: most sets open with a short intro before the first
+gap, but a set that starts speaking immediately must not lose sentence 1.
+An exact count at the requested setting wins outright (leading first); past
+that, the lower expected-length cost decides. That rule misreads a set that
+opens with a short sentence and ends in a long silence (LR-S01); the DP in
+forced_align.py has no such ambiguity and is what generate-lr-srt.py uses.
+
+Listen & Repeat sentence lists live in data/lr-sentence-sets.json
+(load_sentence_sets()), shared by generate-srt-silence.py and generate-lr-srt.py.
+
+Usage:
+  env = SilenceDetector().envelope("audio/lr/LR-S04-dining-hall.mp3")
+  segments, info = fit_segments(env, sentences)
+  write_srt(segments, sentences, "audio/lr/LR-S04-dining-hall.srt")
+
+Requires: numpy (fit_segments only)
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from audio_timing import srt_text
+from silence_detect import silences_to_speech_segments
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SENTENCE_SETS_PATH = PROJECT_ROOT / "data" / "lr-sentence-sets.json"
+MIN_SILENCE_RANGE = (0.15, 3.0)   # seconds, bisection bounds for the minimum silence duration
+NOISE_DB_RANGE = (-70.0, -15.0)   # dBFS, bisection bounds for the noise threshold
+MAX_PROBES = 24                   # per bisection
+SPLIT_SEARCH = (0.2, 0.8)         # split only inside this fraction of a segment
+
+
+def load_sentence_sets(path=SENTENCE_SETS_PATH):
+    """{set_id: {"label", "cefr", "audio", "sentences"}} from the LR data file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["sets"]
+
+
+def to_srt(segments, sentences):
+    """SRT text pairing segments[i] with sentences[i] (extra items on either side are dropped)."""
+    return srt_text((seg["start"], seg["end"], text) for seg, text in zip(segments, sentences))
+
+
+def write_srt(segments, sentences, srt_path):
+    Path(srt_path).write_text(to_srt(segments, sentences), encoding="utf-8")
+
+
+def expected_weights(sentences):
+    """Relative expected duration per sentence (character count of the text)."""
+    lengths = [max(1, len(s.strip())) for s in sentences]
+    total = sum(lengths)
+    return [n / total for n in lengths]
+
+
+def boundary_cost(segments, weights):
+    """How far segment boundaries sit from where the expected sentence lengths put them.
+
+    Boundaries are compared as fractions of the segmented span, in both
+    directions (every expected boundary to its nearest actual one and vice
+    versa), so the cost is defined for any segment count.
+    """
+    start, end = segments[0]["start"], segments[-1]["end"]
+    span = (end - start) or 1.0
+    actual = [(seg["end"] - start) / span for seg in segments[:-1]]
+    expected = []
+    acc = 0.0
+    for w in weights[:-1]:
+        acc += w
+        expected.append(acc)
+    if not actual or not expected:
+        return float(len(actual) + len(expected))
+    return (sum(min(abs(a - e) for a in actual) for e in expected)
+            + sum(min(abs(a - e) for e in expected) for a in actual))
+
+
+def segment(envelope, noise_db, min_duration, has_leading_silence=True):
+    """Speech segments for one (noise_db, min_duration) setting."""
+    silences = envelope.silences(noise_db, min_duration)
+    return silences_to_speech_segments(silences, envelope.duration, has_leading_silence)
+
+
+def _bisect(count_at, lo, hi, target, increasing):
+    """Bisect a monotone count function on [lo, hi] for target.
+
+    Returns (value, count, probes) for the exact hit, or for the probe whose
+    count came closest if the count jumps over target.
+    """
+    best = None
+    probes = 0
+    for _ in range(MAX_PROBES):
+        mid = (lo + hi) / 2
+        count = count_at(mid)
+        probes += 1
+        if best is None or abs(count - target) < abs(best[1] - target):
+            best = (mid, count)
+        if count == target:
+            break
+        if (count < target) == increasing:
+            lo = mid
+        else:
+            hi = mid
+    return best[0], best[1], probes
+
+
+def _merge_once(segments, weights):
+    """Merge the adjacent pair whose merge leaves durations closest to the expected lengths."""
+    best = None
+    for i in range(len(segments) - 1):
+        merged = segments[:i] + [{"start": segments[i]["start"], "end": segments[i + 1]["end"]}] + segments[i + 2:]
+        cost = boundary_cost(merged, weights)
+        if best is None or cost < best[0]:
+            best = (cost, merged)
+    return best[1]
+
+
+def _split_once(segments, weights, envelope):
+    """Split one segment at its quietest point, choosing the split that best fits expected lengths."""
+    best = None
+    lo_frac, hi_frac = SPLIT_SEARCH
+    for i, seg in enumerate(segments):
+        span = seg["end"] - seg["start"]
+        lo = int((seg["start"] + lo_frac * span) / envelope.hop_s)
+        hi = int((seg["start"] + hi_frac * span) / envelope.hop_s)
+        if hi <= lo:
+            continue
+        frame = lo + int(np.argmin(envelope.db[lo:hi]))
+        cut = frame * envelope.hop_s + envelope.frame_s / 2
+        split = segments[:i] + [{"start": seg["start"], "end": cut}, {"start": cut, "end": seg["end"]}] + segments[i + 1:]
+        cost = boundary_cost(split, weights)
+        if best is None or cost < best[0]:
+            best = (cost, split)
+    return best[1] if best else segments
+
+
+def _merge_or_split(segments, weights, envelope):
+    """Merge or split until there is one segment per weight."""
+    target = len(weights)
+    while len(segments) > target:
+        segments = _merge_once(segments, weights)
+    while 0 < len(segments) < target:
+        before = len(segments)
+        segments = _split_once(segments, weights, envelope)
+        if len(segments) == before:
+            break
+    return segments
+
+
+def fit_segments(envelope, sentences, noise_db=-40.0, silence_duration=0.8, has_leading_silence=None):
+    """Segment envelope into exactly len(sentences) speech segments.
+
+    Returns (segments, info); info records the method ("exact", "merged",
+    "split"), the settings used, whether the first segment was treated as
+    leading silence, the number of probes, the segment count before any
+    merge/split and the expected-length cost of the result.
+    """
+    if has_leading_silence is not None:
+        return _fit(envelope, sentences, noise_db, silence_duration, has_leading_silence)
+    best = None
+    probes = 0
+    for leading in (True, False):
+        segments, info = _fit(envelope, sentences, noise_db, silence_duration, leading)
+        probes += info["probes"]
+        if info["method"] == "exact" and info["probes"] == 1:
+            best = (segments, info)
+            break
+        if best is None or info["cost"] < best[1]["cost"]:
+            best = (segments, info)
+    segments, info = best
+    return segments, dict(info, probes=probes)
+
+
+def _fit(envelope, sentences, noise_db, silence_duration, has_leading_silence):
+    target = len(sentences)
+    weights = expected_weights(sentences)
+    info = {"noise_db": noise_db, "silence_duration": silence_duration, "probes": 1,
+            "leading_silence": has_leading_silence}
+
+    segments = segment(envelope, noise_db, silence_duration, has_leading_silence)
+    if len(segments) == target:
+        return segments, dict(info, method="exact", count=target, cost=round(boundary_cost(segments, weights), 4))
+    requested = segments
+
+    # 1. Minimum silence duration: longer minimum -> fewer silences -> fewer segments
+    duration, count, probes = _bisect(
+        lambda d: len(segment(envelope, noise_db, d, has_leading_silence)),
+        *MIN_SILENCE_RANGE, target, increasing=False)
+    info["probes"] += probes
+    best = (abs(count - target), noise_db, duration)
+
+    # 2. Noise threshold at that duration: higher threshold -> more frames count as quiet
+    if count != target:
+        noise, count, probes = _bisect(
+            lambda db: len(segment(envelope, db, duration, has_leading_silence)),
+            *NOISE_DB_RANGE, target, increasing=True)
+        info["probes"] += probes
+        if abs(count - target) < best[0]:
+            best = (abs(count - target), noise, duration)
+
+    _, best_noise, best_duration = best
+    searched = segment(envelope, best_noise, best_duration, has_leading_silence)
+
+    # 3. Merge/split by expected relative sentence length, from the requested
+    #    setting; an exact search hit is kept only if it fits the lengths better
+    fitted = _merge_or_split(requested, weights, envelope)
+    fitted_cost = boundary_cost(fitted, weights) if fitted else float("inf")
+    if len(searched) == target and boundary_cost(searched, weights) <= fitted_cost:
+        info.update(noise_db=round(best_noise, 2), silence_duration=round(best_duration, 3))
+        return searched, dict(info, method="exact", count=target, cost=round(boundary_cost(searched, weights), 4))
+    method = "merged" if len(requested) > target else "split"
+    return fitted, dict(info, method=method, count=len(requested), cost=round(fitted_cost, 4))
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+NumPy silence detector for sentence-level SRT generation.
+
+The old path ran `ffmpeg -af silencedetect` and regex-scraped its stderr, then
+spawned ffprobe for the duration: two processes per file and a full decode
+for every parameter tried. Here the file is decoded once (one ffmpeg call,
+16-bit mono PCM on stdout: half the pipe traffic of float32, and MP3 output
+has no meaningful precision below that) and reduced to a frame-level dB
+envelope, fully vectorized; silence runs are found on the envelope. Duration
+comes from the decoded sample count.
+
+Two envelopes:
+  peak (default)  max |sample| per hop. silencedetect's own rule is "every
+                  sample below the threshold", so this reproduces its output
+                  (within one hop: <= 5 ms on audio/lr at the defaults).
+  rms             windowed RMS over --frame-ms. Ignores isolated clicks, so
+                  it suits noisy recordings better, but it reports somewhat
+                  longer silences than silencedetect for the same threshold.
+
+Envelopes are cached in memory and on disk (audio/.envelope-cache), keyed by
+the file's path, size and mtime plus the envelope parameters. Sweeping
+--noise-db / --silence-duration therefore never re-decodes.
+
+Usage (library):
+  detector = SilenceDetector()
+  silences, duration = detector.detect("audio/lr/LR-S04-dining-hall.mp3", 0.8, -40)
+  segments = silences_to_speech_segments(silences, duration)
+
+Usage (CLI, print silences):
+  python3 scripts/silence_detect.py audio/lr/LR-S04-dining-hall.mp3 --noise-db -40
+
+Environment:
+  ENVELOPE_CACHE_DIR  override on-disk envelope cache directory
+  ENVELOPE_CACHE=0    disable the on-disk cache
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "audio" / ".envelope-cache"
+DECODE_SAMPLE_RATE = 48000    # what our TTS audio is produced at; resampling would shift peaks
+DEFAULT_ENVELOPE = "peak"
+DEFAULT_FRAME_MS = 20.0       # RMS window (rms envelope only)
+DEFAULT_HOP_MS = 5.0          # envelope resolution (boundary precision)
+DB_FLOOR = -120.0             # digital silence maps here instead of -inf
+FULL_SCALE = 32768.0          # int16 full scale (0 dBFS)
+
+
+class Envelope:
+    """Frame-level dB envelope of one audio file."""
+
+    def __init__(self, db, hop_s, frame_s, duration):
+        self.db = db
+        self.hop_s = hop_s
+        self.frame_s = frame_s
+        self.duration = duration
+
+    def quiet_runs(self, noise_db, min_duration):
+        """(start_frame, end_frame) of every run of frames below noise_db lasting >= min_duration."""
+        quiet = np.concatenate(([False], self.db < noise_db, [False]))
+        edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+        starts, ends = edges[0::2], edges[1::2]
+        # Each frame accounts for one hop of time
+        keep = (ends - starts) * self.hop_s >= min_duration
+        return starts[keep], ends[keep]
+
+    def silences(self, noise_db, min_duration):
+        """Silence intervals as [{"start", "end"}] in seconds (same shape as run_silencedetect)."""
+        starts, ends = self.quiet_runs(noise_db, min_duration)
+        # Frame i is centred at i*hop + frame/2; a run covers half a hop either side of its centres
+        offset = self.frame_s / 2 - self.hop_s / 2
+        result = []
+        for a, b in zip(starts.tolist(), ends.tolist()):
+            start = max(0.0, a * self.hop_s + offset)
+            end = min(self.duration, b * self.hop_s + offset)
+            result.append({"start": round(start, 6), "end": round(end, 6)})
+        return result
+
+
+def decode_audio(audio_path, sample_rate=DECODE_SAMPLE_RATE):
+    """Decode any ffmpeg-readable file to an int16 mono array."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(audio_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        capture_output=True, check=True,
+    )
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def to_db(amplitude):
+    """int16-scale amplitude -> dBFS, floored at DB_FLOOR."""
+    return 20.0 * np.log10(np.maximum(amplitude / FULL_SCALE, 10 ** (DB_FLOOR / 20)))
+
+
+def peak_envelope(samples, sample_rate, hop_ms=DEFAULT_HOP_MS):
+    """Max |sample| in dBFS per non-overlapping hop. Returns (db, hop_s, frame_s)."""
+    hop = max(1, int(round(sample_rate * hop_ms / 1000)))
+    blocks = np.pad(samples, (0, (-len(samples)) % hop)).reshape(-1, hop)
+    # max/min instead of abs(): no int16 overflow at -32768 and no full-size temporary
+    peak = np.maximum(blocks.max(axis=1).astype(np.float64), -blocks.min(axis=1).astype(np.float64))
+    return to_db(peak).astype(np.float32), hop / sample_rate, hop / sample_rate
+
+
+def rms_envelope(samples, sample_rate, frame_ms=DEFAULT_FRAME_MS, hop_ms=DEFAULT_HOP_MS):
+    """Windowed RMS in dBFS, one value per hop (prefix sums: O(n) in the sample count)."""
+    frame = max(1, int(round(sample_rate * frame_ms / 1000)))
+    hop = max(1, int(round(sample_rate * hop_ms / 1000)))
+    if len(samples) < frame:
+        samples = np.pad(samples, (0, frame - len(samples)))
+    squares = np.concatenate(([0.0], np.cumsum(samples.astype(np.float64) ** 2)))
+    starts = np.arange(0, len(samples) - frame + 1, hop)
+    mean_square = (squares[starts + frame] - squares[starts]) / frame
+    return to_db(np.sqrt(mean_square)).astype(np.float32), hop / sample_rate, frame / sample_rate
+
+
+ENVELOPES = {
+    "peak": lambda samples, sr, frame_ms, hop_ms: peak_envelope(samples, sr, hop_ms),
+    "rms": rms_envelope,
+}
+
+
+class SilenceDetector:
+    """Decode-once silence detector with in-memory and on-disk envelope caches."""
+
+    def __init__(self, kind=DEFAULT_ENVELOPE, frame_ms=DEFAULT_FRAME_MS, hop_ms=DEFAULT_HOP_MS,
+                 sample_rate=DECODE_SAMPLE_RATE, cache_dir=None, disk_cache=None):
+        if kind not in ENVELOPES:
+            raise ValueError(f"Unknown envelope: {kind} (use {', '.join(ENVELOPES)})")
+        self.kind = kind
+        self.frame_ms = frame_ms
+        self.hop_ms = hop_ms
+        self.sample_rate = sample_rate
+        if cache_dir is None:
+            cache_dir = os.getenv("ENVELOPE_CACHE_DIR") or DEFAULT_CACHE_DIR
+        if disk_cache is None:
+            disk_cache = os.getenv("ENVELOPE_CACHE", "1") != "0"
+        self.cache_dir = Path(cache_dir)
+        self.disk_cache = disk_cache
+        self.decodes = 0
+        self._envelopes = {}
+        self._lock = threading.Lock()
+
+    def _key(self, audio_path):
+        st = Path(audio_path).stat()
+        payload = {
+            "path": str(Path(audio_path).resolve()),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sample_rate": self.sample_rate,
+            "kind": self.kind,
+            "frame_ms": self.frame_ms,
+            "hop_ms": self.hop_ms,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def envelope(self, audio_path):
+        """Envelope for audio_path: memory cache, then disk cache, then one decode."""
+        key = self._key(audio_path)
+        with self._lock:
+            cached = self._envelopes.get(key)
+        if cached is not None:
+            return cached
+
+        cache_path = self.cache_dir / f"{key}.npz"
+        env = None
+        if self.disk_cache and cache_path.exists():
+            try:
+                with np.load(cache_path) as data:
+                    env = Envelope(data["db"], float(data["hop_s"]), float(data["frame_s"]),
+                                   float(data["duration"]))
+            except (OSError, ValueError, KeyError):
+                env = None
+        if env is None:
+            samples = decode_audio(audio_path, self.sample_rate)
+            self.decodes += 1
+            db, hop_s, frame_s = ENVELOPES[self.kind](samples, self.sample_rate, self.frame_ms, self.hop_ms)
+            env = Envelope(db, hop_s, frame_s, len(samples) / self.sample_rate)
+            if self.disk_cache:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp.npz")
+                np.savez(tmp_path, db=env.db, hop_s=env.hop_s, frame_s=env.frame_s, duration=env.duration)
+                os.replace(tmp_path, cache_path)
+
+        with self._lock:
+            self._envelopes[key] = env
+        return env
+
+    def detect(self, audio_path, silence_duration=0.8, noise_db=-40):
+        """Return (silences, duration) for audio_path."""
+        env = self.envelope(audio_path)
+        return env.silences(noise_db, silence_duration), env.duration
+
+
+# ==================== FFMPEG REFERENCE ====================
+# The original implementation, kept as the fallback when NumPy is missing and
+# as the baseline for benchmark-silence-detect.py.
+
+def run_silencedetect(audio_path: str, silence_duration: float = 1.0, noise_dB: float = -30) -> list:
+    """Run ffmpeg silencedetect and return list of (silence_start, silence_end)."""
+    cmd = [
+        "ffmpeg", "-i", audio_path,
+        "-af", f"silencedetect=noise={noise_dB}dB:d={silence_duration}",
+        "-f", "null", "-",
+        "-nostats", "-loglevel", "info"
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    stderr = (result.stderr or "") + (result.stdout or "")
+
+    silences = []
+    for line in stderr.splitlines():
+        m = re.search(r"silence_start: ([\d.]+)", line)
+        if m:
+            silences.append({"start": float(m.group(1)), "end": None})
+            continue
+        m = re.search(r"silence_end: ([\d.]+)", line)
+        if m and silences and silences[-1]["end"] is None:
+            silences[-1]["end"] = float(m.group(1))
+
+    return [s for s in silences if s["end"] is not None]
+
+
+def get_audio_duration(audio_path: str) -> float:
+    """Get audio duration in seconds using ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", audio_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return float(result.stdout.strip()) if result.returncode == 0 else 0.0
+
+
+def silences_to_speech_segments(silences: list, total_duration: float, has_leading_silence: bool = True) -> list:
+    """
+    Convert silence periods to speech segments using midpoints of silence gaps.
+
+    Key idea: use the MIDPOINT of each silence gap as the boundary between
+    sentences. This avoids clipping the tail of the previous sentence or the
+    onset of the next sentence.
+
+    has_leading_silence: True if the audio starts with silence before sentence 1.
+                         False if sentence 1 starts right at the beginning.
+    """
+    if not silences:
+        return [{"start": 0.0, "end": total_duration}]
+
+    segments = []
+
+    if has_leading_silence and len(silences) >= 2:
+        # First silence is leading silence; skip it.
+        # Sentence 1 starts at midpoint of first silence gap.
+        # Sentence boundaries use midpoints of subsequent silences.
+        for i in range(len(silences) - 1):
+            mid_start = (silences[i]["start"] + silences[i]["end"]) / 2
+            mid_end = (silences[i + 1]["start"] + silences[i + 1]["end"]) / 2
+            if mid_end - mid_start > 0.1:
+                segments.append({"start": mid_start, "end": mid_end})
+        # Last sentence: from midpoint of last silence to end of file
+        mid_last = (silences[-1]["start"] + silences[-1]["end"]) / 2
+        if total_duration - mid_last > 0.1:
+            segments.append({"start": mid_last, "end": total_duration})
+    else:
+        # No leading silence: sentence 1 starts at 0
+        first_mid = (silences[0]["start"] + silences[0]["end"]) / 2
+        segments.append({"start": 0.0, "end": first_mid})
+        for i in range(len(silences) - 1):
+            mid_start = (silences[i]["start"] + silences[i]["end"]) / 2
+            mid_end = (silences[i + 1]["start"] + silences[i + 1]["end"]) / 2
+            if mid_end - mid_start > 0.1:
+                segments.append({"start": mid_start, "end": mid_end})
+        # Last sentence: from midpoint of last silence to end of file
+        mid_last = (silences[-1]["start"] + silences[-1]["end"]) / 2
+        if total_duration - mid_last > 0.1:
+            segments.append({"start": mid_last, "end": total_duration})
+
+    return segments
+
+
+def add_detector_args(parser):
+    """Add --envelope / --hop-ms / --frame-ms to an argparse parser."""
+    parser.add_argument("--envelope", choices=list(ENVELOPES), default=DEFAULT_ENVELOPE,
+                        help=f"Envelope type (default: {DEFAULT_ENVELOPE})")
+    parser.add_argument("--hop-ms", type=float, default=DEFAULT_HOP_MS,
+                        help=f"Envelope hop in milliseconds (default: {DEFAULT_HOP_MS:g})")
+    parser.add_argument("--frame-ms", type=float, default=DEFAULT_FRAME_MS,
+                        help=f"RMS window in milliseconds, rms envelope only (default: {DEFAULT_FRAME_MS:g})")
+    return parser
+
+
+def detector_from_args(args):
+    """SilenceDetector configured from add_detector_args() options (None without NumPy)."""
+    if not NUMPY_AVAILABLE:
+        return None
+    return SilenceDetector(kind=args.envelope, frame_ms=args.frame_ms, hop_ms=args.hop_ms)
+
+
+def detect_silences(audio_path, silence_duration=0.8, noise_db=-40, detector=None):
+    """(silences, duration) via the NumPy detector, or ffmpeg silencedetect without NumPy."""
+    if NUMPY_AVAILABLE:
+        detector = detector or SilenceDetector()
+        return detector.detect(audio_path, silence_duration, noise_db)
+    return (run_silencedetect(str(audio_path), silence_duration, noise_db),
+            get_audio_duration(str(audio_path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print silence intervals for an audio file")
+    parser.add_argument("audio", help="Path to audio file")
+    parser.add_argument("--silence-duration", type=float, default=0.8, help="Min silence duration in seconds")
+    parser.add_argument("--noise-db", type=float, default=-40, help="Noise threshold in dB")
+    add_detector_args(parser)
+    args = parser.parse_args()
+
+    silences, duration = detect_silences(args.audio, args.silence_duration, args.noise_db,
+                                         detector_from_args(args))
+    print(f"Duration: {duration:.3f}s, {len(silences)} silences")
+    for s in silences:
+        print(f"  {s['start']:9.3f} - {s['end']:9.3f}  ({s['end'] - s['start']:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
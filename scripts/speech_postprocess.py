@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Per-utterance clean-up of synthesized PCM: silence trim and loudness normalization.
+
+Inworld returns every utterance with its own leading and trailing silence,
+and every voice at its own level (Ashley sits a few LU above Craig), so the
+fixed pauses of a layout came out uneven and turns jumped in volume.
+SpeechPostProcessor.process() runs on each utterance's 16-bit PCM before it
+goes onto the Timeline, in NumPy and in-process (no ffmpeg pass):
+
+  trim        10 ms frames; everything before the first and after the last
+              frame above TRIM_THRESHOLD_DB is cut, keeping TRIM_KEEP_MS on
+              either side so soft onsets and word endings survive. An
+              utterance with no frame above the threshold is left alone.
+  loudness    ITU-R BS.1770 / EBU R128 integrated loudness: K-weighting,
+              400 ms blocks with 75% overlap, absolute gate at -70 LUFS,
+              relative gate at -10 LU. Each 100 ms step is transformed once
+              (one batched FFT per utterance) and its K-weighted energy read
+              off the spectrum through the filter's exact frequency response;
+              a block is the sum of four steps. The gain brings the utterance to
+              target_lufs, reduced if needed so the sample peak stays at or
+              below PEAK_CEILING_DB (no limiter, so no distortion).
+
+Utterances shorter than one block are measured as a single block. The
+result is bytes again, so the Timeline's sample counts and the timing
+sidecars describe the processed audio.
+
+The TTS cache still holds the raw responses, so changing the target or the
+trim settings costs a re-encode, not a re-synthesis. signature() is part of
+every build hash (audio_build.common_hash).
+
+Usage:
+  POSTPROCESS = SpeechPostProcessor(SAMPLE_RATE)
+  timeline.add_speech(POSTPROCESS.process(pcm), text)
+  print(POSTPROCESS.summary())
+
+Environment:
+  AUDIO_TARGET_LUFS   integrated loudness target per utterance (default -18)
+  AUDIO_POSTPROCESS   0 to skip trimming and normalization (default on)
+
+Requires: numpy
+"""
+
+import math
+import os
+import time
+from functools import lru_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ==================== CONFIG ====================
+DEFAULT_TARGET_LUFS = -18.0      # speech for web/mobile playback (EBU R128 broadcast is -23)
+TRIM_THRESHOLD_DB = -45.0        # frame RMS (dBFS) that counts as sound
+TRIM_FRAME_MS = 10
+TRIM_KEEP_MS = 40                # kept on each side of the first/last sounding frame
+PEAK_CEILING_DB = -1.0           # sample peak after normalization, dBFS
+BLOCK_SECONDS = 0.4              # BS.1770 gating block
+BLOCK_STEP_SECONDS = 0.1         # 75% overlap
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+# K-weighting (BS.1770-4): high shelf +4 dB above ~1.7 kHz, then a ~38 Hz high-pass.
+# Coefficients are derived for the actual sample rate, as in pyloudnorm.
+SHELF_GAIN_DB, SHELF_FC, SHELF_Q = 3.999843853973347, 1681.974450955533, 0.7071752369554196
+HIGHPASS_FC, HIGHPASS_Q = 38.13547087602444, 0.5003270373238773
+
+
+def default_target_lufs():
+    """AUDIO_TARGET_LUFS, else DEFAULT_TARGET_LUFS."""
+    return float(os.getenv("AUDIO_TARGET_LUFS", DEFAULT_TARGET_LUFS))
+
+
+def postprocess_enabled():
+    """AUDIO_POSTPROCESS (default on); off without numpy."""
+    return NUMPY_AVAILABLE and os.getenv("AUDIO_POSTPROCESS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _biquads(sample_rate):
+    """[(b, a)] of the two K-weighting stages at sample_rate."""
+    k = math.tan(math.pi * SHELF_FC / sample_rate)
+    vh = 10 ** (SHELF_GAIN_DB / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / SHELF_Q + k * k
+    shelf = ([(vh + vb * k / SHELF_Q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / SHELF_Q + k * k) / a0],
+             [1.0, 2 * (k * k - 1) / a0, (1 - k / SHELF_Q + k * k) / a0])
+    k = math.tan(math.pi * HIGHPASS_FC / sample_rate)
+    a0 = 1 + k / HIGHPASS_Q + k * k
+    highpass = ([1.0, -2.0, 1.0], [1.0, 2 * (k * k - 1) / a0, (1 - k / HIGHPASS_Q + k * k) / a0])
+    return [shelf, highpass]
+
+
+@lru_cache(maxsize=32)
+def k_weighted_energy_weights(sample_rate, n):
+    """Weights w such that |rfft(x)|^2 @ w is the energy of an n-sample x after K-weighting.
+
+    Parseval's theorem over the filter's exact frequency response |H|^2; the
+    non-DC/Nyquist bins count twice for the half spectrum.
+    """
+    z = np.exp(-2j * np.pi * np.fft.rfftfreq(n))          # e^{-jw} at each bin
+    response = np.ones_like(z)
+    for b, a in _biquads(sample_rate):
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    weights = np.abs(response) ** 2 * 2 / n
+    weights[0] /= 2
+    if n % 2 == 0:
+        weights[-1] /= 2
+    return weights
+
+
+def integrated_loudness(samples, sample_rate):
+    """BS.1770 integrated loudness (LUFS) of mono float samples in [-1, 1]; -inf for silence."""
+    if not len(samples):
+        return -math.inf
+    step = int(BLOCK_STEP_SECONDS * sample_rate)
+    steps_per_block = round(BLOCK_SECONDS / BLOCK_STEP_SECONDS)
+    n_steps = len(samples) // step
+    if n_steps < steps_per_block:
+        spectrum = np.fft.rfft(samples)
+        powers = np.array([(spectrum.real ** 2 + spectrum.imag ** 2)
+                           @ k_weighted_energy_weights(sample_rate, len(samples)) / len(samples)])
+    else:
+        spectra = np.fft.rfft(samples[:n_steps * step].reshape(n_steps, step), axis=1)
+        energies = (spectra.real ** 2 + spectra.imag ** 2) @ k_weighted_energy_weights(sample_rate, step)
+        powers = np.convolve(energies, np.ones(steps_per_block), "valid") / (step * steps_per_block)
+
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10 * np.log10(powers)
+    gated = powers[loudness > ABSOLUTE_GATE_LUFS]
+    if not len(gated):
+        return -math.inf
+    relative_gate = -0.691 + 10 * math.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = powers[(loudness > ABSOLUTE_GATE_LUFS) & (loudness > relative_gate)]
+    return -0.691 + 10 * math.log10(gated.mean())
+
+
+def trim_bounds(samples, sample_rate):
+    """(start, end) sample range of `samples` without its leading/trailing silence."""
+    frame = sample_rate * TRIM_FRAME_MS // 1000
+    frames = len(samples) // frame
+    if not frames:
+        return 0, len(samples)
+    power = np.mean(samples[:frames * frame].reshape(frames, frame) ** 2, axis=1)
+    loud = np.flatnonzero(power > 10 ** (TRIM_THRESHOLD_DB / 10))
+    if not len(loud):
+        return 0, len(samples)
+    keep = sample_rate * TRIM_KEEP_MS // 1000
+    return max(0, loud[0] * frame - keep), min(len(samples), (loud[-1] + 1) * frame + keep)
+
+
+class SpeechPostProcessor:
+    """Trim + loudness normalization for 16-bit mono utterances at one sample rate."""
+
+    def __init__(self, sample_rate, target_lufs=None, enabled=None):
+        self.sample_rate = sample_rate
+        self.target_lufs = default_target_lufs() if target_lufs is None else target_lufs
+        self.enabled = postprocess_enabled() if enabled is None else enabled
+        if self.enabled and not NUMPY_AVAILABLE:
+            raise RuntimeError("speech post-processing needs numpy (pip install numpy)")
+        self.utterances = 0
+        self.trimmed_seconds = 0.0
+        self.gains_db = []
+        self.seconds = 0.0
+
+    def signature(self):
+        """Settings for build-manifest hashing; None when disabled (hashes stay as they were)."""
+        if not self.enabled:
+            return None
+        return ["trim", TRIM_THRESHOLD_DB, TRIM_FRAME_MS, TRIM_KEEP_MS,
+                "loudness", self.target_lufs, PEAK_CEILING_DB]
+
+    def process(self, pcm):
+        """Trimmed and loudness-normalized copy of one utterance's PCM (bytes in, bytes out)."""
+        if not self.enabled:
+            return pcm
+        started = time.perf_counter()
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64) / 32768
+        start, end = trim_bounds(samples, self.sample_rate)
+        samples = samples[start:end]
+
+        loudness = integrated_loudness(samples, self.sample_rate)
+        gain_db = 0.0
+        if math.isfinite(loudness):
+            peak = np.abs(samples).max()
+            gain_db = min(self.target_lufs - loudness, PEAK_CEILING_DB - 20 * math.log10(peak))
+            samples = samples * 10 ** (gain_db / 20)
+        out = np.clip(np.round(samples * 32768), -32768, 32767).astype("<i2").tobytes()
+
+        self.utterances += 1
+        self.trimmed_seconds += (len(pcm) // 2 - (end - start)) / self.sample_rate
+        self.gains_db.append(gain_db)
+        self.seconds += time.perf_counter() - started
+        return out
+
+    def stats(self):
+        return {"utterances": self.utterances, "trimmed_seconds": self.trimmed_seconds,
+                "gains_db": list(self.gains_db), "seconds": self.seconds}
+
+    def record(self, stats):
+        """Fold another processor's stats() (e.g. from an encoder worker) into this one."""
+        self.utterances += stats["utterances"]
+        self.trimmed_seconds += stats["trimmed_seconds"]
+        self.gains_db.extend(stats["gains_db"])
+        self.seconds += stats["seconds"]
+
+    def summary(self):
+        if not self.enabled:
+            return "Post-processing: off" + ("" if NUMPY_AVAILABLE else " (numpy not installed)")
+        if not self.utterances:
+            return f"Post-processing: trim + {self.target_lufs:g} LUFS, no utterances"
+        return (f"Post-processing: {self.utterances} utterances to {self.target_lufs:g} LUFS, "
+                f"gain {min(self.gains_db):+.1f}..{max(self.gains_db):+.1f} dB, "
+                f"{self.trimmed_seconds:.1f}s of silence trimmed, {self.seconds:.2f}s")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Sentence-level synthesis planning: deduplicate utterances before any API call.
+
+The task data repeats the same (text, voice) pairs across dialogues and sets
+("Do you have the receipt?"), sometimes differing only in curly vs.
+straight apostrophes or spacing. A SynthesisPlan collects every turn of
+every group first and keys it on (normalized text, voice):
+
+  normalize_text()  NFKC (… -> ..., non-breaking spaces), typographic
+                    quotes -> ASCII, runs of whitespace -> one space.
+                    Case and punctuation are kept: "Thanks." and "Thanks!"
+                    are delivered differently, so they stay two utterances.
+
+SynthesisEngine.map_groups() builds a plan for every batch, synthesizes each
+unique utterance once and fans the PCM out to every group that uses it;
+engine.summary() reports the characters that never reached the API.
+
+Run as a script, this plans every job of every task type (audio_build.py)
+at once and reports what a full rebuild would send:
+
+  python3 scripts/synthesis_plan.py                  # totals per task + overall
+  python3 scripts/synthesis_plan.py --show 20        # most reused utterances
+  python3 scripts/synthesis_plan.py --near           # wording variants that only differ in case/punctuation
+  python3 scripts/synthesis_plan.py --warm           # synthesize each unique utterance once into the
+                                                     # TTS cache; every build then runs on cache hits
+
+Environment:
+  INWORLD_API_KEY   only needed for --warm
+"""
+
+import argparse
+import re
+import sys
+import unicodedata
+
+# ==================== CONFIG ====================
+TYPOGRAPHIC = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+WHITESPACE_RE = re.compile(r"\s+")
+LOOSE_RE = re.compile(r"[^a-z0-9' ]+")
+
+
+def normalize_text(text):
+    """Text as it is sent to the API: typographic variants folded, whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text).translate(TYPOGRAPHIC)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def loose_key(text):
+    """Case- and punctuation-blind form, for spotting wording variants (never used for dedup)."""
+    return WHITESPACE_RE.sub(" ", LOOSE_RE.sub(" ", normalize_text(text).lower())).strip()
+
+
+class SynthesisPlan:
+    """Every utterance of a set of groups, deduplicated on (normalized text, voice)."""
+
+    def __init__(self):
+        self.groups = {}       # group_id -> [key] in sentence order
+        self.unique = {}       # key -> (normalized text, voice_id), in first-use order
+        self.uses = {}         # key -> [group_id] (once per use)
+        self.utterances = 0
+        self.requested_chars = 0
+
+    @staticmethod
+    def key(text, voice_id):
+        return (normalize_text(text), voice_id)
+
+    def add(self, group_id, sentences):
+        """Add one group's (text, voice_id) list."""
+        keys = []
+        for text, voice_id in sentences:
+            key = self.key(text, voice_id)
+            self.unique.setdefault(key, key)
+            self.uses.setdefault(key, []).append(group_id)
+            self.utterances += 1
+            self.requested_chars += len(text)
+            keys.append(key)
+        self.groups[group_id] = keys
+
+    @property
+    def unique_chars(self):
+        return sum(len(text) for text, _ in self.unique)
+
+    @property
+    def saved_chars(self):
+        return self.requested_chars - self.unique_chars
+
+    def duplicates(self):
+        """[(text, voice_id, group ids)] for utterances used more than once, most used first."""
+        reused = [(text, voice_id, groups) for (text, voice_id), groups in self.uses.items() if len(groups) > 1]
+        return sorted(reused, key=lambda d: (-len(d[2]), d[0]))
+
+    def near_duplicates(self):
+        """Unique utterances of one voice that differ only in case/punctuation: [[text, ...]]."""
+        variants = {}
+        for text, voice_id in self.unique:
+            variants.setdefault((loose_key(text), voice_id), []).append(text)
+        return [texts for texts in variants.values() if len(texts) > 1]
+
+    def summary(self):
+        saved = 100.0 * self.saved_chars / self.requested_chars if self.requested_chars else 0.0
+        return (f"Plan: {self.utterances} utterances in {len(self.groups)} groups -> {len(self.unique)} unique; "
+                f"{self.requested_chars:,} characters -> {self.unique_chars:,} "
+                f"({self.saved_chars:,} saved by dedup, {saved:.1f}%)")
+
+
+def plan_jobs(tasks=None):
+    """One SynthesisPlan across every job of the given task types (default: all).
+
+    Returns (plan, {task: SynthesisPlan of that task alone}). Group ids are job ids.
+    """
+    import audio_build   # audio_build -> tts_engine -> this module
+
+    plan = SynthesisPlan()
+    per_task = {}
+    for job in audio_build.load_jobs(tasks):
+        plan.add(job.id, job.sentences())
+        per_task.setdefault(job.task, SynthesisPlan()).add(job.id, job.sentences())
+    return plan, per_task
+
+
+def warm_cache(plan):
+    """Synthesize every unique utterance once into the shared TTS cache."""
+    from audio_build import MODEL_ID, SAMPLE_RATE
+    from inworld_client import InworldClient, load_api_key
+    from tts_cache import TTSCache
+    from tts_engine import SynthesisEngine
+
+    api_key = load_api_key()
+    if not api_key:
+        print("Error: Set INWORLD_API_KEY environment variable or add it to .env", file=sys.stderr)
+        sys.exit(1)
+    print(f"\nWarming {len(plan.unique)} utterances ({MODEL_ID}, {SAMPLE_RATE} Hz)...")
+    engine = SynthesisEngine(InworldClient(api_key, MODEL_ID, SAMPLE_RATE), cache=TTSCache())
+    for key, _, error in engine.map_groups({key: [key] for key in plan.unique}, ordered=False):
+        if error is not None:
+            print(f"  Error synthesizing '{key[0][:50]}' ({key[1]}): {error}", file=sys.stderr)
+    print(engine.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan (and optionally pre-synthesize) every task's utterances")
+    parser.add_argument("--tasks", nargs="+", help="Only these task types (default: all, see audio_build.py)")
+    parser.add_argument("--show", type=int, default=0, metavar="N", help="List the N most reused utterances")
+    parser.add_argument("--near", action="store_true", help="List wording variants differing only in case/punctuation")
+    parser.add_argument("--warm", action="store_true", help="Synthesize each unique utterance once into the TTS cache")
+    args = parser.parse_args()
+
+    plan, per_task = plan_jobs(args.tasks)
+    print(f"{'task':<16} {'jobs':>6} {'utter.':>7} {'unique':>7} {'chars':>8} {'saved':>7}")
+    for task, own in per_task.items():
+        print(f"{task:<16} {len(own.groups):>6} {own.utterances:>7} {len(own.unique):>7} "
+              f"{own.requested_chars:>8,} {own.saved_chars:>7,}")
+    own_total = sum(own.unique_chars for own in per_task.values())
+    print("\nAll tasks:")
+    print(f"  {plan.summary()}")
+    print(f"  {own_total - plan.unique_chars:,} of those characters are shared between tasks "
+          f"(each task deduplicated alone would send {own_total:,})")
+    if args.show:
+        print("\n  Most reused:")
+        for text, voice_id, groups in plan.duplicates()[:args.show]:
+            print(f"  {len(groups):>3}x {voice_id:<10} {text[:60]}")
+    if args.near:
+        variants = plan.near_duplicates()
+        print(f"\n  {len(variants)} wording variants (same voice; unify the text to synthesize once):")
+        for texts in variants:
+            print("    " + "  |  ".join(texts))
+
+    if args.warm:
+        warm_cache(plan)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for Inworld TTS responses.
+
+Every generate-*-audio script synthesizes sentence by sentence. Identical
+requests (same text, voice, model, sample rate and audio config) always return
+the same PCM, so we keep the decoded LINEAR16 bytes on disk and only call the
+API for text we have not synthesized before. Lines repeated across sets
+("Do you have the receipt?") are billed once; a one-word edit re-synthesizes
+one sentence instead of the whole set.
+
+Layout: audio/.tts-cache/<key[:2]>/<key>.pcm  (key = SHA-256 of the request)
+Eviction: least-recently-used (file mtime is bumped on every hit) once the
+cache grows past TTS_CACHE_MAX_MB (default 2048 MB).
+
+Usage:
+  python3 scripts/tts_cache.py            # show cache size and entry count
+  python3 scripts/tts_cache.py --clear    # delete all cached PCM
+
+Environment:
+  TTS_CACHE_DIR     override cache directory
+  TTS_CACHE_MAX_MB  size bound before LRU eviction kicks in
+  TTS_CACHE=0       disable the cache (always call the API)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# ==================== CONFIG ====================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "audio" / ".tts-cache"
+DEFAULT_MAX_MB = 2048
+CACHE_SUFFIX = ".pcm"
+
+
+def make_key(text, voice_id, model_id, sample_rate, audio_config=None):
+    """Return the cache key (hex SHA-256) for one synthesis request."""
+    payload = {
+        "text": text,
+        "voice_id": voice_id,
+        "model_id": model_id,
+        "sample_rate": sample_rate,
+        "audio_config": audio_config or {},
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """On-disk PCM cache with size-bounded LRU eviction and hit/miss stats."""
+
+    def __init__(self, cache_dir=None, max_bytes=None, enabled=None):
+        if cache_dir is None:
+            cache_dir = os.getenv("TTS_CACHE_DIR") or DEFAULT_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("TTS_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        if enabled is None:
+            enabled = os.getenv("TTS_CACHE", "1") != "0"
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None  # computed lazily on first write
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*/*{CACHE_SUFFIX}"))
+
+    def get(self, key):
+        """Return cached PCM bytes for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += len(data)
+        return data
+
+    def put(self, key, pcm):
+        """Store PCM bytes under key (atomic rename), then evict if over the bound."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(pcm)
+        existed = path.exists()
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._entries())
+            elif not existed:
+                self._total_bytes += len(pcm)
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            for p in self._entries():
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, p in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+            self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            for p in self._entries():
+                p.unlink()
+            self._total_bytes = 0
+
+    def size_bytes(self):
+        """Current on-disk size of the cache."""
+        return sum(p.stat().st_size for p in self._entries())
+
+    def summary(self):
+        """One-line hit/miss report for the end of a generator run."""
+        lookups = self.hits + self.misses
+        rate = (100.0 * self.hits / lookups) if lookups else 0.0
+        return (f"TTS cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+                f"{self.writes} new, {self.evictions} evicted, "
+                f"{self.bytes_served / (1024 * 1024):.1f} MB served from {self.cache_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared TTS PCM cache")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached entries")
+    args = parser.parse_args()
+
+    cache = TTSCache()
+    if args.clear:
+        cache.clear()
+        print(f"Cleared {cache.cache_dir}")
+        return
+    entries = cache._entries()
+    size_mb = cache.size_bytes() / (1024 * 1024)
+    print(f"{cache.cache_dir}: {len(entries)} entries, {size_mb:.1f} MB "
+          f"(limit {cache.max_bytes / (1024 * 1024):.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
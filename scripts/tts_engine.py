@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Concurrent TTS synthesis engine shared by the generate-*-audio scripts.
+
+Sentences are sent to the API from a bounded thread pool instead of one after
+another with fixed time.sleep() throttling. Request pacing comes from a token
+bucket (requests per second) that halves its rate on 429/5xx responses and
+creeps back up on success (AIMD), so a full rebuild runs at whatever rate the
+API actually sustains. Results are reassembled in sentence order per question.
+Each batch is planned first (synthesis_plan.py): utterances are deduplicated on
+(normalized text, voice), each unique one is sent once and its PCM is fanned
+out to every question that uses it. HTTP details and retries live in
+inworld_client.py.
+
+Usage (inside a generator):
+  engine = SynthesisEngine(InworldClient(api_key, MODEL_ID, SAMPLE_RATE), cache=TTSCache())
+  for question_id, pcm_chunks, error in engine.map_groups({"R01-01": [(text, voice), ...], ...}):
+      ...
+
+Environment:
+  TTS_MAX_WORKERS   concurrent requests in flight (default 8)
+  TTS_RATE_LIMIT    requests per second (default 5)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from synthesis_plan import SynthesisPlan, normalize_text
+from tts_cache import make_key
+
+# ==================== CONFIG ====================
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RATE_LIMIT = 5.0      # requests per second
+MIN_RATE = 0.2                # never throttle below one request per 5 seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts to server pushback."""
+
+    def __init__(self, rate, burst=None):
+        self.target_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until one request may be sent."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self):
+        """Multiplicative decrease after a 429/5xx."""
+        with self._lock:
+            self._refill()
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def speed_up(self):
+        """Additive increase back toward the configured rate after a success."""
+        with self._lock:
+            if self.rate < self.target_rate:
+                self._refill()
+                self.rate = min(self.target_rate, self.rate + self.target_rate / 10)
+
+
+class SynthesisEngine:
+    """Bounded-concurrency, rate-limited, cached front end to an InworldClient.
+
+    The client does the HTTP work and retries; the engine owns the thread pool,
+    the token bucket (handed to the client so every attempt is paced) and the
+    PCM cache, so cache hits never consume a rate-limit token.
+    """
+
+    def __init__(self, client, cache=None, max_workers=None, rate=None):
+        self.client = client
+        self.cache = cache
+        self.max_workers = max_workers or int(os.getenv("TTS_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        self.limiter = TokenBucket(rate or float(os.getenv("TTS_RATE_LIMIT", DEFAULT_RATE_LIMIT)))
+        self.client.rate_limiter = self.limiter
+        self.utterances = 0
+        self.unique = 0
+        self.requested_chars = 0
+        self.unique_chars = 0
+        self.api_chars = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def key(self, text, voice_id):
+        """Cache key for one sentence under the client's model/audio settings."""
+        return make_key(normalize_text(text), voice_id, self.client.model_id, self.client.sample_rate,
+                        self.client.audio_config)
+
+    def synthesize(self, text, voice_id):
+        """Synthesize one sentence: cache lookup, then a paced, retried API request."""
+        text = normalize_text(text)
+        key = self.key(text, voice_id)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        pcm = self.client.synthesize(text, voice_id)
+        with self._lock:
+            self.api_chars += len(text)
+        if self.cache is not None:
+            self.cache.put(key, pcm)
+        return pcm
+
+    def map_groups(self, groups, ordered=True):
+        """Synthesize every sentence of every group concurrently.
+
+        groups: dict of group_id -> list of (text, voice_id).
+        Yields (group_id, pcm_chunks, error) in the original group order as each
+        group completes (ordered=False: as soon as any group completes);
+        pcm_chunks is in sentence order (None if error is set).
+        Each unique (normalized text, voice) is synthesized once per batch.
+        """
+        plan = SynthesisPlan()
+        for group_id, sentences in groups.items():
+            plan.add(group_id, sentences)
+        with self._lock:
+            self.utterances += plan.utterances
+            self.unique += len(plan.unique)
+            self.requested_chars += plan.requested_chars
+            self.unique_chars += plan.unique_chars
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {key: pool.submit(self.synthesize, text, voice_id)
+                       for key, (text, voice_id) in plan.unique.items()}
+            pending = dict(plan.groups)
+            remaining = {key: len(uses) for key, uses in plan.uses.items()}
+            while pending:
+                if ordered:
+                    ready = [next(iter(pending))]
+                else:
+                    ready = [group_id for group_id, keys in pending.items()
+                             if all(futures[key].done() for key in keys)]
+                    if not ready:
+                        wait({futures[key] for keys in pending.values() for key in keys if not futures[key].done()},
+                             return_when=FIRST_COMPLETED)
+                        continue
+                for group_id in ready:
+                    keys = pending.pop(group_id)
+                    try:
+                        result = [futures[key].result() for key in keys], None
+                    except Exception as e:
+                        result = None, e
+                    for key in keys:
+                        # Drop each utterance's PCM after its last group, so a batch never holds it all
+                        remaining[key] -= 1
+                        if not remaining[key]:
+                            del futures[key]
+                    yield (group_id, *result)
+
+    def synthesize_all(self, sentences):
+        """Synthesize a flat list of (text, voice_id); returns PCM list in order or raises."""
+        for _, pcm_chunks, error in self.map_groups({0: sentences}):
+            if error is not None:
+                raise error
+            return pcm_chunks
+        return []
+
+    def dedup_summary(self):
+        """API characters actually sent vs. requested by the generator."""
+        saved_dedup = self.requested_chars - self.unique_chars
+        saved_cache = self.unique_chars - self.api_chars
+        return (f"Dedup: {self.utterances} utterances -> {self.unique} unique; {self.requested_chars:,} characters "
+                f"requested, {self.api_chars:,} sent to the API ({saved_dedup:,} saved by dedup, "
+                f"{saved_cache:,} by cache)")
+
+    def summary(self):
+        """Concurrency, HTTP and cache report for the end of a run."""
+        elapsed = time.monotonic() - self._started
+        lines = [f"Synthesis: {self.max_workers} workers @ {self.limiter.target_rate:g} req/s "
+                 f"(now {self.limiter.rate:.2f}), {elapsed:.1f}s elapsed",
+                 self.client.stats_summary(),
+                 self.dedup_summary()]
+        if self.cache is not None:
+            lines.append(self.cache.summary())
+        return "\n".join(lines)
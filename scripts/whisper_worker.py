@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Long-lived Whisper transcription: load the model once, transcribe many files.
+
+On CPU, whisper.load_model() costs more than transcribing a one-minute clip,
+and generate-srt-from-audio.py used to pay it for every file. WhisperWorker
+loads the model lazily on first use and keeps it for every later file; each
+file is decoded once (whisper.load_audio) and that array is both transcribed
+and used for the duration / realtime-factor report.
+
+Two transcription modes:
+  full (default)  model.transcribe() on the whole file, Whisper's own
+                  segmentation (what generate-srt-from-audio.py always did)
+  vad             speech spans found on a peak envelope of the same array
+                  (silence_detect), each span padded, turned into one
+                  30-second mel window and decoded in batches of --batch
+                  with whisper.decode(). One segment per span: for our
+                  sentence-per-pause audio that is one segment per sentence,
+                  and batching keeps the CPU busy across short sentences.
+                  Spans longer than one window fall back to transcribe().
+
+Serve mode keeps the worker behind a Unix socket so other scripts (or
+generate-srt-from-audio.py --socket) can queue files without loading
+the model themselves. Requests are JSON lines, handled one at a time:
+  -> {"audio": "audio/lr/LR-S01-bookstore-tour.mp3", "output": null, "vad": false}
+  <- {"ok": true, "srt": "...", "segments": 20, "duration": 84.3, "seconds": 9.1, "rtf": 0.108}
+
+Usage:
+  python3 scripts/whisper_worker.py "audio/**/*.mp3" --vad
+  python3 scripts/whisper_worker.py --serve                # then, elsewhere:
+  python3 scripts/generate-srt-from-audio.py audio/lr/*.mp3 --socket
+
+Environment:
+  WHISPER_MODEL    default model (default: base.en)
+  WHISPER_SOCKET   socket path for --serve / --socket (default: /tmp/whisper-worker.sock)
+
+Requires: pip install openai-whisper numpy; ffmpeg
+"""
+
+import argparse
+import glob
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+
+try:
+    import whisper
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+from audio_timing import srt_text
+from silence_detect import Envelope, peak_envelope
+
+# ==================== CONFIG ====================
+DEFAULT_MODEL = os.getenv("WHISPER_MODEL", "base.en")
+DEFAULT_SOCKET = os.getenv("WHISPER_SOCKET", "/tmp/whisper-worker.sock")
+WHISPER_SAMPLE_RATE = 16000   # whisper.audio.SAMPLE_RATE
+WINDOW_SECONDS = 30.0         # one mel window (whisper.audio.CHUNK_LENGTH)
+DEFAULT_BATCH = 8             # mel windows per whisper.decode() call
+VAD_NOISE_DB = -40.0
+VAD_MIN_SILENCE = 0.5         # seconds; shorter than our sentence pauses
+VAD_PAD = 0.2                 # seconds of context kept either side of a span
+VAD_HOP_MS = 10.0
+
+
+def speech_spans(audio, noise_db=VAD_NOISE_DB, min_silence=VAD_MIN_SILENCE, pad=VAD_PAD):
+    """(start, end) seconds of every non-silent stretch of a 16 kHz float32 array."""
+    samples = (audio.clip(-1.0, 1.0) * 32767).astype("int16")
+    db, hop_s, frame_s = peak_envelope(samples, WHISPER_SAMPLE_RATE, VAD_HOP_MS)
+    duration = len(audio) / WHISPER_SAMPLE_RATE
+    silences = Envelope(db, hop_s, frame_s, duration).silences(noise_db, min_silence)
+    spans = []
+    cursor = 0.0
+    for silence in silences + [{"start": duration, "end": duration}]:
+        if silence["start"] - cursor > hop_s:
+            spans.append((max(0.0, cursor - pad), min(duration, silence["start"] + pad)))
+        cursor = silence["end"]
+    return spans
+
+
+class WhisperWorker:
+    """One loaded Whisper model, reused for every file."""
+
+    def __init__(self, model_name=DEFAULT_MODEL, language="en", device="cpu", batch_size=DEFAULT_BATCH):
+        if not WHISPER_AVAILABLE:
+            raise RuntimeError("Whisper not installed. Run: pip install openai-whisper")
+        self.model_name = model_name
+        self.language = language
+        self.device = device
+        self.batch_size = batch_size
+        self.load_seconds = 0.0
+        self.files = 0
+        self.audio_seconds = 0.0
+        self.busy_seconds = 0.0
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            print(f"Loading model '{self.model_name}' ({self.device})...")
+            started = time.perf_counter()
+            self._model = whisper.load_model(self.model_name, device=self.device)
+            self.load_seconds = time.perf_counter() - started
+            print(f"  loaded in {self.load_seconds:.1f}s")
+        return self._model
+
+    def _transcribe_full(self, audio, offset=0.0):
+        result = self.model.transcribe(audio, language=self.language, word_timestamps=False,
+                                       verbose=None, fp16=self.device != "cpu")
+        return [{"start": seg["start"] + offset, "end": seg["end"] + offset, "text": seg["text"].strip()}
+                for seg in result.get("segments", [])]
+
+    def _decode_batch(self, windows):
+        import torch
+
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(window), n_mels=self.model.dims.n_mels)
+            for window in windows
+        ]).to(self.model.device)
+        options = whisper.DecodingOptions(language=self.language, without_timestamps=True,
+                                          fp16=self.device != "cpu")
+        return [r.text.strip() for r in whisper.decode(self.model, mels, options)]
+
+    def _transcribe_vad(self, audio):
+        segments = []
+        pending = []
+        for start, end in speech_spans(audio):
+            window = audio[int(start * WHISPER_SAMPLE_RATE):int(end * WHISPER_SAMPLE_RATE)]
+            if end - start > WINDOW_SECONDS:
+                segments.extend(self._transcribe_full(window, offset=start))
+                continue
+            pending.append((start, end, window))
+        for i in range(0, len(pending), self.batch_size):
+            batch = pending[i:i + self.batch_size]
+            for (start, end, _), text in zip(batch, self._decode_batch([w for _, _, w in batch])):
+                segments.append({"start": start, "end": end, "text": text})
+        return sorted((s for s in segments if s["text"]), key=lambda s: s["start"])
+
+    def transcribe(self, audio_path, vad=False):
+        """Return (segments, stats) for one file; segments are [{"start", "end", "text"}]."""
+        self.model  # load outside the timed region
+        started = time.perf_counter()
+        audio = whisper.load_audio(str(audio_path))
+        segments = self._transcribe_vad(audio) if vad else self._transcribe_full(audio)
+        elapsed = time.perf_counter() - started
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        self.files += 1
+        self.audio_seconds += duration
+        self.busy_seconds += elapsed
+        return segments, {"duration": round(duration, 2), "seconds": round(elapsed, 2),
+                          "rtf": round(elapsed / duration, 3) if duration else None}
+
+    def transcribe_to_srt(self, audio_path, output_path=None, vad=False):
+        """Transcribe and write the SRT (default: next to the audio). Returns a result dict."""
+        audio_path = Path(audio_path)
+        output_path = Path(output_path) if output_path else audio_path.with_suffix(".srt")
+        segments, stats = self.transcribe(audio_path, vad=vad)
+        if segments:
+            output_path.write_text(srt_text((seg["start"], seg["end"], seg["text"]) for seg in segments),
+                                   encoding="utf-8")
+        return {"ok": bool(segments), "audio": str(audio_path), "srt": str(output_path),
+                "segments": len(segments), **stats,
+                **({} if segments else {"error": "No segments detected. Check audio quality."})}
+
+    def summary(self):
+        if not self.files:
+            return "No files transcribed"
+        rtf = self.busy_seconds / self.audio_seconds if self.audio_seconds else 0.0
+        return (f"{self.files} files, {self.audio_seconds / 60:.1f} min of audio in {self.busy_seconds:.1f}s "
+                f"(RTF {rtf:.3f}, {1 / rtf if rtf else 0:.1f}x realtime; model load {self.load_seconds:.1f}s, once)")
+
+
+def report(result):
+    """One progress line per file."""
+    name = Path(result["audio"]).name
+    if not result["ok"]:
+        print(f"  {name}: {result['error']}", file=sys.stderr)
+        return
+    print(f"  {name}: {result['segments']} segments, {result['duration']:.1f}s audio in "
+          f"{result['seconds']:.1f}s (RTF {result['rtf']:.3f}) -> {result['srt']}")
+
+
+def expand(patterns):
+    """CLI paths/globs -> existing files, in order, without duplicates."""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for match in matches:
+            if match not in files:
+                files.append(match)
+    return files
+
+
+# ==================== SOCKET SERVICE ====================
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = {}
+            try:
+                request = json.loads(line)
+                result = self.server.worker.transcribe_to_srt(request["audio"], request.get("output"),
+                                                              vad=request.get("vad", False))
+            except Exception as e:  # report to the client, keep serving
+                result = {"ok": False, "audio": str(request.get("audio", "?")),
+                          "error": f"{type(e).__name__}: {e}"}
+            report(result)
+            self.wfile.write((json.dumps(result) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def serve(worker, socket_path=DEFAULT_SOCKET):
+    """Serve transcription requests on a Unix socket until interrupted (one request at a time)."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    worker.model  # load before accepting requests
+    with socketserver.UnixStreamServer(socket_path, _Handler) as server:
+        server.worker = worker
+        print(f"Serving on {socket_path} (Ctrl-C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n{worker.summary()}")
+        finally:
+            os.unlink(socket_path)
+
+
+def submit(files, socket_path=DEFAULT_SOCKET, output=None, vad=False):
+    """Send files to a running worker; yields one result dict per file.
+
+    Paths are made absolute here: the server resolves relative ones against
+    its own working directory, not the caller's.
+    """
+    output = str(Path(output).resolve()) if output else None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        stream = sock.makefile("rwb")
+        for path in files:
+            request = {"audio": str(Path(path).resolve()), "output": output, "vad": vad}
+            stream.write((json.dumps(request) + "\n").encode("utf-8"))
+            stream.flush()
+            yield json.loads(stream.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe many files with one loaded Whisper model")
+    parser.add_argument("audio", nargs="*", help="Audio files or globs (quote globs to use ** recursion)")
+    parser.add_argument("-m", "--model", default=DEFAULT_MODEL, help=f"Whisper model (default: {DEFAULT_MODEL})")
+    parser.add_argument("--language", default="en", help="Language code (default: en)")
+    parser.add_argument("--device", default="cpu", help="torch device (default: cpu)")
+    parser.add_argument("--vad", action="store_true", help="Batch-decode VAD-trimmed speech spans")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"Windows per decode (default: {DEFAULT_BATCH})")
+    parser.add_argument("--serve", action="store_true", help="Keep the model loaded and serve on a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Socket path (default: {DEFAULT_SOCKET})")
+    args = parser.parse_args()
+
+    if not WHISPER_AVAILABLE:
+        print("Error: Whisper not installed. Run: pip install openai-whisper", file=sys.stderr)
+        sys.exit(1)
+    worker = WhisperWorker(args.model, args.language, args.device, args.batch)
+    if args.serve:
+        serve(worker, args.socket)
+        return
+
+    files = expand(args.audio)
+    if not files:
+        parser.error("no audio files given (or use --serve)")
+    for path in files:
+        if not Path(path).exists():
+            print(f"  {path}: file not found", file=sys.stderr)
+            continue
+        report(worker.transcribe_to_srt(path, vad=args.vad))
+    print(worker.summary())
+
+
+if __name__ == "__main__":
+    main()